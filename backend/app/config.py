@@ -16,6 +16,18 @@ class Settings(BaseSettings):
 
     # S3
     s3_bucket_name: str = "sfbank-blue-functions-code-bucket"
+    # 함수 코드 조회 캐시 (바이트 예산 / 재검증 없이 사용하는 TTL)
+    s3_code_cache_max_bytes: int = 32 * 1024 * 1024
+    s3_code_cache_ttl_seconds: int = 30
+
+    # 빌드 소스(build-sources/) 가비지 컬렉션
+    build_source_gc_enabled: bool = True
+    build_source_gc_interval_seconds: int = 3600
+    build_source_retention_hours: int = 72
+    build_source_orphan_grace_minutes: int = 60
+    build_source_gc_batch_interval_seconds: float = 1.0
+    # 한 레플리카만 실행하도록 잡는 임대 락 시간 (삭제 배치마다 연장)
+    build_source_gc_lock_seconds: int = 900
 
     # FastAPI
     environment: str = "development"
@@ -33,15 +45,133 @@ class Settings(BaseSettings):
 
     # Builder Service (Core Services)
     builder_service_url: str = "https://builder.eunha.icu"
+    # Builder 상태 변경 webhook 서명 키 (비어 있으면 webhook 비활성화)
+    builder_webhook_secret: str = ""
+    # webhook 사용 시 폴링은 느린 fallback으로만 동작 (최소 간격, 초)
+    builder_fallback_poll_seconds: float = 30.0
+
+    # 빌드 전 소스 검증 (업로드/압축 해제 크기, zip 항목 수, 검증 프로세스 풀)
+    build_source_max_bytes: int = 50 * 1024 * 1024
+    build_zip_max_uncompressed_bytes: int = 200 * 1024 * 1024
+    build_zip_max_entries: int = 2000
+    build_validation_workers: int = 2
+    build_validation_timeout_seconds: float = 10.0
+
+    # 빌드 결과 캐시 키에 포함되는 런타임 식별자 (Builder 런타임 변경 시 올려서 캐시 무효화)
+    build_cache_runtime: str = "spin-python3.12"
+    # 빌드 결과 캐시 항목 수명 (BUILDCACHE#.expires_at, DynamoDB TTL)
+    build_cache_ttl_seconds: int = 7 * 24 * 3600
+
+    # 빌드 job 큐 (DynamoDB PK=JOBQ) / 레플리카별 워커
+    build_worker_concurrency: int = 8
+    build_job_lease_seconds: int = 60
+    build_job_max_attempts: int = 3
+    build_queue_poll_seconds: float = 2.0
+    # 빌드 admission control: 전체/워크스페이스별 동시 실행 job 수 (모든 레플리카 합산)
+    build_global_concurrency: int = 16
+    build_workspace_concurrency: int = 2
+    # 대기열 한도 (초과 시 429) 및 Retry-After 계산 기준 (job 1회 평균 소요 시간, 초)
+    build_queue_max_pending: int = 200
+    build_workspace_max_pending: int = 20
+    build_retry_after_seconds: int = 30
+    # admission/대기 순번 계산에 JOBQ 조회 결과를 재사용하는 시간 (초)
+    build_queue_snapshot_seconds: float = 1.0
+    # 직접 지정한 레지스트리 비밀번호를 job 항목에 암호화해 둘 KMS 키 (비우면 그런 요청은 400)
+    build_registry_kms_key_id: str = ""
+    # 배포 job lane 한도 (readiness 대기로 오래 임대되므로 빌드 한도와 분리)
+    deploy_global_concurrency: int = 32
+    deploy_workspace_concurrency: int = 8
+    deploy_queue_max_pending: int = 400
+    deploy_workspace_max_pending: int = 100
+
+    # 비동기 배포: 엔드포인트 readiness 확인 (지수 backoff, 제한 시간)
+    deploy_readiness_timeout_seconds: float = 300.0
+    deploy_probe_initial_delay_seconds: float = 1.0
+    deploy_probe_max_delay_seconds: float = 15.0
+    deploy_probe_timeout_seconds: float = 3.0
+    # readiness 확인 경로 (비우면 엔드포인트 루트). 2xx 응답만 준비 완료로 판단
+    deploy_probe_path: str = ""
+
+    # 일괄 배포 SSE의 DEPLOY# 상태 조회 주기 / 배포 완료 함수 갱신을 모으는 최대 대기 시간
+    bulk_deploy_poll_seconds: float = 2.0
+    bulk_deploy_flush_seconds: float = 0.5
+
+    # 작업 상태 SSE 스트림 (task당 DynamoDB 조회 주기 / keep-alive 주기)
+    task_events_poll_seconds: float = 1.0
+    task_events_keepalive_seconds: float = 15.0
+
+    # Kubernetes API (비어 있으면 in-cluster KUBERNETES_SERVICE_HOST 사용)
+    k8s_api_url: str = ""
+    k8s_namespace: str = "default"
+    k8s_spinapp_group: str = "core.spinkube.dev"
+    k8s_spinapp_version: str = "v1alpha1"
+    k8s_api_timeout_seconds: float = 10.0
+    k8s_delete_concurrency: int = 10
+
+    # SpinApp 동기화 (informer 변경 이벤트 debounce, 이벤트가 없을 때의 전체 비교 주기)
+    spinapp_reconcile_enabled: bool = True
+    spinapp_reconcile_interval_seconds: float = 60.0
+    spinapp_reconcile_debounce_seconds: float = 2.0
+    # 한 레플리카만 DynamoDB를 갱신하도록 잡는 임대 락 시간 (동기화마다 연장, 주기보다 길어야 함)
+    spinapp_reconcile_lock_seconds: int = 180
 
     # Loki Log Service
     loki_service_url: str = "http://loki-stack.logging.svc.cluster.local:3100"
+    loki_timeout_seconds: float = 30.0
+    # 조회 범위 분할 단위, 닫힌 구간 결과 캐시 예산, 최근 구간을 열린 것으로 보는 시간(수집 지연 대비)
+    loki_split_interval_seconds: int = 3600
+    loki_split_parallelism: int = 4
+    loki_cache_max_bytes: int = 32 * 1024 * 1024
+    loki_cache_freshness_seconds: int = 600
+    loki_max_query_range_seconds: int = 30 * 86400
+    # 호출 단위 로그 조회 시 호출 구간 앞뒤 여유 (수집 지연/시계 오차)
+    invocation_log_padding_seconds: float = 2.0
+
+    # 실행 로그 내보내기 (DynamoDB 페이지 크기, Parquet row group 행 수)
+    log_export_page_size: int = 500
+    log_export_row_group_size: int = 5000
+    # 실행 로그 S3 아카이브 (보관 일수가 지난 KST 날짜 단위로 Parquet 세그먼트로 이동)
+    log_archive_enabled: bool = True
+    log_archive_after_days: int = 30
+    log_archive_interval_seconds: int = 3600
+    log_archive_segment_max_rows: int = 50000
+    log_archive_lock_seconds: int = 900
+    # 세그먼트 조회 캐시 예산, manifest 재조회 주기
+    log_archive_cache_max_bytes: int = 64 * 1024 * 1024
+    log_archive_manifest_ttl_seconds: int = 60
+    # 실행 로그 검색 색인 (새 로그 반영 최소 간격, 메모리에 유지할 워크스페이스 색인 수)
+    log_search_refresh_seconds: float = 2.0
+    # 증분 갱신 시 마지막 타임스탬프보다 이만큼 앞에서부터 다시 읽음 (늦게 커밋된 로그 포함)
+    log_search_refresh_overlap_seconds: int = 30
+    log_search_max_workspaces: int = 32
+    # 색인 대상 기간(일)과 워크스페이스당 최대 문서 수 (넘으면 오래된 문서부터 제외)
+    log_search_window_days: int = 7
+    log_search_max_documents: int = 200000
+    # 실시간 tail (업스트림당 초당 전달 라인 수, 구독자 버퍼(묶음 수), 레플리카당 최대 구독자 수)
+    loki_tail_max_lines_per_second: float = 200.0
+    loki_tail_subscriber_buffer: int = 64
+    loki_tail_max_subscribers: int = 200
+    loki_tail_max_message_bytes: int = 4 * 1024 * 1024
 
     # Prometheus Metrics Service
     # NOTE: keep in sync with cluster service name (kube-prometheus-stack chart)
     prometheus_service_url: str = (
         "http://prometheus-stack-kube-prom-prometheus.monitoring.svc.cluster.local:9090"
     )
+    prometheus_timeout_seconds: float = 30.0
+    # range 쿼리 캐시 ((query, step)별 step 정렬 시계열, 최근 구간은 늦게 들어온 샘플 반영을 위해 재조회)
+    prometheus_range_cache_max_bytes: int = 16 * 1024 * 1024
+    prometheus_range_cache_overlap_seconds: int = 120
+    # 메트릭 조회 윈도우 (기본/최대, 최소 step) 및 응답 시계열 최대 포인트 수 (LTTB 다운샘플링)
+    metrics_default_window_seconds: int = 3600
+    metrics_max_window_seconds: int = 7 * 24 * 3600
+    metrics_min_step_seconds: int = 15
+    metrics_default_max_points: int = 300
+
+    # 함수 대시보드 소스별 제한 시간 (초과한 소스는 null로 두고 나머지만 응답)
+    dashboard_dynamodb_timeout_seconds: float = 2.0
+    dashboard_loki_timeout_seconds: float = 3.0
+    dashboard_prometheus_timeout_seconds: float = 3.0
 
     class Config:
         env_file = ".env"
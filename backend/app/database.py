@@ -1,13 +1,40 @@
 """AWS DynamoDB 및 S3 클라이언트"""
 import boto3
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import ClientError
 from app.config import settings
-from typing import Optional, Dict, Any, List
+from app.utils.cache import ByteBudgetCache
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from decimal import Decimal
 import base64
 import shortuuid
+import time
 from datetime import datetime
 from app.utils.timezone import now_kst_iso, now_kst, to_kst
+from app.utils.log_id import log_id_timestamp, log_sort_key, new_log_id
+
+# S3 delete_objects 1회 요청당 최대 키 수
+S3_DELETE_BATCH_SIZE = 1000
+
+# DynamoDB TransactWriteItems 1회 요청당 항목 수 (최대 100)
+DYNAMO_TRANSACT_BATCH_SIZE = 25
+# BatchGetItem 요청당 최대 키 수
+DYNAMO_BATCH_GET_SIZE = 100
+
+# 빌드 job 큐 파티션 키
+JOB_QUEUE_PK = "JOBQ"
+# 레플리카 간 락 항목 파티션
+LOCK_PK = "LOCK"
+# 워크스페이스 목록 파티션 (테이블 scan 없이 전체 워크스페이스의 함수를 순회할 때 사용)
+WORKSPACE_DIRECTORY_PK = "WSDIR"
+# 기존 워크스페이스를 목록 파티션에 옮겨 두었음을 나타내는 항목
+WORKSPACE_DIRECTORY_MARKER = "BACKFILLED"
+
+# 빌드 상태 진행 순서 (순서가 뒤바뀐 이벤트가 상태를 되돌리지 않도록 사용)
+BUILD_STATUS_RANK = {"pending": 0, "running": 1, "completed": 2, "done": 2, "failed": 2}
+# 한 번 도달하면 바뀌지 않는 빌드 상태
+BUILD_TERMINAL_STATUSES = ("completed", "done", "failed")
 
 
 class DynamoDBClient:
@@ -39,6 +66,9 @@ class DynamoDBClient:
         }
 
         self.table.put_item(Item=item)
+        self.table.put_item(
+            Item={"PK": WORKSPACE_DIRECTORY_PK, "SK": f"WS#{workspace_id}", "id": workspace_id}
+        )
         return item
 
     def get_workspace(self, workspace_id: str) -> Optional[Dict[str, Any]]:
@@ -106,6 +136,7 @@ class DynamoDBClient:
 
         # 워크스페이스 메타데이터 삭제
         self.table.delete_item(Key={"PK": f"WS#{workspace_id}", "SK": "METADATA"})
+        self.table.delete_item(Key={"PK": WORKSPACE_DIRECTORY_PK, "SK": f"WS#{workspace_id}"})
 
     def refresh_workspace_metrics(self, workspace_id: str):
         """워크스페이스 집계 메트릭(invocations24h/errorRate) 재계산"""
@@ -190,6 +221,72 @@ class DynamoDBClient:
         )
         return response.get("Items", [])
 
+    def list_workspace_ids(self) -> List[str]:
+        """
+        전체 워크스페이스 id (WSDIR 파티션 query).
+        목록 파티션 도입 전 워크스페이스는 처음 한 번만 scan으로 옮겨 둔다.
+        """
+        items = self._query_all(Key("PK").eq(WORKSPACE_DIRECTORY_PK))
+        if not any(item["SK"] == WORKSPACE_DIRECTORY_MARKER for item in items):
+            with self.table.batch_writer() as batch:
+                for workspace in self.list_workspaces():
+                    batch.put_item(
+                        Item={
+                            "PK": WORKSPACE_DIRECTORY_PK,
+                            "SK": f"WS#{workspace['id']}",
+                            "id": workspace["id"],
+                        }
+                    )
+                batch.put_item(
+                    Item={"PK": WORKSPACE_DIRECTORY_PK, "SK": WORKSPACE_DIRECTORY_MARKER}
+                )
+            items = self._query_all(Key("PK").eq(WORKSPACE_DIRECTORY_PK))
+        return [item["id"] for item in items if item["SK"].startswith("WS#")]
+
+    def list_all_functions(self) -> List[Dict[str, Any]]:
+        """
+        전체 워크스페이스의 함수 목록 (SpinApp 동기화, 로그 아카이브용).
+        워크스페이스마다 FN# 범위만 query하며 코드 본문은 제외하고 배포 상태 관련 속성만 읽는다.
+        """
+        items = []
+        for workspace_id in self.list_workspace_ids():
+            items.extend(
+                self._query_all(
+                    Key("PK").eq(f"WS#{workspace_id}") & Key("SK").begins_with("FN#"),
+                    ProjectionExpression=(
+                        "PK, SK, id, workspaceId, #name, invocationUrl, #status, "
+                        "lastDeployed, spinappGeneration"
+                    ),
+                    ExpressionAttributeNames={"#name": "name", "#status": "status"},
+                )
+            )
+        return items
+
+    def _query_all(self, key_condition, **kwargs) -> List[Dict[str, Any]]:
+        """query 결과 전체 (페이지네이션 처리)"""
+        items = []
+        kwargs["KeyConditionExpression"] = key_condition
+        while True:
+            response = self.table.query(**kwargs)
+            items.extend(response.get("Items", []))
+            if "LastEvaluatedKey" not in response:
+                return items
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def _batch_get(self, keys: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """키 목록을 BatchGetItem(100개 단위)으로 조회 (없는 키는 빠지며 순서는 보장하지 않음)"""
+        items: List[Dict[str, Any]] = []
+        for start in range(0, len(keys), DYNAMO_BATCH_GET_SIZE):
+            request = {self.table.name: {"Keys": keys[start:start + DYNAMO_BATCH_GET_SIZE]}}
+            while request:
+                response = self.dynamodb.batch_get_item(RequestItems=request)
+                items.extend(response.get("Responses", {}).get(self.table.name, []))
+                # 처리량 초과로 남은 키는 잠시 후 다시 요청
+                request = response.get("UnprocessedKeys") or None
+                if request:
+                    time.sleep(0.1)
+        return items
+
     def update_function(
         self, workspace_id: str, function_id: str, updates: Dict[str, Any]
     ) -> Optional[Dict[str, Any]]:
@@ -222,14 +319,77 @@ class DynamoDBClient:
         )
         return response.get("Attributes")
 
+    def update_functions_batch(
+        self, updates: List[Tuple[str, str, Dict[str, Any]]]
+    ) -> List[Tuple[str, str]]:
+        """
+        여러 함수를 TransactWriteItems로 묶어 수정 ((workspace_id, function_id, updates) 목록).
+        존재하지 않는 함수는 만들지 않으며, 트랜잭션이 취소된 묶음은 항목별로 다시 시도한다.
+        수정하지 못한 (workspace_id, function_id) 목록을 반환한다.
+        """
+        serializer = TypeSerializer()
+        client = self.table.meta.client
+        failed: List[Tuple[str, str]] = []
+
+        for start in range(0, len(updates), DYNAMO_TRANSACT_BATCH_SIZE):
+            chunk = updates[start:start + DYNAMO_TRANSACT_BATCH_SIZE]
+            transact_items = []
+            for workspace_id, function_id, fields in chunk:
+                values = {**fields, "lastModified": now_kst_iso()}
+                names = {f"#{key}": key for key in values}
+                transact_items.append(
+                    {
+                        "Update": {
+                            "TableName": self.table.name,
+                            "Key": {
+                                "PK": serializer.serialize(f"WS#{workspace_id}"),
+                                "SK": serializer.serialize(f"FN#{function_id}"),
+                            },
+                            "UpdateExpression": "SET "
+                            + ", ".join(f"#{key} = :{key}" for key in values),
+                            "ConditionExpression": "attribute_exists(PK)",
+                            "ExpressionAttributeNames": names,
+                            "ExpressionAttributeValues": {
+                                f":{key}": serializer.serialize(value)
+                                for key, value in values.items()
+                            },
+                        }
+                    }
+                )
+            try:
+                client.transact_write_items(TransactItems=transact_items)
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") != "TransactionCanceledException":
+                    raise
+                # 삭제된 함수 등으로 묶음 전체가 취소된 경우 항목별로 반영
+                for workspace_id, function_id, fields in chunk:
+                    try:
+                        self.table.update_item(
+                            Key={"PK": f"WS#{workspace_id}", "SK": f"FN#{function_id}"},
+                            UpdateExpression="SET "
+                            + ", ".join(f"#{key} = :{key}" for key in fields)
+                            + ", lastModified = :now",
+                            ConditionExpression="attribute_exists(PK)",
+                            ExpressionAttributeNames={f"#{key}": key for key in fields},
+                            ExpressionAttributeValues={
+                                **{f":{key}": value for key, value in fields.items()},
+                                ":now": now_kst_iso(),
+                            },
+                        )
+                    except ClientError as item_error:
+                        code = item_error.response.get("Error", {}).get("Code")
+                        if code != "ConditionalCheckFailedException":
+                            raise
+                        failed.append((workspace_id, function_id))
+        return failed
+
     def delete_function(self, workspace_id: str, function_id: str):
         """함수 삭제"""
-        # 함수 로그 삭제
-        logs = self.list_logs(function_id)
-        for log in logs:
-            self.table.delete_item(
-                Key={"PK": f"FN#{function_id}", "SK": f"LOG#{log['timestamp']}#{log['id']}"}
-            )
+        # 함수 로그 삭제 (페이지 단위로 모든 LOG# 항목과 이전 형식 로그의 LOGID# 항목)
+        for page in self.iter_logs(function_id):
+            self.delete_logs(page)
+        for page in self.iter_log_refs(function_id):
+            self.delete_logs(page)
 
         # 함수 삭제
         self.table.delete_item(Key={"PK": f"WS#{workspace_id}", "SK": f"FN#{function_id}"})
@@ -243,21 +403,28 @@ class DynamoDBClient:
 
     # ===== ExecutionLog 메서드 =====
     def create_log(self, log_data: Dict[str, Any]) -> Dict[str, Any]:
-        """실행 로그 생성"""
-        log_id = shortuuid.uuid()[:8]
-        raw_timestamp = log_data.get("timestamp")
-        timestamp_dt = None
-
-        if isinstance(raw_timestamp, datetime):
-            timestamp_dt = to_kst(raw_timestamp)
-        elif isinstance(raw_timestamp, str):
-            try:
-                normalized_ts = raw_timestamp.replace("Z", "+00:00")
-                timestamp_dt = to_kst(datetime.fromisoformat(normalized_ts))
-            except ValueError:
-                timestamp_dt = None
-
-        timestamp = (timestamp_dt or now_kst()).isoformat()
+        """
+        실행 로그 생성. id는 UUIDv7이고 타임스탬프는 id에 담긴 시각이다.
+        id를 넘기면(invoke는 호출 시작 시 만든 호출 ID) 그 시각을, 없으면 timestamp(기본 현재)로 id를 만든다.
+        """
+        log_id = log_data.get("id")
+        if not log_id:
+            raw_timestamp = log_data.get("timestamp")
+            timestamp_dt = None
+
+            if isinstance(raw_timestamp, datetime):
+                timestamp_dt = to_kst(raw_timestamp)
+            elif isinstance(raw_timestamp, str):
+                try:
+                    normalized_ts = raw_timestamp.replace("Z", "+00:00")
+                    timestamp_dt = to_kst(datetime.fromisoformat(normalized_ts))
+                except ValueError:
+                    timestamp_dt = None
+            log_id = new_log_id(timestamp_dt)
+
+        timestamp = log_id_timestamp(log_id)
+        if timestamp is None:
+            raise ValueError(f"Log id {log_id} is not a UUIDv7")
 
         item = {
             "PK": f"FN#{log_data['functionId']}",
@@ -273,20 +440,114 @@ class DynamoDBClient:
             "logs": log_data.get("logs", []),
             "level": log_data.get("level", "info"),
         }
+        # 함수 호출 시작/종료 시각 (호출 단위 Loki 조회 범위)
+        for key in ("startedAt", "endedAt"):
+            if log_data.get(key):
+                item[key] = log_data[key]
 
+        # SK는 id에서 만들 수 있으므로 id 조회용 항목을 따로 쓰지 않음
         self.table.put_item(Item=item)
         return item
 
-    def list_logs(self, function_id: str, limit: int = 100) -> List[Dict[str, Any]]:
-        """함수 실행 로그 조회"""
+    def list_logs(
+        self,
+        function_id: str,
+        limit: int = 100,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """함수 실행 로그 조회 (최신순, start/end는 KST ISO 타임스탬프 [start, end))"""
+        if start or end:
+            key_condition = Key("PK").eq(f"FN#{function_id}") & Key("SK").between(
+                f"LOG#{start}" if start else "LOG#", f"LOG#{end}" if end else "LOG$"
+            )
+        else:
+            key_condition = Key("PK").eq(f"FN#{function_id}") & Key("SK").begins_with("LOG#")
         response = self.table.query(
-            KeyConditionExpression=Key("PK").eq(f"FN#{function_id}")
-            & Key("SK").begins_with("LOG#"),
+            KeyConditionExpression=key_condition,
             Limit=limit,
             ScanIndexForward=False,  # 최신순 정렬
         )
         return response.get("Items", [])
 
+    def delete_logs(self, items: List[Dict[str, Any]]):
+        """실행 로그 일괄 삭제 (batch_writer가 25개 단위 BatchWriteItem + 미처리 항목 재시도)"""
+        with self.table.batch_writer() as batch:
+            for item in items:
+                batch.delete_item(Key={"PK": item["PK"], "SK": item["SK"]})
+
+    def batch_get_logs(self, keys: List[Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """(function_id, SK) 목록의 실행 로그를 BatchGetItem으로 조회. SK → 항목 (없는 키는 빠짐)"""
+        items = self._batch_get([{"PK": f"FN#{function_id}", "SK": sk} for function_id, sk in keys])
+        return {item["SK"]: item for item in items}
+
+    def iter_logs(
+        self,
+        function_id: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        page_size: int = 500,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        실행 로그를 오래된 순으로 페이지 단위 조회 (내보내기용).
+        start/end는 KST ISO 타임스탬프이며 [start, end) 범위를 SK 조건으로 좁힌다.
+        """
+        kwargs: Dict[str, Any] = {
+            "KeyConditionExpression": Key("PK").eq(f"FN#{function_id}")
+            & Key("SK").between(
+                f"LOG#{start}" if start else "LOG#",
+                # '$'는 '#' 다음 문자이므로 모든 LOG# 항목보다 큼
+                f"LOG#{end}" if end else "LOG$",
+            ),
+            "ScanIndexForward": True,
+            "Limit": page_size,
+        }
+        while True:
+            response = self.table.query(**kwargs)
+            items = response.get("Items", [])
+            if items:
+                yield items
+            if "LastEvaluatedKey" not in response:
+                return
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def get_log_ref(self, function_id: str, log_id: str) -> Optional[Dict[str, Any]]:
+        """이전 형식 로그 id → LOGID# 항목 {logSK, timestamp} (없으면 None)"""
+        response = self.table.get_item(
+            Key={"PK": f"FN#{function_id}", "SK": f"LOGID#{log_id}"}
+        )
+        return response.get("Item")
+
+    def iter_log_refs(self, function_id: str) -> Iterator[List[Dict[str, Any]]]:
+        """이전 형식 로그의 LOGID# 항목을 페이지 단위로 조회"""
+        kwargs: Dict[str, Any] = {
+            "KeyConditionExpression": Key("PK").eq(f"FN#{function_id}")
+            & Key("SK").begins_with("LOGID#"),
+        }
+        while True:
+            response = self.table.query(**kwargs)
+            items = response.get("Items", [])
+            if items:
+                yield items
+            if "LastEvaluatedKey" not in response:
+                return
+            kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def get_log(self, function_id: str, log_id: str) -> Optional[Dict[str, Any]]:
+        """
+        실행 로그 단건 조회 (UUIDv7 id는 SK를 바로 만들어 get_item 한 번).
+        UUIDv7 이전에 쓰인 로그는 남아 있는 LOGID# 항목으로 SK를 찾는다.
+        로그가 없거나 아카이브되어 DynamoDB에 없으면 None.
+        """
+        sort_key = log_sort_key(log_id)
+        if sort_key is None:
+            ref = self.get_log_ref(function_id, log_id)
+            if not ref:
+                return None
+            sort_key = ref["logSK"]
+        response = self.table.get_item(Key={"PK": f"FN#{function_id}", "SK": sort_key})
+        return response.get("Item")
+
     # ===== BuildTask 메서드 =====
     def create_build_task(
         self, workspace_id: str, app_name: Optional[str] = None, source_path: Optional[str] = None
@@ -307,6 +568,7 @@ class DynamoDBClient:
             "workspace_id": workspace_id,
             "app_name": app_name,
             "status": "pending",
+            "status_rank": BUILD_STATUS_RANK["pending"],
             "source_code_path": source_path or "",
             "wasm_path": None,
             "image_url": None,
@@ -344,11 +606,44 @@ class DynamoDBClient:
         wasm_path: Optional[str] = None,
         image_url: Optional[str] = None,
         error_message: Optional[str] = None,
+        event_seq: Optional[int] = None,
+        forward_only: bool = False,
+        source_path: Optional[str] = None,
     ) -> Optional[Dict[str, Any]]:
-        """빌드 작업 상태 업데이트"""
-        update_expr = ["#status = :status", "updated_at = :now"]
-        expr_values = {":status": status, ":now": now_kst_iso()}
+        """
+        빌드 작업 상태 업데이트
+
+        forward_only이면 상태가 뒤로 돌아가는 업데이트(completed → running 등), 이미 종료된 작업의
+        업데이트(completed ↔ failed 포함), 순번 없이 같은 상태를 반복하는 업데이트를,
+        event_seq가 주어지면 이미 반영된 이벤트(seq가 같거나 작은)도 무시하고 None을 반환한다.
+        """
+        rank = BUILD_STATUS_RANK.get(status, 0)
+        update_expr = ["#status = :status", "updated_at = :now", "status_rank = :rank"]
+        expr_values = {":status": status, ":now": now_kst_iso(), ":rank": rank}
         expr_names = {"#status": "status"}
+        conditions = []
+
+        if event_seq is not None:
+            update_expr.append("event_seq = :seq")
+            expr_values[":seq"] = event_seq
+            conditions.append("(attribute_not_exists(event_seq) OR event_seq < :seq)")
+
+        if forward_only or event_seq is not None:
+            # 종료 상태는 흡수 상태 (completed ↔ failed 뒤집힘 방지)
+            terminal = []
+            for index, terminal_status in enumerate(BUILD_TERMINAL_STATUSES):
+                expr_values[f":terminal{index}"] = terminal_status
+                terminal.append(f":terminal{index}")
+            conditions.append(f"NOT #status IN ({', '.join(terminal)})")
+            # status_rank가 없는 항목은 이 필드 도입 전에 만든 작업
+            conditions.append("(attribute_not_exists(status_rank) OR status_rank <= :rank)")
+            if event_seq is None:
+                # 순번 없는 같은 상태의 반복은 중복
+                conditions.append("#status <> :status")
+
+        condition_kwargs = (
+            {"ConditionExpression": " AND ".join(conditions)} if conditions else {}
+        )
 
         if wasm_path is not None:
             update_expr.append("wasm_path = :wasm")
@@ -362,14 +657,50 @@ class DynamoDBClient:
             update_expr.append("error_message = :err")
             expr_values[":err"] = error_message
 
-        response = self.table.update_item(
+        if source_path is not None:
+            update_expr.append("source_code_path = :src")
+            expr_values[":src"] = source_path
+
+        try:
+            response = self.table.update_item(
+                Key={"PK": f"WS#{workspace_id}", "SK": f"BUILD#{task_id}"},
+                UpdateExpression="SET " + ", ".join(update_expr),
+                ExpressionAttributeNames=expr_names,
+                ExpressionAttributeValues=expr_values,
+                ReturnValues="ALL_NEW",
+                **condition_kwargs,
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return None
+            raise
+        return response.get("Attributes")
+
+    def attach_builder_task_id(self, workspace_id: str, task_id: str, builder_task_id: str):
+        """Builder Service task_id를 빌드 작업에 연결 (webhook 이벤트 매칭용)"""
+        self.table.update_item(
             Key={"PK": f"WS#{workspace_id}", "SK": f"BUILD#{task_id}"},
-            UpdateExpression="SET " + ", ".join(update_expr),
-            ExpressionAttributeNames=expr_names,
-            ExpressionAttributeValues=expr_values,
-            ReturnValues="ALL_NEW",
+            UpdateExpression="SET builder_task_id = :btid",
+            ExpressionAttributeValues={":btid": builder_task_id},
         )
-        return response.get("Attributes")
+
+    def find_build_task_by_builder_id(
+        self, workspace_id: str, builder_task_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """워크스페이스 파티션 안에서 builder_task_id로 빌드 작업 조회"""
+        query_kwargs = {
+            "KeyConditionExpression": Key("PK").eq(f"WS#{workspace_id}")
+            & Key("SK").begins_with("BUILD#"),
+            "FilterExpression": Attr("builder_task_id").eq(builder_task_id),
+        }
+        while True:
+            response = self.table.query(**query_kwargs)
+            items = response.get("Items", [])
+            if items:
+                return items[0]
+            if "LastEvaluatedKey" not in response:
+                return None
+            query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
 
     def list_build_tasks(self, workspace_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """워크스페이스의 빌드 작업 목록 조회"""
@@ -381,6 +712,333 @@ class DynamoDBClient:
         )
         return response.get("Items", [])
 
+    # ===== DeployTask 메서드 =====
+    # PK=WS#{workspace_id}, SK=DEPLOY#{deploy_id} — 비동기 배포 진행 상태
+    def create_deploy_task(
+        self,
+        workspace_id: str,
+        app_name: Optional[str],
+        namespace: str,
+        function_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """배포 작업 생성"""
+        deploy_id = shortuuid.uuid()
+        now = now_kst_iso()
+
+        item = {
+            "PK": f"WS#{workspace_id}",
+            "SK": f"DEPLOY#{deploy_id}",
+            "Type": "DeployTask",
+            "deploy_id": deploy_id,
+            "workspace_id": workspace_id,
+            "function_id": function_id,
+            "app_name": app_name,
+            "namespace": namespace,
+            "status": "pending",
+            "service_name": None,
+            "endpoint": None,
+            "probe_attempts": 0,
+            "error_message": None,
+            "submitted_at": None,
+            "ready_at": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+        self.table.put_item(Item=item)
+        return item
+
+    def get_deploy_task(self, workspace_id: str, deploy_id: str) -> Optional[Dict[str, Any]]:
+        """배포 작업 조회"""
+        response = self.table.get_item(
+            Key={"PK": f"WS#{workspace_id}", "SK": f"DEPLOY#{deploy_id}"}
+        )
+        return response.get("Item")
+
+    def batch_get_deploy_tasks(self, keys: List[Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """(workspace_id, deploy_id) 목록의 배포 작업을 BatchGetItem으로 조회. deploy_id → 항목"""
+        items = self._batch_get(
+            [
+                {"PK": f"WS#{workspace_id}", "SK": f"DEPLOY#{deploy_id}"}
+                for workspace_id, deploy_id in keys
+            ]
+        )
+        return {item["deploy_id"]: item for item in items}
+
+    def get_deploy_task_by_id(self, deploy_id: str) -> Optional[Dict[str, Any]]:
+        """deploy_id로 배포 작업 조회 (workspace_id 불필요, scan)"""
+        scan_kwargs = {
+            "FilterExpression": Attr("deploy_id").eq(deploy_id) & Attr("Type").eq("DeployTask"),
+        }
+        while True:
+            response = self.table.scan(**scan_kwargs)
+            items = response.get("Items", [])
+            if items:
+                return items[0]
+            if "LastEvaluatedKey" not in response:
+                return None
+            scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def update_deploy_task(
+        self, workspace_id: str, deploy_id: str, updates: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """배포 작업 갱신"""
+        update_expr = ["updated_at = :now"]
+        expr_values: Dict[str, Any] = {":now": now_kst_iso()}
+        expr_names: Dict[str, str] = {}
+
+        for key, value in updates.items():
+            attr_name = key
+            if key == "status":
+                expr_names["#status"] = "status"
+                attr_name = "#status"
+            update_expr.append(f"{attr_name} = :{key}")
+            expr_values[f":{key}"] = value
+
+        extra_kwargs = {"ExpressionAttributeNames": expr_names} if expr_names else {}
+        response = self.table.update_item(
+            Key={"PK": f"WS#{workspace_id}", "SK": f"DEPLOY#{deploy_id}"},
+            UpdateExpression="SET " + ", ".join(update_expr),
+            ExpressionAttributeValues=expr_values,
+            **extra_kwargs,
+            ReturnValues="ALL_NEW",
+        )
+        return response.get("Attributes")
+
+    # ===== BuildCache 메서드 =====
+    # PK=WS#{workspace_id}, SK=BUILDCACHE#{cache_key} — 같은 소스로 빌드한 결과 재사용
+    # expires_at(epoch 초)을 테이블 TTL 속성으로 지정하면 DynamoDB가 만료 항목을 지운다.
+    def get_build_cache(self, workspace_id: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        """빌드 결과 캐시 조회 (TTL 삭제는 지연되므로 만료된 항목은 없는 것으로 취급)"""
+        response = self.table.get_item(
+            Key={"PK": f"WS#{workspace_id}", "SK": f"BUILDCACHE#{cache_key}"}
+        )
+        item = response.get("Item")
+        if item and int(item.get("expires_at", 0)) < int(time.time()):
+            return None
+        return item
+
+    def delete_build_cache(self, workspace_id: str, cache_key: str):
+        """빌드 결과 캐시 삭제 (산출물이 사라진 경우)"""
+        self.table.delete_item(Key={"PK": f"WS#{workspace_id}", "SK": f"BUILDCACHE#{cache_key}"})
+
+    def put_build_cache(
+        self,
+        workspace_id: str,
+        cache_key: str,
+        task_id: str,
+        app_name: Optional[str],
+        wasm_path: Optional[str] = None,
+        image_url: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """빌드 결과 캐시 저장"""
+        item = {
+            "PK": f"WS#{workspace_id}",
+            "SK": f"BUILDCACHE#{cache_key}",
+            "Type": "BuildCache",
+            "cache_key": cache_key,
+            "source_task_id": task_id,
+            "app_name": app_name,
+            "wasm_path": wasm_path,
+            "image_url": image_url,
+            "created_at": now_kst_iso(),
+            "expires_at": int(time.time()) + settings.build_cache_ttl_seconds,
+        }
+
+        self.table.put_item(Item=item)
+        return item
+
+    # ===== BuildJob 큐 메서드 =====
+    # PK=JOBQ, SK=JOB#{job_id}. 완료/최종 실패한 job은 삭제되므로 파티션에는 진행 중인 job만 남는다.
+    def enqueue_job(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        workspace_id: str,
+        task_id: str,
+        max_attempts: int = 3,
+        priority: int = 0,
+    ) -> Dict[str, Any]:
+        """빌드 job 등록 (priority가 높을수록 먼저 실행)"""
+        job_id = shortuuid.uuid()
+        now = now_kst_iso()
+
+        item = {
+            "PK": JOB_QUEUE_PK,
+            "SK": f"JOB#{job_id}",
+            "Type": "BuildJob",
+            "job_id": job_id,
+            "kind": kind,
+            "payload": payload,
+            "workspace_id": workspace_id,
+            "task_id": task_id,
+            "status": "queued",
+            "priority": priority,
+            "attempts": 0,
+            "max_attempts": max_attempts,
+            "available_at": int(time.time()),
+            "lease_owner": None,
+            "lease_expires_at": 0,
+            "builder_task_id": None,
+            "last_error": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+        self.table.put_item(Item=item)
+        return item
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """큐의 모든 job 조회 (진행 중인 job만 남으므로 작은 파티션)"""
+        items = []
+        query_kwargs = {
+            "KeyConditionExpression": Key("PK").eq(JOB_QUEUE_PK) & Key("SK").begins_with("JOB#"),
+        }
+        while True:
+            response = self.table.query(**query_kwargs)
+            items.extend(response.get("Items", []))
+            if "LastEvaluatedKey" not in response:
+                break
+            query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        return items
+
+    def claim_job(self, job_id: str, owner: str, lease_seconds: int) -> Optional[Dict[str, Any]]:
+        """
+        job 임대(lease) 획득. 대기 중이고 실행 가능 시각이 지났거나,
+        다른 워커의 임대가 만료된 경우에만 성공한다. 실패 시 None.
+        """
+        now = int(time.time())
+        try:
+            response = self.table.update_item(
+                Key={"PK": JOB_QUEUE_PK, "SK": f"JOB#{job_id}"},
+                UpdateExpression=(
+                    "SET #status = :leased, lease_owner = :owner, lease_expires_at = :exp, "
+                    "attempts = attempts + :one, updated_at = :updated"
+                ),
+                ConditionExpression=(
+                    "(#status = :queued AND available_at <= :now) "
+                    "OR (#status = :leased AND lease_expires_at < :now)"
+                ),
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues={
+                    ":leased": "leased",
+                    ":queued": "queued",
+                    ":owner": owner,
+                    ":exp": now + lease_seconds,
+                    ":one": 1,
+                    ":now": now,
+                    ":updated": now_kst_iso(),
+                },
+                ReturnValues="ALL_NEW",
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return None
+            raise
+        return response.get("Attributes")
+
+    def update_leased_job(
+        self, job_id: str, owner: str, updates: Dict[str, Any]
+    ) -> bool:
+        """
+        임대 중인 job 갱신 (heartbeat, builder_task_id 기록 등).
+        임대를 잃었으면 False.
+        """
+        update_expr = ["updated_at = :updated"]
+        expr_values: Dict[str, Any] = {":updated": now_kst_iso(), ":owner": owner}
+        expr_names: Dict[str, str] = {}
+        for key, value in updates.items():
+            attr_name = key
+            # Handle DynamoDB reserved keywords
+            if key == "status":
+                expr_names["#status"] = "status"
+                attr_name = "#status"
+            update_expr.append(f"{attr_name} = :{key}")
+            expr_values[f":{key}"] = value
+
+        extra_kwargs = {"ExpressionAttributeNames": expr_names} if expr_names else {}
+
+        try:
+            self.table.update_item(
+                Key={"PK": JOB_QUEUE_PK, "SK": f"JOB#{job_id}"},
+                UpdateExpression="SET " + ", ".join(update_expr),
+                ConditionExpression="lease_owner = :owner",
+                ExpressionAttributeValues=expr_values,
+                **extra_kwargs,
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+        return True
+
+    def acquire_lock(self, name: str, owner: str, lease_seconds: int) -> bool:
+        """
+        레플리카 간 배타 실행용 임대 락. 비어 있거나 만료됐거나 이미 owner가 가진 경우 성공
+        (같은 owner가 다시 호출하면 임대 연장).
+        """
+        now = int(time.time())
+        try:
+            self.table.put_item(
+                Item={
+                    "PK": LOCK_PK,
+                    "SK": f"LOCK#{name}",
+                    "Type": "Lock",
+                    "lease_owner": owner,
+                    "lease_expires_at": now + lease_seconds,
+                    "updated_at": now_kst_iso(),
+                },
+                ConditionExpression=(
+                    "attribute_not_exists(PK) OR lease_expires_at < :now OR lease_owner = :owner"
+                ),
+                ExpressionAttributeValues={":now": now, ":owner": owner},
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+        return True
+
+    def release_lock(self, name: str, owner: str):
+        """owner가 가진 락 해제 (이미 다른 owner에게 넘어갔으면 무시)"""
+        try:
+            self.table.delete_item(
+                Key={"PK": LOCK_PK, "SK": f"LOCK#{name}"},
+                ConditionExpression="lease_owner = :owner",
+                ExpressionAttributeValues={":owner": owner},
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+
+    def release_job(
+        self, job_id: str, owner: str, available_at: int, last_error: Optional[str] = None
+    ) -> bool:
+        """임대 반납 후 available_at 이후 재시도 대기 상태로 되돌림"""
+        return self.update_leased_job(
+            job_id,
+            owner,
+            {
+                "status": "queued",
+                "lease_owner": None,
+                "lease_expires_at": 0,
+                "available_at": available_at,
+                "last_error": last_error,
+            },
+        )
+
+    def delete_job(self, job_id: str, owner: str):
+        """완료(또는 최종 실패)한 job 삭제"""
+        try:
+            self.table.delete_item(
+                Key={"PK": JOB_QUEUE_PK, "SK": f"JOB#{job_id}"},
+                ConditionExpression="lease_owner = :owner",
+                ExpressionAttributeValues={":owner": owner},
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+
 
 class S3Client:
     """S3 클라이언트"""
@@ -388,6 +1046,8 @@ class S3Client:
     def __init__(self):
         self.s3 = boto3.client("s3", region_name=settings.aws_region)
         self.bucket_name = settings.s3_bucket_name
+        # 코드 캐시: s3_key -> Base64 인코딩된 코드 (메타데이터에 ETag 보관)
+        self.code_cache = ByteBudgetCache(settings.s3_code_cache_max_bytes, sizeof=len)
 
     def save_code(self, workspace_id: str, function_id: str, code_base64: str) -> str:
         """함수 코드 S3에 저장"""
@@ -400,23 +1060,49 @@ class S3Client:
         self.s3.put_object(
             Bucket=self.bucket_name, Key=s3_key, Body=decoded_code, ContentType="text/plain"
         )
+        self.code_cache.pop(s3_key)
 
         return s3_key
 
     def get_code(self, workspace_id: str, function_id: str) -> str:
-        """S3에서 함수 코드 조회 (Base64 인코딩)"""
-        s3_key = f"{workspace_id}/{function_id}.py"
+        """
+        S3에서 함수 코드 조회 (Base64 인코딩)
 
-        response = self.s3.get_object(Bucket=self.bucket_name, Key=s3_key)
-        code = response["Body"].read().decode("utf-8")
+        TTL 이내의 캐시 항목은 S3 호출 없이 반환하고, TTL이 지나면
+        IfNoneMatch(ETag)로 재검증하여 304인 경우 캐시된 값을 그대로 사용한다.
+        """
+        s3_key = f"{workspace_id}/{function_id}.py"
 
-        # Base64 인코딩하여 반환
-        return base64.b64encode(code.encode("utf-8")).decode("utf-8")
+        cached = self.code_cache.get(s3_key)
+        request_kwargs = {"Bucket": self.bucket_name, "Key": s3_key}
+        if cached:
+            encoded, stored_at, meta = cached
+            if time.monotonic() - stored_at < settings.s3_code_cache_ttl_seconds:
+                return encoded
+            request_kwargs["IfNoneMatch"] = meta["etag"]
+
+        try:
+            response = self.s3.get_object(**request_kwargs)
+        except ClientError as e:
+            if cached and _is_not_modified(e):
+                self.code_cache.touch(s3_key)
+                return cached[0]
+            raise
+
+        code = response["Body"].read()
+
+        # Base64 인코딩하여 반환 (S3에는 UTF-8 텍스트로 저장됨)
+        encoded = base64.b64encode(code).decode("ascii")
+        etag = response.get("ETag")
+        if etag:
+            self.code_cache.put(s3_key, encoded, etag=etag)
+        return encoded
 
     def delete_code(self, workspace_id: str, function_id: str):
         """S3에서 함수 코드 삭제"""
         s3_key = f"{workspace_id}/{function_id}.py"
         self.s3.delete_object(Bucket=self.bucket_name, Key=s3_key)
+        self.code_cache.pop(s3_key)
 
     # ===== Build 관련 메서드 =====
     def save_build_source(
@@ -442,16 +1128,81 @@ class S3Client:
         response = self.s3.get_object(Bucket=self.bucket_name, Key=s3_key)
         return response["Body"].read()
 
-    def delete_build_source(self, workspace_id: str, task_id: str):
-        """S3에서 빌드 소스 삭제"""
-        # 디렉토리 내 모든 파일 삭제
-        prefix = f"build-sources/{workspace_id}/{task_id}/"
+    def delete_build_source(self, workspace_id: str, task_id: str) -> int:
+        """S3에서 빌드 소스 삭제 (삭제한 바이트 수 반환)"""
+        return self.delete_prefix(f"build-sources/{workspace_id}/{task_id}/")
+
+    def delete_prefix(self, prefix: str) -> int:
+        """prefix 하위 객체 모두 삭제 (페이지네이션 + 1000개 단위 일괄 삭제, 삭제한 바이트 수 반환)"""
+        reclaimed = 0
+        batch: List[str] = []
+        for obj in self.iter_objects(prefix):
+            batch.append(obj["Key"])
+            reclaimed += obj.get("Size", 0)
+            if len(batch) >= S3_DELETE_BATCH_SIZE:
+                self.delete_keys(batch)
+                batch = []
+        if batch:
+            self.delete_keys(batch)
+        return reclaimed
+
+    def put_bytes(self, s3_key: str, data: bytes, content_type: str = "application/octet-stream"):
+        """임의 객체 저장 (로그 아카이브 세그먼트/manifest)"""
+        self.s3.put_object(
+            Bucket=self.bucket_name, Key=s3_key, Body=data, ContentType=content_type
+        )
+
+    def uri_exists(self, uri: str) -> bool:
+        """s3://bucket/key 객체 존재 여부 (빌드 산출물 확인용, 다른 버킷도 허용)"""
+        bucket, _, key = uri[len("s3://"):].partition("/")
+        try:
+            self.s3.head_object(Bucket=bucket, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return False
+            raise
+        return True
+
+    def get_bytes(self, s3_key: str) -> Optional[bytes]:
+        """임의 객체 조회. 없으면 None"""
+        try:
+            response = self.s3.get_object(Bucket=self.bucket_name, Key=s3_key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return None
+            raise
+        return response["Body"].read()
+
+    # ===== 공통 유틸리티 =====
+    def iter_objects(self, prefix: str) -> Iterator[Dict[str, Any]]:
+        """prefix 하위 객체를 페이지 단위로 순회 (키 사전순)"""
+        paginator = self.s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                yield obj
+
+    def delete_keys(self, keys: List[str]) -> List[str]:
+        """
+        delete_objects로 최대 1000개 키를 한 번에 삭제.
+        삭제에 실패한 키 목록을 반환한다.
+        """
+        if not keys:
+            return []
+        if len(keys) > S3_DELETE_BATCH_SIZE:
+            raise ValueError(f"delete_keys accepts at most {S3_DELETE_BATCH_SIZE} keys")
+
+        response = self.s3.delete_objects(
+            Bucket=self.bucket_name,
+            Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+        )
+        return [err["Key"] for err in response.get("Errors", [])]
 
-        response = self.s3.list_objects_v2(Bucket=self.bucket_name, Prefix=prefix)
 
-        if "Contents" in response:
-            for obj in response["Contents"]:
-                self.s3.delete_object(Bucket=self.bucket_name, Key=obj["Key"])
+def _is_not_modified(error: ClientError) -> bool:
+    """조건부 GET의 304 Not Modified 응답 여부"""
+    code = error.response.get("Error", {}).get("Code")
+    http_status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return code in ("304", "NotModified") or http_status == 304
 
 
 # 전역 클라이언트 인스턴스
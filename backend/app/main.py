@@ -1,8 +1,18 @@
 """FastAPI 메인 애플리케이션"""
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.routers import workspaces, functions, logs, builds, metrics
+from app.routers import workspaces, functions, logs, builds, metrics, dashboard
+from app.services.build_source_gc import run_build_source_gc_loop
+from app.services.builder_poller import builder_poller
+from app.services.job_queue import build_job_queue
+from app.services.log_archive import run_log_archive_loop
+from app.services.source_validation import shutdown_validation_pool
+from app.services.spinapp_reconciler import spinapp_reconciler
+from app.utils.k8s import k8s_client
+from app.utils.http import close_http_clients
+import asyncio
 import logging
 
 # 기본 로깅 설정
@@ -11,6 +21,28 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """백그라운드 작업 시작/종료"""
+    background = [asyncio.create_task(build_job_queue.run())]
+    if settings.build_source_gc_enabled:
+        background.append(asyncio.create_task(run_build_source_gc_loop()))
+    if settings.log_archive_enabled:
+        background.append(asyncio.create_task(run_log_archive_loop()))
+    if settings.spinapp_reconcile_enabled and k8s_client.enabled:
+        background.append(asyncio.create_task(spinapp_reconciler.run()))
+
+    yield
+
+    for task in background:
+        task.cancel()
+    await asyncio.gather(*background, return_exceptions=True)
+    await builder_poller.stop()
+    await close_http_clients()
+    shutdown_validation_pool()
+
+
 # FastAPI 앱 생성
 app = FastAPI(
     title="FaaS Backend API",
@@ -18,6 +50,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS 설정
@@ -36,6 +69,7 @@ app.include_router(functions.router, prefix="/api", tags=["Functions"])
 app.include_router(logs.router, prefix="/api", tags=["Logs"])
 app.include_router(builds.router, prefix="/api", tags=["Builds"])
 app.include_router(metrics.router, prefix="/api", tags=["Metrics"])
+app.include_router(dashboard.router, prefix="/api", tags=["Dashboard"])
 
 
 @app.get("/")
@@ -102,6 +102,8 @@ class ExecutionLog(BaseModel):
     responseBody: Optional[Any] = None
     logs: List[str] = Field(default_factory=list)
     level: str = "info"  # "info" | "warn" | "error"
+    startedAt: Optional[datetime] = None  # 함수 호출 시작 시각
+    endedAt: Optional[datetime] = None  # 함수 응답(또는 실패) 시각
 
 
 class LogsResponse(BaseModel):
@@ -117,14 +119,38 @@ class LokiLogEntry(BaseModel):
 
     timestamp: str = Field(..., description="로그 타임스탬프 (나노초)")
     line: str = Field(..., description="로그 메시지")
+    labels: Optional[Dict[str, str]] = Field(None, description="로그 스트림 라벨")
+
+
+class LogSearchHit(BaseModel):
+    """실행 로그 검색 결과 항목"""
+
+    score: float = Field(..., description="BM25 점수")
+    log: ExecutionLog
+
+
+class LogSearchResponse(BaseModel):
+    """실행 로그 검색 응답"""
+
+    hits: List[LogSearchHit] = Field(default_factory=list, description="점수순 결과")
+    total: int = Field(..., description="전체 매칭 수")
+    query: str = Field(..., description="검색어")
+    next_cursor: Optional[str] = Field(
+        None, description="다음 페이지 cursor (더 이상 없으면 null)"
+    )
 
 
 class LokiLogsResponse(BaseModel):
     """Loki 로그 조회 응답"""
 
-    logs: List[LokiLogEntry] = Field(default_factory=list, description="로그 목록")
+    logs: List[LokiLogEntry] = Field(default_factory=list, description="로그 목록 (타임스탬프순)")
     total: int = Field(..., description="전체 로그 수")
     function_id: str = Field(..., description="함수 ID")
+    query: Optional[str] = Field(None, description="실행한 LogQL 쿼리")
+    direction: str = Field("backward", description="정렬 방향 (backward: 최신순, forward: 오래된순)")
+    next_cursor: Optional[str] = Field(
+        None, description="다음 페이지 cursor (더 이상 없으면 null)"
+    )
 
 
 # ===== Prometheus Metrics 모델 =====
@@ -150,13 +176,17 @@ class PrometheusMetricsData(BaseModel):
         default=3600,
         description="조회 기간(초). 기본 1시간.",
     )
+    step_seconds: int = Field(default=60, description="range 쿼리 step(초)")
+    source_points: int = Field(
+        default=0, description="다운샘플링 전 포인트 수 (cpu_series보다 많으면 LTTB 적용됨)"
+    )
     instant_query: str = Field(..., description="사용된 인스턴트 PromQL 쿼리")
     range_query: str = Field(..., description="사용된 구간 PromQL 쿼리")
     raw_instant: Optional[Dict[str, Any]] = Field(
-        None, description="원본 인스턴트 쿼리 응답 데이터"
+        None, description="원본 인스턴트 쿼리 응답 데이터 (include_raw=true일 때만)"
     )
     raw_range: Optional[Dict[str, Any]] = Field(
-        None, description="원본 구간 쿼리 응답 데이터"
+        None, description="원본 구간 쿼리 응답 데이터 (include_raw=true일 때만)"
     )
 
 
@@ -168,6 +198,53 @@ class PrometheusMetricsResponse(BaseModel):
     function_id: str = Field(..., description="함수 ID")
 
 
+class FunctionCpuMetrics(BaseModel):
+    """일괄 조회 시 함수 하나의 CPU 메트릭"""
+
+    cpu_total: Optional[float] = Field(None, description="현재 CPU 사용량 (cores)")
+    cpu_series: List[PrometheusTimeseriesPoint] = Field(
+        default_factory=list, description="조회 윈도우 동안의 CPU 사용률 시계열"
+    )
+    source_points: int = Field(default=0, description="다운샘플링 전 포인트 수")
+
+
+class PrometheusBatchMetricsResponse(BaseModel):
+    """여러 함수 메트릭 일괄 조회 응답 (function_id별로 분리)"""
+
+    status: str = Field(..., description="응답 상태")
+    window_seconds: int = Field(default=3600, description="조회 기간(초)")
+    step_seconds: int = Field(default=60, description="range 쿼리 step(초)")
+    instant_query: Optional[str] = Field(None, description="사용된 인스턴트 PromQL 쿼리")
+    range_query: Optional[str] = Field(None, description="사용된 구간 PromQL 쿼리")
+    functions: Dict[str, FunctionCpuMetrics] = Field(
+        default_factory=dict, description="function_id → 메트릭 (데이터가 없는 함수도 포함)"
+    )
+
+
+# ===== Dashboard 모델 =====
+class DashboardSourceStatus(BaseModel):
+    """대시보드 데이터 소스별 조회 결과"""
+
+    status: str = Field(..., description="ok | timeout | error")
+    duration_ms: float = Field(..., description="조회 소요 시간 (ms)")
+    error: Optional[str] = Field(None, description="실패 사유")
+
+
+class FunctionDashboardResponse(BaseModel):
+    """함수 상세 페이지 통합 응답 (느리거나 실패한 소스는 null)"""
+
+    status: str = Field(..., description="complete | partial")
+    function: FunctionConfig
+    execution_logs: Optional[List[ExecutionLog]] = Field(
+        None, description="DynamoDB 실행 로그 (최신순)"
+    )
+    loki_logs: Optional[LokiLogsResponse] = Field(None, description="Loki 로그")
+    metrics: Optional[PrometheusMetricsData] = Field(None, description="Prometheus CPU 메트릭")
+    sources: Dict[str, DashboardSourceStatus] = Field(
+        default_factory=dict, description="소스별 조회 결과 (dynamodb_logs, loki, prometheus)"
+    )
+
+
 # ===== BuildTask 모델 =====
 class BuildTaskResult(BaseModel):
     """빌드 작업 결과"""
@@ -194,6 +271,9 @@ class TaskStatusResponse(BaseModel):
     status: str = Field(..., description="작업 상태: pending|running|completed|failed")
     result: Optional[BuildTaskResult] = Field(None, description="작업 결과")
     error: Optional[str] = Field(None, description="에러 메시지")
+    queue_position: Optional[int] = Field(
+        None, description="빌드 대기열 순번 (1부터, 실행 대기 중인 경우에만)"
+    )
 
 
 class WorkspaceTaskItem(BaseModel):
@@ -216,6 +296,29 @@ class WorkspaceTasksResponse(BaseModel):
     count: int = Field(..., description="작업 개수")
 
 
+class BuilderEvent(BaseModel):
+    """Builder Service 상태 변경 이벤트 (webhook)"""
+
+    task_id: str = Field(..., description="Builder Service 작업 ID")
+    workspace_id: str = Field(..., description="워크스페이스 ID")
+    status: str = Field(..., description="작업 상태: pending|running|completed|done|failed")
+    result: Optional[Dict[str, Any]] = Field(None, description="작업 결과 (wasm_path, image_url 등)")
+    error: Optional[str] = Field(None, description="에러 메시지")
+    sequence: Optional[int] = Field(
+        None, description="task별 단조 증가 이벤트 순번 (순서 역전/중복 제거용)"
+    )
+    backend_task_id: Optional[str] = Field(None, description="백엔드 작업 ID (알고 있는 경우)")
+
+
+class BuilderEventAck(BaseModel):
+    """Builder 이벤트 수신 응답"""
+
+    accepted: bool = Field(..., description="상태 반영 여부")
+    task_id: Optional[str] = Field(None, description="매칭된 백엔드 작업 ID")
+    status: Optional[str] = Field(None, description="반영 후 작업 상태")
+    duplicate: bool = Field(default=False, description="이미 반영된(또는 순서가 뒤바뀐) 이벤트 여부")
+
+
 class PushRequest(BaseModel):
     """ECR 푸시 요청"""
 
@@ -267,11 +370,17 @@ class DeployRequest(BaseModel):
     )
     custom_affinity: Optional[Dict[str, Any]] = Field(None, description="사용자 정의 affinity")
     function_id: Optional[str] = Field(None, description="Function ID (로그 구분용)")
+    workspace_id: str = Field(
+        default="ws-default", description="워크스페이스 ID (배포 완료 시 Function 갱신용)"
+    )
 
 
 class DeployResponse(BaseModel):
     """K8s 배포 응답"""
 
+    deploy_id: Optional[str] = Field(
+        None, description="배포 작업 ID (GET /v1/deploy/{deploy_id}로 진행 상태 조회)"
+    )
     app_name: Optional[str] = Field(None, description="배포된 SpinApp 이름")
     namespace: Optional[str] = Field(None, description="배포된 네임스페이스")
     service_name: Optional[str] = Field(None, description="SpinApp이 자동 생성한 Service 이름")
@@ -282,6 +391,33 @@ class DeployResponse(BaseModel):
     error: Optional[str] = Field(None, description="에러 메시지")
 
 
+class BulkDeployRequest(BaseModel):
+    """일괄 배포 요청"""
+
+    deployments: List[DeployRequest] = Field(
+        ..., min_length=1, max_length=200, description="배포 요청 목록"
+    )
+
+
+class DeployStatusResponse(BaseModel):
+    """배포 작업 상태 조회 응답"""
+
+    deploy_id: str = Field(..., description="배포 작업 ID")
+    status: str = Field(..., description="배포 상태: pending|deploying|ready|failed")
+    workspace_id: str = Field(..., description="워크스페이스 ID")
+    function_id: Optional[str] = Field(None, description="Function ID")
+    app_name: Optional[str] = Field(None, description="SpinApp 이름")
+    namespace: Optional[str] = Field(None, description="네임스페이스")
+    service_name: Optional[str] = Field(None, description="Service 이름")
+    endpoint: Optional[str] = Field(None, description="호출 URL (ready 이후 확정)")
+    probe_attempts: int = Field(0, description="엔드포인트 readiness 확인 횟수")
+    last_probe: Optional[str] = Field(None, description="마지막 readiness 확인 결과")
+    error: Optional[str] = Field(None, description="에러 메시지")
+    created_at: str = Field(..., description="생성 시간")
+    updated_at: str = Field(..., description="수정 시간")
+    ready_at: Optional[str] = Field(None, description="엔드포인트 응답 확인 시간")
+
+
 class BuildAndPushRequest(BaseModel):
     """빌드 및 푸시 통합 요청"""
 
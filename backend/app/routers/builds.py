@@ -1,6 +1,10 @@
 """빌드/배포 API 라우터"""
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, BackgroundTasks
-from typing import Optional
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Request, Query
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from collections import Counter
+from contextlib import suppress
+from typing import Any, Dict, List, Optional
 from app.models import (
     BuildResponse,
     TaskStatusResponse,
@@ -10,22 +14,57 @@ from app.models import (
     ScaffoldResponse,
     DeployRequest,
     DeployResponse,
+    BulkDeployRequest,
+    DeployStatusResponse,
     BuildAndPushRequest,
     WorkspaceTaskItem,
     WorkspaceTasksResponse,
+    BuilderEvent,
+    BuilderEventAck,
 )
 from app.database import db_client, s3_client
 from app.config import settings
-from app.utils.timezone import to_kst
+from app.services.builder_poller import builder_poller, get_builder_client
+from app.services.bulk_deploy import (
+    BulkDeployItem,
+    BulkDeployProgress,
+    function_update_batcher,
+)
+from app.services.deploy_watcher import DeployRejected, submit_deploy, watch_deploy
+from app.services.job_queue import JobFailed, LeasedJob, QueueFull, build_job_queue
+from app.services.registry_credentials import registry_credentials
+from app.services.source_validation import SourceValidationError, validate_source
+from app.services.task_events import task_event_hub
+from app.utils.http import get_http_client
+from app.utils.timezone import now_kst_iso, to_kst
 import logging
+import boto3
 import httpx
 import asyncio
+import hashlib
+import hmac
+import json
+import re
+import time
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# webhook 재전송 공격 방지를 위한 허용 시간 오차 (초)
+WEBHOOK_MAX_SKEW_SECONDS = 300
+# IRSA 사용 시 요청에 들어오는 기본 비밀번호
+DUMMY_REGISTRY_PASSWORD = "dummy-password"
+# 캐시된 이미지 확인용: ECR 레지스트리 호스트 ({account}.dkr.ecr.{region}.amazonaws.com)
+ECR_HOST_PATTERN = re.compile(r"^(\d+)\.dkr\.ecr\.([a-z0-9-]+)\.amazonaws\.com$")
+REGISTRY_MANIFEST_TYPES = (
+    "application/vnd.oci.image.index.v1+json",
+    "application/vnd.oci.image.manifest.v1+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+    "application/vnd.docker.distribution.manifest.v2+json",
+)
+
 
 # ===== Helper Functions =====
 def _to_kst_iso_string(value: Optional[str]) -> str:
@@ -46,160 +85,512 @@ def _get_workspace_id_from_task(task_id: str) -> Optional[str]:
     return None
 
 
-async def _real_build_process(
-    workspace_id: str, task_id: str, file_content: bytes, filename: str, app_name: str
-):
-    """실제 Builder Service 호출 및 폴링"""
-    try:
-        # DynamoDB 상태 갱신은 빌더 서비스 측에서 처리 (중복 업데이트 방지)
+def _is_inline_password(password: Optional[str]) -> bool:
+    """IRSA 기본값이 아닌 직접 지정한 비밀번호인지"""
+    return bool(password) and password != DUMMY_REGISTRY_PASSWORD
 
-        # 1. Builder Service의 /api/v1/build 호출
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            files = {"file": (filename, file_content)}
-            data = {
-                "workspace_id": workspace_id,
-                "app_name": app_name,
-            }
 
-            response = await client.post(
-                f"{settings.builder_service_url}/api/v1/build",
-                files=files,
-                data=data,
-            )
-            response.raise_for_status()
-            build_response = response.json()
-            builder_task_id = build_response.get("task_id")
+def _require_registry_credentials(password: Optional[str]):
+    """직접 지정한 비밀번호는 job 항목에 암호화해 둘 KMS 키가 있을 때만 받음 (task 생성 전에 확인)"""
+    if _is_inline_password(password) and not registry_credentials.enabled:
+        raise HTTPException(
+            status_code=400,
+            detail="Inline registry passwords are not accepted (BUILD_REGISTRY_KMS_KEY_ID is not configured); use IRSA",
+        )
 
-            logger.info(f"Build task {task_id} submitted to Builder Service: {builder_task_id}")
 
-        # 2. 폴링으로 Builder Service의 작업 상태 확인 (최대 10분)
-        max_attempts = 120  # 5초 * 120 = 600초 = 10분
-        for attempt in range(max_attempts):
-            await asyncio.sleep(5)
+async def _registry_auth(task_id: str, password: Optional[str]) -> Dict[str, Any]:
+    """
+    job payload의 인증 필드. 직접 지정한 비밀번호는 KMS로 암호화해 함께 저장하므로
+    job을 임대한 어느 레플리카든 복호화해 제출할 수 있다.
+    """
+    if not _is_inline_password(password):
+        return {"registry_auth": "irsa"}
+    ciphertext = await asyncio.to_thread(registry_credentials.seal, task_id, password)
+    return {"registry_auth": "kms", "registry_password": ciphertext}
+
+
+async def _registry_password(job: LeasedJob, irsa_password: str) -> str:
+    """job 제출에 쓸 비밀번호 (KMS 복호화). 복호화할 수 없는 job은 재시도 없이 실패"""
+    registry_auth = job.payload.get("registry_auth")
+    if registry_auth == "irsa" or registry_auth is None:
+        return irsa_password
+    password = None
+    if registry_auth == "kms":
+        password = await asyncio.to_thread(
+            registry_credentials.unseal, job.task_id, job.payload.get("registry_password")
+        )
+    if password is None:
+        # 이전 버전("inline")은 비밀번호를 받은 프로세스 메모리에만 두었음
+        raise JobFailed(
+            "Registry credentials are not available for this job; resubmit the request"
+        )
+    return password
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                status_response = await client.get(
-                    f"{settings.builder_service_url}/api/v1/tasks/{builder_task_id}",
-                    params={"workspace_id": workspace_id}
+
+def _attach_builder_task(workspace_id: str, task_id: str, builder_task_id: Optional[str]):
+    """webhook 이벤트 매칭을 위해 builder task_id를 BUILD# 항목에 기록"""
+    if not builder_task_id:
+        return
+    try:
+        db_client.attach_builder_task_id(workspace_id, task_id, builder_task_id)
+    except Exception as e:
+        logger.warning(f"Failed to attach builder task {builder_task_id} to {task_id}: {str(e)}")
+
+
+def _build_cache_key(
+    kind: str,
+    file_content: bytes,
+    filename: str,
+    app_name: Optional[str],
+    registry_url: Optional[str] = None,
+) -> str:
+    """빌드 결과 캐시 키: 소스 내용 + 파일명 + app_name + 런타임 (+ 레지스트리) 해시"""
+    digest = hashlib.sha256()
+    for part in (kind, settings.build_cache_runtime, filename, app_name or "", registry_url or ""):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(file_content)
+    return digest.hexdigest()
+
+
+async def _image_exists(image_url: str) -> bool:
+    """
+    레지스트리에 이미지가 남아 있는지 확인.
+    ECR은 IRSA 권한으로 DescribeImages, 그 외는 익명 manifest HEAD (인증 필요 시 확인 불가로 간주).
+    """
+    repository, separator, reference = image_url.rpartition("@")
+    if not separator:
+        repository, separator, reference = image_url.rpartition(":")
+        if not separator or "/" in reference:
+            repository, reference = image_url, "latest"
+    host, _, name = repository.partition("/")
+
+    ecr = ECR_HOST_PATTERN.match(host)
+    if ecr:
+        image_id = {"imageDigest" if "@" in image_url else "imageTag": reference}
+
+        def describe() -> bool:
+            client = boto3.client("ecr", region_name=ecr.group(2))
+            try:
+                client.describe_images(
+                    registryId=ecr.group(1), repositoryName=name, imageIds=[image_id]
                 )
-                status_response.raise_for_status()
-                status_data = status_response.json()
+            except client.exceptions.ImageNotFoundException:
+                return False
+            except client.exceptions.RepositoryNotFoundException:
+                return False
+            return True
+
+        return await asyncio.to_thread(describe)
+
+    response = await get_http_client("registry", timeout=10.0).head(
+        f"https://{host}/v2/{name}/manifests/{reference}",
+        headers={"Accept": ", ".join(REGISTRY_MANIFEST_TYPES)},
+    )
+    return response.is_success
+
+
+async def _cached_artifacts_exist(cached: Dict[str, Any], require_image: bool) -> bool:
+    """캐시 항목의 wasm/이미지가 아직 존재하는지 확인 (확인할 수 없으면 재사용하지 않음)"""
+    wasm_path = cached.get("wasm_path") or ""
+    if not wasm_path.startswith("s3://"):
+        return False
+    if not await asyncio.to_thread(s3_client.uri_exists, wasm_path):
+        return False
+    if require_image:
+        return await _image_exists(cached["image_url"])
+    return True
+
+
+async def _reuse_cached_build(
+    workspace_id: str,
+    cache_key: str,
+    app_name: Optional[str],
+    file_content: bytes,
+    filename: str,
+    require_image: bool,
+) -> Optional[BuildResponse]:
+    """
+    캐시된 빌드 결과가 있으면 즉시 완료된 작업을 만들어 반환.
+    산출물이 사라졌으면 캐시 항목을 지우고 새로 빌드하게 한다.
+    """
+    try:
+        cached = db_client.get_build_cache(workspace_id, cache_key)
+        if not cached or not cached.get("wasm_path") or (
+            require_image and not cached.get("image_url")
+        ):
+            return None
+        if not await _cached_artifacts_exist(cached, require_image):
+            logger.info(f"Build cache {cache_key[:12]} artifacts are gone, rebuilding")
+            db_client.delete_build_cache(workspace_id, cache_key)
+            return None
+    except Exception as e:
+        logger.warning(f"Build cache lookup failed: {str(e)}")
+        return None
+
+    task = db_client.create_build_task(
+        workspace_id=workspace_id, app_name=app_name or cached.get("app_name")
+    )
+    # 일반 빌드와 같이 작업별 소스 경로를 남김 (원본 작업의 소스는 GC로 지워질 수 있음)
+    s3_path = s3_client.save_build_source(workspace_id, task["task_id"], file_content, filename)
+    db_client.update_build_task_status(
+        workspace_id,
+        task["task_id"],
+        status="completed",
+        wasm_path=cached.get("wasm_path"),
+        image_url=cached.get("image_url"),
+        source_path=s3_path,
+    )
+    logger.info(
+        f"Build task {task['task_id']} reused cached result of {cached.get('source_task_id')}"
+    )
+    return BuildResponse(
+        task_id=task["task_id"],
+        status="completed",
+        message=f"Build result reused from cache (task {cached.get('source_task_id')})",
+        source_s3_path=s3_path,
+    )
+
+
+def _store_build_cache(job: LeasedJob, wasm_path: Optional[str], image_url: Optional[str] = None):
+    """빌드 성공 결과를 캐시에 기록 (실패해도 job은 성공 처리)"""
+    cache_key = job.payload.get("cache_key")
+    if not cache_key or not wasm_path:
+        return
+    try:
+        db_client.put_build_cache(
+            job.workspace_id,
+            cache_key,
+            task_id=job.task_id,
+            app_name=job.payload.get("app_name"),
+            wasm_path=wasm_path,
+            image_url=image_url,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to store build cache for {job.task_id}: {str(e)}")
 
-                status = status_data.get("status")
-                logger.info(f"Build task {task_id} status: {status} (attempt {attempt + 1}/{max_attempts})")
 
-                # 상태 업데이트
-                if status in ["completed", "done"]:
-                    result = status_data.get("result", {})
-                    wasm_path = result.get("wasm_path")
+def _verify_builder_signature(body: bytes, timestamp: Optional[str], signature: Optional[str]):
+    """
+    Builder webhook 서명 검증
 
-                    logger.info(f"Build task {task_id} completed: {wasm_path}")
-                    break
+    X-Builder-Signature: sha256=HMAC_SHA256(secret, "{X-Builder-Timestamp}.{body}")
+    """
+    if not timestamp or not signature:
+        raise HTTPException(status_code=401, detail="Missing webhook signature")
 
-                elif status == "failed":
-                    error_msg = status_data.get("error", "Build failed")
-                    logger.error(f"Build task {task_id} failed: {error_msg}")
-                    break
+    try:
+        sent_at = float(timestamp)
+    except ValueError:
+        raise HTTPException(status_code=401, detail="Invalid webhook timestamp")
+    if abs(time.time() - sent_at) > WEBHOOK_MAX_SKEW_SECONDS:
+        raise HTTPException(status_code=401, detail="Webhook timestamp out of range")
+
+    expected = hmac.new(
+        settings.builder_webhook_secret.encode("utf-8"),
+        timestamp.encode("utf-8") + b"." + body,
+        hashlib.sha256,
+    ).hexdigest()
+    provided = signature.split("=", 1)[1] if signature.startswith("sha256=") else signature
+    if not hmac.compare_digest(expected, provided):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+
+
+async def _validate_upload(filename: str, file_content: bytes) -> Dict[str, Any]:
+    """빌드 전 소스 검증. 실패 시 구조화된 detail과 함께 422"""
+    try:
+        return await validate_source(filename, file_content)
+    except SourceValidationError as e:
+        logger.info(f"Rejected build source {filename}: {e.code} {e.message}")
+        raise HTTPException(status_code=422, detail=e.as_detail())
 
-                else:
-                    # running 또는 pending 상태는 로그만 남김
-                    logger.debug(f"Build task {task_id} status (no-op update): {status}")
 
-        else:
-            # 타임아웃 (10분 초과)
-            error_msg = "Build timeout (10 minutes exceeded)"
-            logger.error(f"Build task {task_id} timed out")
+def _admit_job(workspace_id: str, kind: str = "build", count: int = 1):
+    """job 대기열 admission 확인 (배포는 별도 lane). 가득 찼으면 Retry-After와 함께 429"""
+    try:
+        build_job_queue.admit(workspace_id, kind, count)
+    except QueueFull as e:
+        logger.warning(f"{kind} admission rejected for {workspace_id}: {e}")
+        raise HTTPException(
+            status_code=429,
+            detail=f"{e}. Retry after {e.retry_after}s",
+            headers={"Retry-After": str(e.retry_after)},
+        )
 
-    except httpx.HTTPError as e:
-        logger.error(f"Build task {task_id} HTTP error: {str(e)}")
-    except Exception as e:
-        logger.error(f"Build task {task_id} failed: {str(e)}")
 
+async def _real_build_process(job: LeasedJob):
+    """실제 Builder Service 호출 및 폴링 (job 핸들러)"""
+    workspace_id, task_id = job.workspace_id, job.task_id
+    payload = job.payload
+    # DynamoDB 상태 갱신은 빌더 서비스 측에서 처리 (중복 업데이트 방지)
 
-async def _real_push_process(
-    workspace_id: str,
-    task_id: str,
-    registry_url: str,
-    username: str,
-    password: Optional[str],
-    tag: str,
-    s3_source_path: str
-):
-    """실제 Builder Service의 Push API 호출 및 폴링"""
-    dummy_password = "dummy-password"
-    try:
-        # DynamoDB 상태 갱신은 빌더 서비스 측에서 처리 (중복 업데이트 방지)
+    builder_task_id = job.builder_task_id
+    if not builder_task_id:
+        # 1. Builder Service의 /api/v1/build 호출 (소스는 업로드 시 저장한 S3에서 읽음)
+        file_content = await asyncio.to_thread(
+            s3_client.get_build_source, workspace_id, task_id, payload["filename"]
+        )
+        client = get_builder_client()
+        files = {"file": (payload["filename"], file_content)}
+        data = {
+            "workspace_id": workspace_id,
+            "app_name": payload["app_name"],
+        }
 
+        response = await client.post(
+            f"{settings.builder_service_url}/api/v1/build",
+            files=files,
+            data=data,
+        )
+        response.raise_for_status()
+        build_response = response.json()
+        builder_task_id = build_response.get("task_id")
+
+        logger.info(f"Build task {task_id} submitted to Builder Service: {builder_task_id}")
+        await job.record_builder_task(builder_task_id)
+        _attach_builder_task(workspace_id, task_id, builder_task_id)
+    else:
+        logger.info(f"Build task {task_id} resuming builder task {builder_task_id}")
+
+    # 2. 공용 폴러로 Builder Service의 작업 상태 확인 (최대 10분)
+    status_data = await builder_poller.wait(builder_task_id, workspace_id, label="Build")
+
+    if status_data is None:
+        # 타임아웃 (10분 초과)
+        logger.error(f"Build task {task_id} timed out")
+    elif status_data.get("status") == "failed":
+        error_msg = status_data.get("error", "Build failed")
+        logger.error(f"Build task {task_id} failed: {error_msg}")
+    else:
+        result = status_data.get("result", {})
+        wasm_path = result.get("wasm_path")
+        _store_build_cache(job, wasm_path)
+        logger.info(f"Build task {task_id} completed: {wasm_path}")
+
+
+async def _real_push_process(job: LeasedJob):
+    """실제 Builder Service의 Push API 호출 및 폴링 (job 핸들러)"""
+    workspace_id, task_id = job.workspace_id, job.task_id
+    payload = job.payload
+    # DynamoDB 상태 갱신은 빌더 서비스 측에서 처리 (중복 업데이트 방지)
+
+    builder_task_id = job.builder_task_id
+    if not builder_task_id:
         # 1. Builder Service의 /api/v1/push 호출
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            push_data = {
-                "registry_url": registry_url,
-                "username": username,
-                "password": password or dummy_password,
-                "tag": tag,
-                "workspace_id": workspace_id,
-                "s3_source_path": s3_source_path,
-            }
+        client = get_builder_client()
+        push_data = {
+            "registry_url": payload["registry_url"],
+            "username": payload["username"],
+            "password": await _registry_password(job, DUMMY_REGISTRY_PASSWORD),
+            "tag": payload["tag"],
+            "workspace_id": workspace_id,
+            "s3_source_path": payload.get("s3_source_path") or "",
+        }
 
-            response = await client.post(
-                f"{settings.builder_service_url}/api/v1/push",
-                json=push_data,
+        response = await client.post(
+            f"{settings.builder_service_url}/api/v1/push",
+            json=push_data,
+        )
+        response.raise_for_status()
+        push_response = response.json()
+        builder_task_id = push_response.get("task_id")
+
+        logger.info(f"Push task {task_id} submitted to Builder Service: {builder_task_id}")
+        await job.record_builder_task(builder_task_id)
+        _attach_builder_task(workspace_id, task_id, builder_task_id)
+    else:
+        logger.info(f"Push task {task_id} resuming builder task {builder_task_id}")
+
+    # 2. 공용 폴러로 작업 상태 확인 (최대 10분)
+    status_data = await builder_poller.wait(builder_task_id, workspace_id, label="Push")
+
+    if status_data is None:
+        logger.error(f"Push task {task_id} timed out")
+    elif status_data.get("status") == "failed":
+        error_msg = status_data.get("error", "Push failed")
+        logger.error(f"Push task {task_id} failed: {error_msg}")
+    else:
+        result = status_data.get("result", {})
+        image_url = result.get("image_url") or result.get("image_uri")
+        logger.info(f"Push task {task_id} completed: {image_url}")
+
+
+async def _real_build_and_push_process(job: LeasedJob):
+    """Build and Push를 순차적으로 실행 (job 핸들러)"""
+    workspace_id, task_id = job.workspace_id, job.task_id
+    payload = job.payload
+    registry_url = payload["registry_url"]
+    effective_tag = payload["tag"]
+    # 상태 업데이트는 빌더에서 처리
+
+    builder_task_id = job.builder_task_id
+    if not builder_task_id:
+        # Builder Service에 build-and-push 요청
+        file_content = await asyncio.to_thread(
+            s3_client.get_build_source, workspace_id, task_id, payload["filename"]
+        )
+        client = get_builder_client()
+        files = {"file": (payload["filename"], file_content)}
+        data = {
+            "registry_url": registry_url,
+            "username": payload["username"],
+            "workspace_id": workspace_id,
+            "tag": effective_tag,
+            "app_name": payload["app_name"],
+            # IRSA 기본값(AWS/더미)은 빈 크리덴셜로 정규화되어 username도 비어 있음
+            "password": await _registry_password(
+                job, DUMMY_REGISTRY_PASSWORD if payload["username"] else ""
+            ),
+        }
+
+        response = await client.post(
+            f"{settings.builder_service_url}/api/v1/build-and-push",
+            files=files,
+            data=data,
+        )
+        response.raise_for_status()
+        build_push_response = response.json()
+        builder_task_id = build_push_response.get("task_id")
+
+        logger.info(f"Build-and-push task {task_id} submitted: {builder_task_id}")
+        await job.record_builder_task(builder_task_id)
+        _attach_builder_task(workspace_id, task_id, builder_task_id)
+    else:
+        logger.info(f"Build-and-push task {task_id} resuming builder task {builder_task_id}")
+
+    # 공용 폴러로 상태 확인
+    status_data = await builder_poller.wait(
+        builder_task_id, workspace_id, label="Build-and-push"
+    )
+
+    if status_data is None:
+        error_msg = "Build-and-push timeout (10 minutes exceeded)"
+        task_event_hub.publish(
+            db_client.update_build_task_status(
+                workspace_id,
+                task_id,
+                status="failed",
+                error_message=error_msg
             )
-            response.raise_for_status()
-            push_response = response.json()
-            builder_task_id = push_response.get("task_id")
+        )
+        logger.error(f"Build-and-push task {task_id} timed out")
 
-            logger.info(f"Push task {task_id} submitted to Builder Service: {builder_task_id}")
+    elif status_data.get("status") == "failed":
+        error_msg = status_data.get("error", "Build-and-push failed")
 
-        # 2. 폴링으로 작업 상태 확인 (최대 10분)
-        max_attempts = 120
-        for attempt in range(max_attempts):
-            await asyncio.sleep(5)
+        task_event_hub.publish(
+            db_client.update_build_task_status(
+                workspace_id,
+                task_id,
+                status="failed",
+                error_message=error_msg
+            )
+        )
+        logger.error(f"Build-and-push task {task_id} failed: {error_msg}")
+
+    else:
+        result = status_data.get("result", {})
+        wasm_path = result.get("wasm_path")
+
+        # 이미지 URL이 없으면 백엔드에서 조합해서 생성
+        image_url = result.get("image_url") or result.get("image_uri")
+        if not image_url and registry_url and effective_tag:
+            image_url = f"{registry_url}:{effective_tag}"
+
+        # 상태 업데이트
+        task_event_hub.publish(
+            db_client.update_build_task_status(
+                workspace_id,
+                task_id,
+                status="completed",
+                wasm_path=wasm_path,
+                image_url=image_url
+            )
+        )
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                status_response = await client.get(
-                    f"{settings.builder_service_url}/api/v1/tasks/{builder_task_id}",
-                    params={"workspace_id": workspace_id}
-                )
-                status_response.raise_for_status()
-                status_data = status_response.json()
+        _store_build_cache(job, wasm_path, image_url)
+        logger.info(f"Build-and-push task {task_id} completed: {image_url}")
 
-                status = status_data.get("status")
-                logger.info(f"Push task {task_id} status: {status} (attempt {attempt + 1}/{max_attempts})")
 
-                if status in ["completed", "done"]:
-                    result = status_data.get("result", {})
-                    image_url = result.get("image_url") or result.get("image_uri")
+async def _mark_task_failed(job: LeasedJob, error: str):
+    """재시도를 모두 소진한 job의 BUILD# 항목을 실패로 기록"""
+    task_event_hub.publish(
+        db_client.update_build_task_status(
+            job.workspace_id,
+            job.task_id,
+            status="failed",
+            error_message=error,
+            forward_only=True,
+        )
+    )
 
-                    logger.info(f"Push task {task_id} completed: {image_url}")
-                    break
 
-                elif status == "failed":
-                    error_msg = status_data.get("error", "Push failed")
-                    logger.error(f"Push task {task_id} failed: {error_msg}")
-                    break
+async def _real_deploy_process(job: LeasedJob):
+    """
+    배포 job: Builder에 배포를 한 번만 요청한 뒤 엔드포인트가 응답할 때까지 감시하고,
+    준비되면 Function의 invocationUrl/lastDeployed를 갱신
+    """
+    workspace_id, deploy_id = job.workspace_id, job.task_id
+    deploy_task = await asyncio.to_thread(db_client.get_deploy_task, workspace_id, deploy_id)
+    if not deploy_task:
+        raise JobFailed(f"Deploy task not found: {deploy_id}")
 
-                else:
-                    logger.debug(f"Push task {task_id} status (no-op update): {status}")
+    # 재개된 job: 이미 제출된 배포는 다시 요청하지 않고 readiness 감시만 이어감
+    try:
+        if not deploy_task.get("submitted_at"):
+            deploy_task = await submit_deploy(
+                workspace_id,
+                deploy_id,
+                json.loads(job.payload["deploy_data"]),
+                deploy_task.get("namespace") or "default",
+            )
+        endpoint = await watch_deploy(deploy_task)
+    except DeployRejected as e:
+        raise JobFailed(str(e))
+    if not endpoint:
+        raise JobFailed(
+            f"Endpoint not ready within {settings.deploy_readiness_timeout_seconds:.0f}s"
+        )
 
-        else:
-            # 타임아웃
-            error_msg = "Push timeout (10 minutes exceeded)"
-            logger.error(f"Push task {task_id} timed out")
+    function_id = deploy_task.get("function_id")
+    if function_id:
+        # 다른 배포 job의 갱신과 묶어 반영, 배포 중 삭제된 함수는 다시 만들지 않음 (조건부 갱신)
+        updated = await function_update_batcher.update(
+            workspace_id,
+            function_id,
+            {"status": "active", "invocationUrl": endpoint, "lastDeployed": now_kst_iso()},
+        )
+        if not updated:
+            logger.warning(f"Deploy {deploy_id} finished but function {function_id} is gone")
+    logger.info(f"Deploy {deploy_id} ready at {endpoint}")
 
-    except httpx.HTTPError as e:
-        logger.error(f"Push task {task_id} HTTP error: {str(e)}")
-    except Exception as e:
-        logger.error(f"Push task {task_id} failed: {str(e)}")
+
+async def _mark_deploy_failed(job: LeasedJob, error: str):
+    """재시도를 모두 소진한 배포 job의 DEPLOY# 항목을 실패로 기록"""
+    await asyncio.to_thread(
+        db_client.update_deploy_task,
+        job.workspace_id,
+        job.task_id,
+        {"status": "failed", "error_message": error},
+    )
+
+
+build_job_queue.register("build", _real_build_process, on_failure=_mark_task_failed)
+build_job_queue.register("push", _real_push_process, on_failure=_mark_task_failed)
+build_job_queue.register(
+    "build_and_push", _real_build_and_push_process, on_failure=_mark_task_failed
+)
+build_job_queue.register("deploy", _real_deploy_process, on_failure=_mark_deploy_failed)
 
 
 # ===== POST /api/v1/build =====
 @router.post("/v1/build", response_model=BuildResponse, status_code=202)
 async def build(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(..., description=".py 파일 또는 .zip 아카이브"),
     app_name: Optional[str] = Form(None, description="애플리케이션 이름"),
     workspace_id: str = Form(default="ws-default", description="워크스페이스 ID"),
+    force: bool = Query(False, description="빌드 결과 캐시를 무시하고 다시 빌드"),
 ):
     """
     파일 업로드 및 빌드 시작
@@ -207,6 +598,10 @@ async def build(
     - **file**: .py 파일 또는 .zip 아카이브 (필수)
     - **app_name**: 애플리케이션 이름 (선택, 미지정시 자동 생성)
     - **workspace_id**: 워크스페이스 ID (기본값: ws-default)
+    - **force**: true이면 동일 소스의 캐시된 빌드 결과를 재사용하지 않음
+
+    구문 오류/손상된 zip 등은 업로드 전에 422로 거절된다
+    (detail: code, message, file, line, offset).
     """
     try:
         # 파일 확장자 검증
@@ -221,6 +616,22 @@ async def build(
         # 파일 읽기
         file_content = await file.read()
 
+        # 동일 소스의 빌드 결과가 있으면 재사용
+        cache_key = _build_cache_key("build", file_content, file.filename, app_name)
+        if not force:
+            cached_response = await _reuse_cached_build(
+                workspace_id, cache_key, app_name, file_content, file.filename, require_image=False
+            )
+            if cached_response:
+                return cached_response
+
+        # Builder로 보내기 전에 깨진 소스를 즉시 거절
+        validation = await _validate_upload(file.filename, file_content)
+        logger.info(f"Build source validated: entry={validation['entry_module']}")
+
+        # 캐시로 처리되지 않는 빌드만 대기열 한도 확인
+        _admit_job(workspace_id)
+
         # BuildTask 생성
         task = db_client.create_build_task(
             workspace_id=workspace_id, app_name=app_name, source_path=None
@@ -236,9 +647,12 @@ async def build(
         # Task에 source_path 업데이트
         # 상태 업데이트는 빌더에서 처리
 
-        # 백그라운드에서 빌드 프로세스 실행
-        background_tasks.add_task(
-            _real_build_process, workspace_id, task_id, file_content, file.filename, final_app_name
+        # 빌드 job 등록 (워커가 S3 소스로 빌드 프로세스 실행)
+        build_job_queue.enqueue(
+            "build",
+            {"filename": file.filename, "app_name": final_app_name, "cache_key": cache_key},
+            workspace_id=workspace_id,
+            task_id=task_id,
         )
 
         return BuildResponse(
@@ -253,6 +667,27 @@ async def build(
 
 
 # ===== GET /api/v1/tasks/{task_id} =====
+def _task_status_response(
+    task: Dict[str, Any], queue_position: Optional[int] = None
+) -> TaskStatusResponse:
+    """BUILD# 항목을 작업 상태 응답으로 변환"""
+    result = None
+    if task["status"] == "completed":
+        result = BuildTaskResult(
+            wasm_path=task.get("wasm_path"),
+            image_url=task.get("image_url"),
+            file_path=task.get("source_code_path"),
+        )
+
+    return TaskStatusResponse(
+        task_id=task["task_id"],
+        status=task["status"],
+        result=result,
+        error=task.get("error_message"),
+        queue_position=queue_position,
+    )
+
+
 @router.get("/v1/tasks/{task_id}", response_model=TaskStatusResponse)
 async def get_task_status(task_id: str):
     """
@@ -267,21 +702,13 @@ async def get_task_status(task_id: str):
         if not task:
             raise HTTPException(status_code=404, detail="Task not found: uuid=string")
 
-        # 응답 구성
-        result = None
-        if task["status"] == "completed":
-            result = BuildTaskResult(
-                wasm_path=task.get("wasm_path"),
-                image_url=task.get("image_url"),
-                file_path=task.get("source_code_path"),
-            )
+        # 실행 대기 중이면 대기열 순번 포함
+        queue_position = None
+        if task["status"] == "pending":
+            queue_position = build_job_queue.queue_position(task_id)
 
-        return TaskStatusResponse(
-            task_id=task["task_id"],
-            status=task["status"],
-            result=result,
-            error=task.get("error_message"),
-        )
+        # 응답 구성
+        return _task_status_response(task, queue_position)
 
     except HTTPException:
         raise
@@ -290,6 +717,67 @@ async def get_task_status(task_id: str):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+# ===== GET /api/v1/tasks/{task_id}/events =====
+@router.get("/v1/tasks/{task_id}/events")
+async def stream_task_events(
+    request: Request,
+    task_id: str,
+    workspace_id: Optional[str] = Query(
+        None, description="워크스페이스 ID (지정 시 테이블 scan 없이 키 조회)"
+    ),
+):
+    """
+    작업 상태 변경 스트림 (Server-Sent Events)
+
+    - 연결 직후 현재 상태를, 이후 상태가 바뀔 때마다 `event: status` 로 `TaskStatusResponse` 를 전송
+    - completed/failed 에 도달하면 스트림 종료
+    - **workspace_id**: 지정하면 작업 조회 시 scan을 생략
+    """
+    if workspace_id:
+        task = db_client.get_build_task(workspace_id, task_id)
+    else:
+        task = db_client.get_build_task_by_id(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail=f"Task not found: {task_id}")
+
+    async def event_stream():
+        updates = task_event_hub.subscribe(task["workspace_id"], task_id)
+        next_update = None
+        try:
+            while True:
+                if next_update is None:
+                    next_update = asyncio.ensure_future(updates.__anext__())
+                done, _ = await asyncio.wait(
+                    {next_update}, timeout=settings.task_events_keepalive_seconds
+                )
+                if await request.is_disconnected():
+                    return
+                if not done:
+                    # 프록시/ALB idle timeout 방지
+                    yield ": keep-alive\n\n"
+                    continue
+                try:
+                    current = next_update.result()
+                except StopAsyncIteration:
+                    return
+                next_update = None
+                payload = _task_status_response(current).model_dump_json()
+                yield f"event: status\ndata: {payload}\n\n"
+        finally:
+            if next_update is not None:
+                # cancel()은 취소를 예약만 하므로 __anext__가 실제로 끝난 뒤에 aclose()
+                next_update.cancel()
+                with suppress(asyncio.CancelledError, StopAsyncIteration):
+                    await next_update
+            await updates.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # ===== GET /api/v1/workspaces/{workspace_id}/tasks =====
 @router.get("/v1/workspaces/{workspace_id}/tasks", response_model=WorkspaceTasksResponse)
 async def list_workspace_tasks(workspace_id: str):
@@ -336,9 +824,82 @@ async def list_workspace_tasks(workspace_id: str):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+# ===== POST /api/v1/builder-events =====
+@router.post("/v1/builder-events", response_model=BuilderEventAck)
+async def receive_builder_event(request: Request):
+    """
+    Builder Service 상태 변경 webhook
+
+    - 헤더 `X-Builder-Timestamp`, `X-Builder-Signature` (HMAC-SHA256) 필수
+    - 이벤트는 BUILD# 항목에 순서 보장(sequence/상태 순서) 방식으로 반영되며,
+      중복되거나 늦게 도착한 이벤트는 `duplicate=true` 로 무시된다
+    """
+    if not settings.builder_webhook_secret:
+        raise HTTPException(status_code=503, detail="Builder webhook is not configured")
+
+    body = await request.body()
+    _verify_builder_signature(
+        body,
+        request.headers.get("X-Builder-Timestamp"),
+        request.headers.get("X-Builder-Signature"),
+    )
+
+    try:
+        event = BuilderEvent.model_validate_json(body)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+
+    try:
+        if event.backend_task_id:
+            task = db_client.get_build_task(event.workspace_id, event.backend_task_id)
+        else:
+            task = db_client.find_build_task_by_builder_id(event.workspace_id, event.task_id)
+        if not task:
+            # 제출 직후 builder_task_id 기록 전에 이벤트가 도착할 수 있으므로 재시도 유도
+            raise HTTPException(status_code=404, detail=f"Task not found: {event.task_id}")
+
+        status_value = "completed" if event.status == "done" else event.status
+        result = event.result or {}
+        updated = db_client.update_build_task_status(
+            event.workspace_id,
+            task["task_id"],
+            status=status_value,
+            wasm_path=result.get("wasm_path") if status_value == "completed" else None,
+            image_url=(
+                (result.get("image_url") or result.get("image_uri"))
+                if status_value == "completed"
+                else None
+            ),
+            error_message=(event.error or "Build failed") if status_value == "failed" else None,
+            event_seq=event.sequence,
+            forward_only=True,
+        )
+
+        # 이 레플리카가 추적 중인 task라면 폴링을 기다리지 않고 즉시 반영
+        await builder_poller.notify(event.task_id, event.model_dump(exclude_none=True))
+
+        if updated is None:
+            logger.info(
+                f"Builder event for {task['task_id']} ignored (duplicate/out-of-order): {event.status}"
+            )
+            return BuilderEventAck(
+                accepted=False, task_id=task["task_id"], status=task.get("status"), duplicate=True
+            )
+
+        task_event_hub.publish(updated)
+        logger.info(f"Builder event applied to {task['task_id']}: {status_value}")
+        return BuilderEventAck(accepted=True, task_id=task["task_id"], status=updated.get("status"))
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Builder event error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
 # ===== POST /api/v1/push =====
 @router.post("/v1/push", response_model=BuildResponse, status_code=202)
-async def push_to_ecr(background_tasks: BackgroundTasks, request: PushRequest):
+async def push_to_ecr(request: PushRequest):
     """
     ECR에 이미지 푸시
 
@@ -350,27 +911,34 @@ async def push_to_ecr(background_tasks: BackgroundTasks, request: PushRequest):
     """
     try:
         workspace_id = request.workspace_id
+        _require_registry_credentials(request.password)
+        _admit_job(workspace_id)
 
         # Task 생성
         task = db_client.create_build_task(workspace_id=workspace_id, app_name=None)
         task_id = task["task_id"]
 
-        # 백그라운드에서 푸시 프로세스 실행 (상태 업데이트는 빌더에서 처리)
-        background_tasks.add_task(
-            _real_push_process,
-            workspace_id,
-            task_id,
-            request.registry_url,
-            request.username,
-            request.password,
-            request.tag,
-            request.s3_source_path or "",
+        # 푸시 job 등록 (상태 업데이트는 빌더에서 처리)
+        build_job_queue.enqueue(
+            "push",
+            {
+                "registry_url": request.registry_url,
+                "username": request.username,
+                # 직접 지정한 비밀번호는 KMS 암호문으로만 저장
+                **(await _registry_auth(task_id, request.password)),
+                "tag": request.tag,
+                "s3_source_path": request.s3_source_path or "",
+            },
+            workspace_id=workspace_id,
+            task_id=task_id,
         )
 
         return BuildResponse(
             task_id=task_id, status="pending", message="Push task created"
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Push endpoint error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -426,10 +994,38 @@ async def scaffold_spinapp(request: ScaffoldRequest):
 
 
 # ===== POST /api/v1/deploy =====
-@router.post("/v1/deploy", response_model=DeployResponse)
+def _deploy_payload(request: DeployRequest) -> Dict[str, Any]:
+    """Builder /api/v1/deploy 요청 본문 구성"""
+    # app_name을 소문자로 변환 (Spin TOML 규칙 준수)
+    app_name_sanitized = request.app_name.lower() if request.app_name else None
+
+    deploy_data = {
+        "app_name": app_name_sanitized,
+        "namespace": request.namespace,
+        "service_account": request.service_account,
+        "cpu_limit": request.cpu_limit,
+        "memory_limit": request.memory_limit,
+        "cpu_request": request.cpu_request,
+        "memory_request": request.memory_request,
+        "image_ref": request.image_ref,
+        "enable_autoscaling": request.enable_autoscaling,
+        "replicas": request.replicas,
+        "use_spot": request.use_spot,
+        "custom_tolerations": request.custom_tolerations,
+        "custom_affinity": request.custom_affinity,
+        "function_id": request.function_id,  # 로그 구분용 Function ID
+    }
+
+    # 오토스케일링이 활성화된 경우, replicas 필드를 반드시 제거
+    if deploy_data.get("enable_autoscaling"):
+        del deploy_data["replicas"]
+    return deploy_data
+
+
+@router.post("/v1/deploy", response_model=DeployResponse, status_code=202)
 async def deploy_to_k8s(request: DeployRequest):
     """
-    K8s에 SpinApp 배포
+    K8s에 SpinApp 배포 (비동기)
 
     - **namespace**: Kubernetes 네임스페이스 (필수)
     - **image_ref**: 이미지 참조 (필수)
@@ -437,81 +1033,172 @@ async def deploy_to_k8s(request: DeployRequest):
     - **replicas**: 레플리카 수 (기본값: 1)
     - **enable_autoscaling**: HPA/KEDA 활성화 (기본값: true)
     - **use_spot**: Spot 인스턴스 사용 (기본값: true)
+    - **workspace_id**: 워크스페이스 ID (function_id와 함께 배포 완료 시 Function 갱신)
+
+    배포 job을 등록하고 deploy_id를 즉시 반환한다. 엔드포인트가 응답하면
+    Function의 invocationUrl/lastDeployed가 갱신되며, 진행 상태는 GET /v1/deploy/{deploy_id}로 조회한다.
     """
-    # Builder Service의 /api/v1/deploy 호출
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        # app_name을 소문자로 변환 (Spin TOML 규칙 준수)
-        app_name_sanitized = request.app_name.lower() if request.app_name else None
-
-        deploy_data = {
-            "app_name": app_name_sanitized,
-            "namespace": request.namespace,
-            "service_account": request.service_account,
-            "cpu_limit": request.cpu_limit,
-            "memory_limit": request.memory_limit,
-            "cpu_request": request.cpu_request,
-            "memory_request": request.memory_request,
-            "image_ref": request.image_ref,
-            "enable_autoscaling": request.enable_autoscaling,
-            "replicas": request.replicas,
-            "use_spot": request.use_spot,
-            "custom_tolerations": request.custom_tolerations,
-            "custom_affinity": request.custom_affinity,
-            "function_id": request.function_id,  # 로그 구분용 Function ID
-        }
+    try:
+        deploy_data = _deploy_payload(request)
+        app_name_sanitized = deploy_data["app_name"]
 
-        # 오토스케일링이 활성화된 경우, replicas 필드를 반드시 제거
-        if deploy_data.get("enable_autoscaling"):
-            del deploy_data["replicas"]
+        _admit_job(request.workspace_id, "deploy")
 
-        logger.info(f"Final deploy data being sent: {deploy_data}")
-        response = await client.post(
-            f"{settings.builder_service_url}/api/v1/deploy",
-            json=deploy_data,
+        deploy_task = db_client.create_deploy_task(
+            workspace_id=request.workspace_id,
+            app_name=app_name_sanitized,
+            namespace=request.namespace,
+            function_id=request.function_id,
+        )
+        deploy_id = deploy_task["deploy_id"]
+
+        # 배포 job 등록 (tolerations 등 임의 구조는 JSON 문자열로 저장)
+        build_job_queue.enqueue(
+            "deploy",
+            {"deploy_data": json.dumps(deploy_data)},
+            workspace_id=request.workspace_id,
+            task_id=deploy_id,
         )
-        
-        # --- GUARANTEED LOGGING ---
-        logger.info(f"Builder service response received. Status: {response.status_code}, Body: {response.text}")
-        # --- END GUARANTEED LOGGING ---
-
-        response.raise_for_status()
-        deploy_response = response.json()
-
-        # Service 생성 대기 (5초) 및 재조회
-        if not deploy_response.get("endpoint"):
-            logger.info("Endpoint not ready, waiting 5 seconds...")
-            await asyncio.sleep(5)
-            
-            generated_app_name = deploy_response.get("app_name")
-            if generated_app_name:
-                deploy_data["app_name"] = generated_app_name
-                
-                logger.info(f"Re-sending deploy data: {deploy_data}")
-                response = await client.post(
-                    f"{settings.builder_service_url}/api/v1/deploy",
-                    json=deploy_data,
-                )
-                
-                logger.info(f"Builder service retry response. Status: {response.status_code}, Body: {response.text}")
-                response.raise_for_status()
-                deploy_response = response.json()
 
         return DeployResponse(
-            app_name=deploy_response.get("app_name"),
-            namespace=deploy_response.get("namespace"),
-            service_name=deploy_response.get("service_name"),
-            service_status=deploy_response.get("service_status", "pending"),
-            endpoint=deploy_response.get("endpoint"),
-            enable_autoscaling=deploy_response.get("enable_autoscaling"),
-            use_spot=deploy_response.get("use_spot"),
-            error=deploy_response.get("error"),
+            deploy_id=deploy_id,
+            app_name=app_name_sanitized,
+            namespace=request.namespace,
+            service_status="pending",
+            enable_autoscaling=request.enable_autoscaling,
+            use_spot=request.use_spot,
         )
 
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Deploy endpoint error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+def _enqueue_bulk_deploy(body: BulkDeployRequest) -> List[BulkDeployItem]:
+    """항목마다 DEPLOY# 항목을 만들고 deploy job을 등록 (블로킹, 스레드에서 실행)"""
+    items = []
+    for index, deploy_request in enumerate(body.deployments):
+        deploy_data = _deploy_payload(deploy_request)
+        deploy_task = db_client.create_deploy_task(
+            workspace_id=deploy_request.workspace_id,
+            app_name=deploy_data["app_name"],
+            namespace=deploy_request.namespace,
+            function_id=deploy_request.function_id,
+        )
+        build_job_queue.enqueue(
+            "deploy",
+            {"deploy_data": json.dumps(deploy_data)},
+            workspace_id=deploy_request.workspace_id,
+            task_id=deploy_task["deploy_id"],
+        )
+        items.append(
+            BulkDeployItem(
+                index=index,
+                deploy_id=deploy_task["deploy_id"],
+                workspace_id=deploy_request.workspace_id,
+                function_id=deploy_request.function_id,
+            )
+        )
+    return items
+
+
+@router.post("/v1/deploy/bulk")
+async def bulk_deploy(request: Request, body: BulkDeployRequest):
+    """
+    여러 함수 일괄 배포 (Server-Sent Events로 진행 상황 스트리밍)
+
+    - **deployments**: DeployRequest 목록 (최대 200개)
+    - 항목마다 단건 배포와 같은 deploy job을 등록 (재시도/재개/동시 실행 한도는 job 큐가 담당)
+    - deploy 대기열에 전체 항목이 들어갈 자리가 없으면 아무것도 등록하지 않고 429
+    - 이벤트: `accepted`(deploy_id 목록) → `status`(deploying|ready|failed) → `summary`
+    - 연결이 끊겨도 배포는 계속되며 각 항목은 GET /v1/deploy/{deploy_id}로 조회할 수 있음
+    """
+    for workspace_id, count in Counter(
+        deploy_request.workspace_id for deploy_request in body.deployments
+    ).items():
+        _admit_job(workspace_id, "deploy", count)
+
+    items = await asyncio.to_thread(_enqueue_bulk_deploy, body)
+    progress = BulkDeployProgress(items)
+
+    def format_event(event: Dict[str, Any]) -> str:
+        return f"event: {event['event']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+    async def event_stream():
+        yield format_event(
+            {
+                "event": "accepted",
+                "total": len(items),
+                "deploy_ids": [item.deploy_id for item in items],
+            }
+        )
+        last_sent = time.monotonic()
+        async for events in progress.poll():
+            for event in events:
+                yield format_event(event)
+                last_sent = time.monotonic()
+            if await request.is_disconnected():
+                return
+            if time.monotonic() - last_sent >= settings.task_events_keepalive_seconds:
+                # 프록시/ALB idle timeout 방지
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/v1/deploy/{deploy_id}", response_model=DeployStatusResponse)
+async def get_deploy_status(
+    deploy_id: str,
+    workspace_id: Optional[str] = Query(None, description="워크스페이스 ID (지정 시 scan 생략)"),
+):
+    """
+    배포 작업 상태 조회
+
+    - **deploy_id**: 배포 작업 ID
+    - **status**: pending(대기) → deploying(Builder 배포 완료, 엔드포인트 확인 중) → ready | failed
+    """
+    try:
+        if workspace_id:
+            deploy_task = db_client.get_deploy_task(workspace_id, deploy_id)
+        else:
+            deploy_task = db_client.get_deploy_task_by_id(deploy_id)
+        if not deploy_task:
+            raise HTTPException(status_code=404, detail=f"Deploy not found: {deploy_id}")
+
+        return DeployStatusResponse(
+            deploy_id=deploy_task["deploy_id"],
+            status=deploy_task["status"],
+            workspace_id=deploy_task["workspace_id"],
+            function_id=deploy_task.get("function_id"),
+            app_name=deploy_task.get("app_name"),
+            namespace=deploy_task.get("namespace"),
+            service_name=deploy_task.get("service_name"),
+            endpoint=deploy_task.get("endpoint"),
+            probe_attempts=int(deploy_task.get("probe_attempts") or 0),
+            last_probe=deploy_task.get("last_probe"),
+            error=deploy_task.get("error_message"),
+            created_at=_to_kst_iso_string(deploy_task.get("created_at")),
+            updated_at=_to_kst_iso_string(deploy_task.get("updated_at")),
+            ready_at=deploy_task.get("ready_at"),
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Get deploy status error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
 
 # ===== POST /api/v1/build-and-push =====
 @router.post("/v1/build-and-push", response_model=BuildResponse, status_code=202)
 async def build_and_push(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     registry_url: str = Form(...),
     username: str = Form(default="AWS"),
@@ -519,6 +1206,7 @@ async def build_and_push(
     tag: str = Form(default="sha256"),
     app_name: Optional[str] = Form(None),
     workspace_id: str = Form(default="ws-default"),
+    force: bool = Query(False, description="빌드 결과 캐시를 무시하고 다시 빌드"),
 ):
     """
     빌드 및 푸시 통합
@@ -529,6 +1217,8 @@ async def build_and_push(
     - **password**: 레지스트리 비밀번호 (선택, Builder Service IRSA 사용 시 불필요)
     - **tag**: 이미지 태그 (기본값: sha256)
     - **app_name**: 애플리케이션 이름 (선택)
+    - **force**: true이면 동일 소스의 캐시된 빌드 결과를 재사용하지 않음
+      (기본 태그(sha256)를 사용할 때만 캐시를 사용)
     """
     try:
         # 파일 검증
@@ -542,6 +1232,28 @@ async def build_and_push(
         # 파일 읽기
         file_content = await file.read()
 
+        # 동일 소스/레지스트리의 빌드 결과가 있으면 재사용 (명시적 태그는 항상 새로 빌드)
+        cache_key = None
+        if tag == "sha256":
+            cache_key = _build_cache_key(
+                "build_and_push", file_content, file.filename, app_name, registry_url
+            )
+            if not force:
+                cached_response = await _reuse_cached_build(
+                    workspace_id,
+                    cache_key,
+                    app_name,
+                    file_content,
+                    file.filename,
+                    require_image=True,
+                )
+                if cached_response:
+                    return cached_response
+
+        await _validate_upload(file.filename, file_content)
+        _require_registry_credentials(password)
+        _admit_job(workspace_id)
+
         # Task 생성
         task = db_client.create_build_task(workspace_id=workspace_id, app_name=app_name)
         task_id = task["task_id"]
@@ -557,110 +1269,29 @@ async def build_and_push(
             workspace_id, task_id, file_content, file.filename
         )
 
-        # Builder Service의 /api/v1/build-and-push 호출 (백그라운드)
-        async def _build_and_push_wrapper():
-            """Build and Push를 순차적으로 실행하는 래퍼"""
-            try:
-                # 상태 업데이트는 빌더에서 처리
-                dummy_password = "dummy-password"
-                # IRSA 사용을 위해 기본 크리덴셜은 비워 보냄
-                normalized_username = username
-                normalized_password = password
-                if (username == "AWS") and (password is None or password == dummy_password):
-                    normalized_username = ""
-                    normalized_password = ""
-
-                # Builder Service에 build-and-push 요청
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    files = {"file": (file.filename, file_content)}
-                    data = {
-                        "registry_url": registry_url,
-                        "username": normalized_username,
-                        "workspace_id": workspace_id,
-                        "tag": effective_tag,
-                        "app_name": final_app_name,
-                        "password": normalized_password,
-                    }
-
-                    response = await client.post(
-                        f"{settings.builder_service_url}/api/v1/build-and-push",
-                        files=files,
-                        data=data,
-                    )
-                    response.raise_for_status()
-                    build_push_response = response.json()
-                    builder_task_id = build_push_response.get("task_id")
-
-                    logger.info(f"Build-and-push task {task_id} submitted: {builder_task_id}")
-
-                # 폴링으로 상태 확인
-                max_attempts = 120
-                for attempt in range(max_attempts):
-                    await asyncio.sleep(5)
-
-                    async with httpx.AsyncClient(timeout=10.0) as client:
-                        status_response = await client.get(
-                            f"{settings.builder_service_url}/api/v1/tasks/{builder_task_id}",
-                            params={"workspace_id": workspace_id}
-                        )
-                        status_response.raise_for_status()
-                        status_data = status_response.json()
-
-                        status = status_data.get("status")
-                        logger.info(f"Build-and-push task {task_id} status: {status}")
-
-                        if status in ["completed", "done"]:
-                            result = status_data.get("result", {})
-                            wasm_path = result.get("wasm_path")
-                            
-                            # 이미지 URL이 없으면 백엔드에서 조합해서 생성
-                            image_url = result.get("image_url") or result.get("image_uri")
-                            if not image_url and registry_url and effective_tag:
-                                image_url = f"{registry_url}:{effective_tag}"
-
-                            # 상태 업데이트
-                            db_client.update_build_task_status(
-                                workspace_id,
-                                task_id,
-                                status="completed",
-                                wasm_path=wasm_path,
-                                image_url=image_url
-                            )
-
-                            logger.info(f"Build-and-push task {task_id} completed: {image_url}")
-                            break
-
-                        elif status == "failed":
-                            error_msg = status_data.get("error", "Build-and-push failed")
-                            
-                            db_client.update_build_task_status(
-                                workspace_id,
-                                task_id,
-                                status="failed",
-                                error_message=error_msg
-                            )
-                            logger.error(f"Build-and-push task {task_id} failed: {error_msg}")
-                            break
-
-                        else:
-                            logger.debug(f"Build-and-push task {task_id} status (no-op update): {status}")
-
-                else:
-                    error_msg = "Build-and-push timeout (10 minutes exceeded)"
-                    db_client.update_build_task_status(
-                        workspace_id,
-                        task_id,
-                        status="failed",
-                        error_message=error_msg
-                    )
-                    logger.error(f"Build-and-push task {task_id} timed out")
-
-            except httpx.HTTPError as e:
-                logger.error(f"Build-and-push task {task_id} HTTP error: {str(e)}")
-            except Exception as e:
-                logger.error(f"Build-and-push task {task_id} failed: {str(e)}")
-
-        background_tasks.add_task(_build_and_push_wrapper)
+        # IRSA 사용을 위해 기본 크리덴셜은 비워 보냄
+        normalized_username = username
+        normalized_password = password
+        if (username == "AWS") and (password is None or password == DUMMY_REGISTRY_PASSWORD):
+            normalized_username = ""
+            normalized_password = ""
+
+        # Build and Push job 등록
+        build_job_queue.enqueue(
+            "build_and_push",
+            {
+                "filename": file.filename,
+                "registry_url": registry_url,
+                "username": normalized_username,
+                # 직접 지정한 비밀번호는 KMS 암호문으로만 저장
+                **(await _registry_auth(task_id, normalized_password)),
+                "tag": effective_tag,
+                "app_name": final_app_name,
+                "cache_key": cache_key,
+            },
+            workspace_id=workspace_id,
+            task_id=task_id,
+        )
 
         return BuildResponse(
             task_id=task_id, status="pending", message="Build and push task created", source_s3_path=s3_path
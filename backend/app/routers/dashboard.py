@@ -0,0 +1,123 @@
+"""Function Dashboard API 라우터
+
+함수 상세 페이지에 필요한 데이터(함수 항목, DynamoDB 실행 로그, Loki 로그, Prometheus 메트릭)를
+한 번에 동시 조회한다. 소스별 제한 시간을 넘기거나 실패한 소스는 null로 두고 나머지를 응답하므로
+응답 시간은 가장 느린 소스(최대 제한 시간) 수준이다.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Dict, Optional, Tuple
+from fastapi import APIRouter, HTTPException, Query, status
+from app.config import settings
+from app.database import db_client
+from app.models import DashboardSourceStatus, FunctionDashboardResponse
+from app.routers.functions import function_config
+from app.routers.logs import execution_log, fetch_loki_logs
+from app.routers.metrics import fetch_function_metrics, resolve_window
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+async def _timed(
+    name: str, awaitable: Awaitable[Any], timeout: float
+) -> Tuple[Optional[Any], DashboardSourceStatus]:
+    """소스 하나를 제한 시간 안에서 실행. 실패해도 예외 대신 상태를 반환"""
+    started = time.perf_counter()
+    value, source_status, error = None, "ok", None
+    try:
+        value = await asyncio.wait_for(awaitable, timeout=timeout)
+    except asyncio.TimeoutError:
+        source_status, error = "timeout", f"{name} did not respond within {timeout:.1f}s"
+    except Exception as e:
+        logger.warning("Dashboard source %s failed: %s", name, e)
+        source_status, error = "error", str(e)
+    return value, DashboardSourceStatus(
+        status=source_status,
+        duration_ms=round((time.perf_counter() - started) * 1000, 1),
+        error=error,
+    )
+
+
+@router.get(
+    "/workspaces/{workspace_id}/functions/{function_id}/dashboard",
+    response_model=FunctionDashboardResponse,
+)
+async def get_function_dashboard(
+    workspace_id: str,
+    function_id: str,
+    log_limit: int = Query(default=100, le=1000, ge=1),
+    loki_limit: int = Query(default=100, le=1000, ge=1),
+    window: Optional[str] = Query(None, description="메트릭 조회 기간 (예: 1h, 24h, 7d)"),
+    max_points: Optional[int] = Query(None, ge=3, description="메트릭 시계열 최대 포인트 수"),
+):
+    """함수 상세 대시보드 (함수/실행 로그/Loki 로그/메트릭 동시 조회)"""
+    window_seconds, step_seconds, max_points = resolve_window(window, None, max_points)
+
+    # 소스별 실패/타임아웃은 _timed가 상태로 바꾸므로 gather는 예외 없이 모두 기다림
+    (
+        (function, function_status),
+        (log_items, logs_status),
+        (loki, loki_status),
+        (metrics, metrics_status),
+    ) = await asyncio.gather(
+        _timed(
+            "dynamodb",
+            asyncio.to_thread(db_client.get_function, workspace_id, function_id),
+            settings.dashboard_dynamodb_timeout_seconds,
+        ),
+        _timed(
+            "dynamodb_logs",
+            asyncio.to_thread(db_client.list_logs, function_id, log_limit),
+            settings.dashboard_dynamodb_timeout_seconds,
+        ),
+        _timed(
+            "loki",
+            fetch_loki_logs(function_id, loki_limit),
+            settings.dashboard_loki_timeout_seconds,
+        ),
+        _timed(
+            "prometheus",
+            fetch_function_metrics(function_id, window_seconds, step_seconds, max_points),
+            settings.dashboard_prometheus_timeout_seconds,
+        ),
+    )
+
+    # 함수 항목은 필수 (나머지 소스는 부분 결과 허용)
+    if function_status.status != "ok":
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={"error": {"code": "DASHBOARD_ERROR", "message": function_status.error}},
+        )
+    if not function:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": {
+                    "code": "NOT_FOUND",
+                    "message": f"Function {function_id} not found",
+                }
+            },
+        )
+
+    sources: Dict[str, DashboardSourceStatus] = {
+        "dynamodb_logs": logs_status,
+        "loki": loki_status,
+        "prometheus": metrics_status,
+    }
+    return FunctionDashboardResponse(
+        status=(
+            "complete"
+            if all(source.status == "ok" for source in sources.values())
+            else "partial"
+        ),
+        function=function_config(function),
+        execution_logs=(
+            [execution_log(item) for item in log_items] if log_items is not None else None
+        ),
+        loki_logs=loki,
+        metrics=metrics.data if metrics is not None else None,
+        sources=sources,
+    )
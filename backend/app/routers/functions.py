@@ -4,32 +4,26 @@ from app.models import FunctionCreate, FunctionUpdate, FunctionConfig
 from app.database import db_client, s3_client
 from typing import List, Any, Dict, Optional
 from datetime import datetime
+from app.utils.log_id import log_id_timestamp, new_log_id
 from app.utils.timezone import now_kst_iso, to_kst
+from app.utils.http import normalize_invocation_url
+from app.utils.k8s import k8s_client, spinapp_name
+from app.services.log_archive import log_archive
+from app.services.spinapp_reconciler import spinapp_reconciler
 from decimal import Decimal
+import asyncio
 import base64
 import httpx
-import uuid
 import time
 import re
 import logging
-from urllib.parse import urlparse
-import subprocess
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-
-def normalize_invocation_url(url: str) -> str:
-    """Ensure invocation URLs always include a scheme for httpx."""
-    if not url:
-        return ""
-
-    normalized = url.strip()
-    parsed = urlparse(normalized)
-    if parsed.scheme:
-        return normalized
-    return f"http://{normalized}"
+# 함수에 전달하는 호출 ID 헤더 (실행 로그 id와 같음, 함수 로그에 남기면 호출 단위로 Loki 조회 가능)
+INVOCATION_ID_HEADER = "X-Invocation-Id"
 
 
 def build_fallback_host(function: Dict[str, Any], namespace: str = "default") -> Optional[str]:
@@ -46,6 +40,33 @@ def build_fallback_host(function: Dict[str, Any], namespace: str = "default") ->
     return f"{slug}.{namespace}.svc.cluster.local"
 
 
+def function_config(item: Dict[str, Any]) -> FunctionConfig:
+    """FN# 항목 → FunctionConfig 응답"""
+    return FunctionConfig(
+        id=item["id"],
+        workspaceId=item["workspaceId"],
+        name=item["name"],
+        description=item.get("description", ""),
+        runtime=item["runtime"],
+        memory=item["memory"],
+        timeout=item["timeout"],
+        httpMethods=item["httpMethods"],
+        environmentVariables=item["environmentVariables"],
+        code=item["code"],
+        invocationUrl=item.get("invocationUrl"),
+        status=item["status"],
+        lastModified=to_kst(datetime.fromisoformat(item["lastModified"])),
+        lastDeployed=(
+            to_kst(datetime.fromisoformat(item["lastDeployed"]))
+            if item.get("lastDeployed")
+            else None
+        ),
+        invocations24h=item.get("invocations24h", 0),
+        errors24h=item.get("errors24h", 0),
+        avgDuration=item.get("avgDuration", 0.0),
+    )
+
+
 def _to_dynamo_safe(value: Any):
     """Recursively convert floats to Decimal for DynamoDB compatibility."""
     if isinstance(value, float):
@@ -220,29 +241,7 @@ async def get_function(workspace_id: str, function_id: str):
             },
         )
 
-    return FunctionConfig(
-        id=item["id"],
-        workspaceId=item["workspaceId"],
-        name=item["name"],
-        description=item.get("description", ""),
-        runtime=item["runtime"],
-        memory=item["memory"],
-        timeout=item["timeout"],
-        httpMethods=item["httpMethods"],
-        environmentVariables=item["environmentVariables"],
-        code=item["code"],
-        invocationUrl=item.get("invocationUrl"),
-        status=item["status"],
-        lastModified=to_kst(datetime.fromisoformat(item["lastModified"])),
-        lastDeployed=(
-            to_kst(datetime.fromisoformat(item["lastDeployed"]))
-            if item.get("lastDeployed")
-            else None
-        ),
-        invocations24h=item.get("invocations24h", 0),
-        errors24h=item.get("errors24h", 0),
-        avgDuration=item.get("avgDuration", 0.0),
-    )
+    return function_config(item)
 
 
 @router.patch(
@@ -354,36 +353,14 @@ async def delete_function(workspace_id: str, function_id: str):
             },
         )
 
-    # SpinApp 리소스 삭제 (kubectl delete spinapp {slug})
+    # SpinApp 리소스 삭제 (K8s API, 실패해도 DB 삭제는 진행)
     function_name = existing.get("name")
     if function_name:
-        try:
-            # 이름 규칙 (User clarified app_name is function_name)
-            slug = function_name
-            
-            # kubectl 명령어 실행
-            cmd = ["kubectl", "delete", "spinapp", slug, "-n", "default"]
-            logger.info(f"Executing: {' '.join(cmd)}")
-            
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True,
-                check=False  # 에러 발생해도 예외 발생시키지 않고 stderr 확인
-            )
-            
-            if result.returncode == 0:
-                logger.info(f"Successfully deleted spinapp {slug}")
-            else:
-                # 이미 없는 경우(NotFound)는 무시 가능, 그 외에는 에러 로그
-                if "NotFound" not in result.stderr and "not found" not in result.stderr:
-                    logger.warning(f"Failed to delete spinapp {slug}: {result.stderr}")
-                else:
-                    logger.info(f"SpinApp {slug} not found, skipping deletion")
-
-        except Exception as e:
-            logger.error(f"Error deleting SpinApp resources: {e}")
-            # 리소스 삭제 실패가 DB 삭제를 막지 않도록 함
+        result = await k8s_client.delete_spinapp(spinapp_name(function_name))
+        if result.status == "failed":
+            logger.warning(f"Failed to delete spinapp {result.name}: {result.as_dict()}")
+        else:
+            logger.info(f"SpinApp {result.name} delete result: {result.status}")
 
     # S3에서 코드 삭제
     try:
@@ -391,6 +368,12 @@ async def delete_function(workspace_id: str, function_id: str):
     except Exception:
         pass  # S3 파일이 없어도 계속 진행
 
+    # S3 로그 아카이브(세그먼트, manifest) 삭제
+    try:
+        await asyncio.to_thread(log_archive.delete_function_archive, function_id)
+    except Exception as e:
+        logger.warning(f"Failed to delete log archive for {function_id}: {e}")
+
     # DynamoDB에서 함수 삭제
     db_client.delete_function(workspace_id, function_id)
 
@@ -422,7 +405,8 @@ async def invoke_function(
 
     # invocationUrl 확인
     invocation_url = normalize_invocation_url(function.get("invocationUrl"))
-    if not invocation_url:
+    # SpinApp 동기화가 된 상태면 invocationUrl이 곧 클러스터 상태이므로 호스트를 추측하지 않음
+    if not invocation_url and not spinapp_reconciler.synced:
         fallback_host = build_fallback_host(function)
         if fallback_host:
             invocation_url = f"http://{fallback_host}"
@@ -448,7 +432,9 @@ async def invoke_function(
     except Exception:
         request_body = {}
 
-    # 실행 시작 시간
+    # 실행 시작 시간 (호출 ID는 시작 시각을 담은 UUIDv7이며 실행 로그 id/타임스탬프로도 사용)
+    invocation_id = new_log_id()
+    started_at = log_id_timestamp(invocation_id)
     start_time = time.time()
     timeout_seconds = float(function.get("timeout", 60) or 60)
     prev_invocations = Decimal(str(function.get("invocations24h", 0) or 0))
@@ -465,11 +451,16 @@ async def invoke_function(
             response = await client.post(
                 invocation_url,
                 json=request_body,
-                headers={"Content-Type": "application/json", "Connection": "close"},
+                headers={
+                    "Content-Type": "application/json",
+                    "Connection": "close",
+                    INVOCATION_ID_HEADER: invocation_id,
+                },
             )
 
             # 실행 시간 계산
             duration = int((time.time() - start_time) * 1000)  # ms
+            ended_at = now_kst_iso()
 
             # 응답 body
             try:
@@ -478,11 +469,13 @@ async def invoke_function(
                 response_body = {"data": response.text}
 
             # 로그 생성 (DynamoDB에 저장)
-            log_id = str(uuid.uuid4())
+            log_id = invocation_id
             log_entry = {
                 "id": log_id,
                 "functionId": function_id,
-                "timestamp": now_kst_iso(),
+                "timestamp": started_at,
+                "startedAt": started_at,
+                "endedAt": ended_at,
                 "status": "success" if response.is_success else "error",
                 "duration": duration,
                 "statusCode": response.status_code,
@@ -546,6 +539,8 @@ async def invoke_function(
                 "responseBody": response_body,
                 "logs": [],
                 "level": log_entry["level"],
+                "startedAt": started_at,
+                "endedAt": ended_at,
             }
 
     except httpx.TimeoutException:
@@ -555,9 +550,11 @@ async def invoke_function(
         # 실패 로그 저장
         try:
             log_entry = {
-                "id": str(uuid.uuid4()),
+                "id": invocation_id,
                 "functionId": function_id,
-                "timestamp": now_kst_iso(),
+                "timestamp": started_at,
+                "startedAt": started_at,
+                "endedAt": now_kst_iso(),
                 "status": "error",
                 "duration": duration,
                 "statusCode": status.HTTP_504_GATEWAY_TIMEOUT,
@@ -607,9 +604,11 @@ async def invoke_function(
 
         try:
             log_entry = {
-                "id": str(uuid.uuid4()),
+                "id": invocation_id,
                 "functionId": function_id,
-                "timestamp": now_kst_iso(),
+                "timestamp": started_at,
+                "startedAt": started_at,
+                "endedAt": now_kst_iso(),
                 "status": "error",
                 "duration": duration,
                 "statusCode": status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -660,9 +659,11 @@ async def invoke_function(
 
         try:
             log_entry = {
-                "id": str(uuid.uuid4()),
+                "id": invocation_id,
                 "functionId": function_id,
-                "timestamp": now_kst_iso(),
+                "timestamp": started_at,
+                "startedAt": started_at,
+                "endedAt": now_kst_iso(),
                 "status": "error",
                 "duration": duration,
                 "statusCode": status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,13 +1,121 @@
 """Logs API 라우터"""
-from fastapi import APIRouter, HTTPException, status, Query
-from app.models import LogsResponse, ExecutionLog, LokiLogsResponse, LokiLogEntry
+from fastapi import APIRouter, HTTPException, status, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from app.models import (
+    LogsResponse,
+    ExecutionLog,
+    LogSearchHit,
+    LogSearchResponse,
+    LokiLogsResponse,
+    LokiLogEntry,
+)
 from app.database import db_client
 from app.config import settings
 from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Literal, Optional, Tuple
+from app.services import log_export, loki
+from app.services.log_archive import log_archive
+from app.services.log_search import LogSearchError, log_search
+from app.services.loki_tail import TailLimitExceeded, loki_tail_hub
 from app.utils.timezone import to_kst
+import asyncio
+import json
+import logging
 import httpx
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Loki 로그 응답을 직렬화해 내보내는 단위 (라인 수)
+LOKI_RESPONSE_BATCH = 200
+
+
+def execution_log(item: Dict[str, Any]) -> ExecutionLog:
+    """LOG# 항목 → ExecutionLog 응답"""
+    return ExecutionLog(
+        id=item["id"],
+        functionId=item["functionId"],
+        timestamp=to_kst(datetime.fromisoformat(item["timestamp"])),
+        status=item["status"],
+        duration=item["duration"],
+        statusCode=item["statusCode"],
+        requestBody=item.get("requestBody"),
+        responseBody=item.get("responseBody"),
+        logs=item.get("logs", []),
+        level=item.get("level", "info"),
+        startedAt=to_kst(datetime.fromisoformat(item["startedAt"])) if item.get("startedAt") else None,
+        endedAt=to_kst(datetime.fromisoformat(item["endedAt"])) if item.get("endedAt") else None,
+    )
+
+
+async def query_loki_logs(
+    function_id: str,
+    limit: int,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    cursor: Optional[str] = None,
+    direction: str = "backward",
+    level: Optional[str] = None,
+    contains: Optional[str] = None,
+    regex: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[loki.LogCursor], str]:
+    """
+    Loki에서 function_id 라벨의 로그 조회. (로그, 다음 cursor, LogQL) 반환.
+    잘못된 파라미터는 LokiQueryError, 연결 오류는 httpx.HTTPError로 전달.
+    """
+    levels = [item.strip().lower() for item in level.split(",") if item.strip()] if level else None
+    return await loki.loki_client.query_logs(
+        function_id,
+        limit,
+        start_ns=loki.parse_time_ns(start, "start"),
+        end_ns=loki.parse_time_ns(end, "end"),
+        direction=direction,
+        cursor=loki.LogCursor.decode(cursor) if cursor else None,
+        query=loki.build_logql(function_id, levels, contains, regex),
+    )
+
+
+async def fetch_loki_logs(function_id: str, limit: int) -> LokiLogsResponse:
+    """최근 1시간 Loki 로그를 LokiLogsResponse 모델로 (대시보드 등 다른 응답에 포함할 때)"""
+    entries, next_cursor, query = await query_loki_logs(function_id, limit)
+    logs = [LokiLogEntry(**entry) for entry in entries]
+    return LokiLogsResponse(
+        logs=logs,
+        total=len(logs),
+        function_id=function_id,
+        query=query,
+        next_cursor=next_cursor.encode() if next_cursor else None,
+    )
+
+
+def loki_logs_response(
+    function_id: str,
+    entries: List[Dict[str, Any]],
+    next_cursor: Optional[loki.LogCursor],
+    query: str,
+    direction: str,
+) -> StreamingResponse:
+    """
+    LokiLogsResponse 형태의 JSON을 로그 묶음 단위로 직렬화해 스트리밍.
+    라인마다 Pydantic 모델을 만들거나 응답 전체 문자열을 한 번에 만들지 않는다.
+    """
+
+    def body():
+        yield '{"logs":['
+        for offset in range(0, len(entries), LOKI_RESPONSE_BATCH):
+            batch = entries[offset:offset + LOKI_RESPONSE_BATCH]
+            chunk = ",".join(json.dumps(entry, ensure_ascii=False) for entry in batch)
+            yield chunk if offset == 0 else "," + chunk
+        tail = {
+            "total": len(entries),
+            "function_id": function_id,
+            "query": query,
+            "direction": direction,
+            "next_cursor": next_cursor.encode() if next_cursor else None,
+        }
+        yield "]," + json.dumps(tail, ensure_ascii=False)[1:]
+
+    return StreamingResponse(body(), media_type="application/json")
 
 
 @router.get("/workspaces/{workspace_id}/logs", response_model=LogsResponse)
@@ -34,23 +142,7 @@ async def get_workspace_logs(
 
         for fn in functions:
             items = db_client.list_logs(fn["id"], limit=per_function_limit)
-            logs.extend(
-                [
-                    ExecutionLog(
-                        id=item["id"],
-                        functionId=item["functionId"],
-                        timestamp=to_kst(datetime.fromisoformat(item["timestamp"])),
-                        status=item["status"],
-                        duration=item["duration"],
-                        statusCode=item["statusCode"],
-                        requestBody=item.get("requestBody"),
-                        responseBody=item.get("responseBody"),
-                        logs=item.get("logs", []),
-                        level=item.get("level", "info"),
-                    )
-                    for item in items
-                ]
-            )
+            logs.extend(execution_log(item) for item in items)
 
         # 최신순으로 정렬 후 limit만큼 자르기
         logs.sort(key=lambda log: log.timestamp, reverse=True)
@@ -64,13 +156,56 @@ async def get_workspace_logs(
         )
 
 
+def time_bounds(start: Optional[str], end: Optional[str]) -> Dict[str, Optional[str]]:
+    """start/end(RFC3339) → SK 비교용 KST 타임스탬프. 형식 오류는 400"""
+    bounds = {}
+    for field, value in (("start", start), ("end", end)):
+        try:
+            bounds[field] = log_export.export_time(value, field)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "error": {
+                        "code": "VALIDATION_ERROR",
+                        "message": str(e),
+                        "details": {"field": field},
+                    }
+                },
+            )
+    return bounds
+
+
+def tiered_logs(
+    function_id: str, limit: int, start: Optional[str], end: Optional[str]
+) -> List[Dict[str, Any]]:
+    """DynamoDB(hot)에서 최신순으로 읽고 모자라면 S3 아카이브(cold)로 채움"""
+    items = db_client.list_logs(function_id, limit=limit, start=start, end=end)
+    if len(items) >= limit or not settings.log_archive_enabled:
+        return items
+    try:
+        cold = log_archive.list_logs(function_id, limit, start=start, end=end)
+    except Exception as e:
+        logger.warning(f"Log archive read failed for {function_id}: {str(e)}")
+        return items
+    # 아카이브 도중 실패하면 두 tier에 같은 로그가 있을 수 있음
+    seen = {item["id"] for item in items}
+    merged = items + [item for item in cold if item["id"] not in seen]
+    merged.sort(key=lambda item: item["SK"], reverse=True)
+    return merged[:limit]
+
+
 @router.get(
     "/workspaces/{workspace_id}/functions/{function_id}/logs", response_model=LogsResponse
 )
 async def get_function_logs(
-    workspace_id: str, function_id: str, limit: int = Query(default=100, le=1000, ge=1)
+    workspace_id: str,
+    function_id: str,
+    limit: int = Query(default=100, le=1000, ge=1),
+    start: Optional[str] = Query(default=None, description="시작 시각 (RFC3339, 포함)"),
+    end: Optional[str] = Query(default=None, description="종료 시각 (RFC3339, 제외)"),
 ):
-    """함수 실행 로그 조회"""
+    """함수 실행 로그 조회 (최신순, 보관 기간이 지난 로그는 S3 아카이브에서 이어 읽음)"""
     # 함수 존재 확인
     function = db_client.get_function(workspace_id, function_id)
     if not function:
@@ -84,24 +219,11 @@ async def get_function_logs(
             },
         )
 
+    bounds = time_bounds(start, end)
     try:
-        items = db_client.list_logs(function_id, limit=limit)
-
-        logs = [
-            ExecutionLog(
-                id=item["id"],
-                functionId=item["functionId"],
-                timestamp=to_kst(datetime.fromisoformat(item["timestamp"])),
-                status=item["status"],
-                duration=item["duration"],
-                statusCode=item["statusCode"],
-                requestBody=item.get("requestBody"),
-                responseBody=item.get("responseBody"),
-                logs=item.get("logs", []),
-                level=item.get("level", "info"),
-            )
-            for item in items
-        ]
+        items = tiered_logs(function_id, limit, bounds["start"], bounds["end"])
+
+        logs = [execution_log(item) for item in items]
 
         return LogsResponse(logs=logs, total=len(logs))
     except Exception as e:
@@ -111,42 +233,327 @@ async def get_function_logs(
         )
 
 
+def _export_response(
+    name: str,
+    items_factory: Callable[[Optional[str], Optional[str]], Iterator[Dict[str, Any]]],
+    export_format: str,
+    compression: Optional[str],
+    start: Optional[str],
+    end: Optional[str],
+) -> StreamingResponse:
+    """내보내기 파라미터 검증 후 스트리밍 응답 (DynamoDB 조회는 응답을 보내면서 threadpool에서 진행)"""
+    allowed = log_export.EXPORT_COMPRESSIONS[export_format]
+    compression = compression or allowed[0]
+    if compression not in allowed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": {
+                    "code": "VALIDATION_ERROR",
+                    "message": f"compression for {export_format} must be one of {', '.join(allowed)}",
+                    "details": {"field": "compression"},
+                }
+            },
+        )
+    if export_format == "parquet" and not log_export.parquet_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail={
+                "error": {
+                    "code": "FORMAT_UNAVAILABLE",
+                    "message": "Parquet export requires pyarrow on the server",
+                }
+            },
+        )
+    bounds = time_bounds(start, end)
+
+    filename = log_export.export_filename(name, export_format, compression)
+    return StreamingResponse(
+        # 동기 제너레이터이므로 Starlette가 threadpool에서 순회 (boto3 호출이 이벤트 루프를 막지 않음)
+        log_export.export_chunks(
+            items_factory(bounds["start"], bounds["end"]), export_format, compression
+        ),
+        media_type=(
+            "application/gzip" if compression == "gzip" and export_format == "ndjson"
+            else log_export.MEDIA_TYPES[export_format]
+        ),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/workspaces/{workspace_id}/logs/export")
+async def export_workspace_logs(
+    workspace_id: str,
+    format: Literal["ndjson", "parquet"] = Query("ndjson", description="내보내기 형식"),
+    compression: Optional[str] = Query(
+        None, description="ndjson: none(기본)/gzip, parquet: snappy(기본)/zstd/gzip/none"
+    ),
+    start: Optional[str] = Query(None, description="시작 시각 (RFC3339, 포함)"),
+    end: Optional[str] = Query(None, description="끝 시각 (RFC3339, 미포함)"),
+):
+    """
+    워크스페이스 전체 함수의 실행 로그 내보내기 (시간순)
+
+    DynamoDB 페이지를 읽는 대로 변환해 스트리밍하므로 건수 제한이 없고 메모리 사용량이 일정하다.
+    """
+    workspace = db_client.get_workspace(workspace_id)
+    if not workspace:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": {
+                    "code": "NOT_FOUND",
+                    "message": f"Workspace {workspace_id} not found",
+                }
+            },
+        )
+    function_ids = [fn["id"] for fn in db_client.list_functions(workspace_id)]
+    return _export_response(
+        workspace_id,
+        lambda start_ts, end_ts: log_export.iter_workspace_items(
+            function_ids, start_ts, end_ts, iter_items=log_archive.iter_function_logs
+        ),
+        format,
+        compression,
+        start,
+        end,
+    )
+
+
+@router.get("/workspaces/{workspace_id}/logs/search", response_model=LogSearchResponse)
+async def search_workspace_logs(
+    workspace_id: str,
+    q: str = Query(
+        ..., min_length=1, description="검색어 (공백 구분 AND, code:500 / level:error / status:success)"
+    ),
+    limit: int = Query(default=20, le=100, ge=1),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    function_id: Optional[str] = Query(None, description="특정 함수로 한정"),
+):
+    """
+    워크스페이스 실행 로그 검색 (requestBody/responseBody, 상태 코드, 레벨)
+
+    워크스페이스별 역색인으로 매칭하고 BM25 점수 → 최신순으로 정렬한다.
+    색인은 첫 검색 때 만들고 이후 새로 쓰인 로그만 반영한다.
+    """
+    workspace = db_client.get_workspace(workspace_id)
+    if not workspace:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": {
+                    "code": "NOT_FOUND",
+                    "message": f"Workspace {workspace_id} not found",
+                }
+            },
+        )
+
+    try:
+        # 색인 생성/갱신은 DynamoDB를 읽으므로 스레드에서 실행
+        hits, total, next_cursor = await asyncio.to_thread(
+            log_search.search, workspace_id, q, limit, cursor, function_id
+        )
+    except LogSearchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": {
+                    "code": "VALIDATION_ERROR",
+                    "message": str(e),
+                    "details": {"field": e.field},
+                }
+            },
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": {"code": "SEARCH_ERROR", "message": str(e)}},
+        )
+
+    return LogSearchResponse(
+        hits=[LogSearchHit(score=round(score, 4), log=execution_log(item)) for score, item in hits],
+        total=total,
+        query=q,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/workspaces/{workspace_id}/functions/{function_id}/logs/export")
+async def export_function_logs(
+    workspace_id: str,
+    function_id: str,
+    format: Literal["ndjson", "parquet"] = Query("ndjson", description="내보내기 형식"),
+    compression: Optional[str] = Query(
+        None, description="ndjson: none(기본)/gzip, parquet: snappy(기본)/zstd/gzip/none"
+    ),
+    start: Optional[str] = Query(None, description="시작 시각 (RFC3339, 포함)"),
+    end: Optional[str] = Query(None, description="끝 시각 (RFC3339, 미포함)"),
+):
+    """함수 실행 로그 내보내기 (시간순, NDJSON/Parquet 스트리밍)"""
+    function = db_client.get_function(workspace_id, function_id)
+    if not function:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": {
+                    "code": "NOT_FOUND",
+                    "message": f"Function {function_id} not found",
+                }
+            },
+        )
+    return _export_response(
+        function_id,
+        lambda start_ts, end_ts: log_archive.iter_function_logs(function_id, start_ts, end_ts),
+        format,
+        compression,
+        start,
+        end,
+    )
+
+
+def invocation_window(item: Dict[str, Any]) -> Tuple[int, int]:
+    """
+    실행 로그의 호출 구간 [start, end) (나노초).
+    수집 지연/시계 오차를 고려해 앞뒤로 invocation_log_padding_seconds 만큼 넓힘.
+    startedAt이 없는 이전 로그는 저장 시각과 duration으로 추정한다.
+    """
+    padding_ns = int(settings.invocation_log_padding_seconds * loki.NS_PER_SECOND)
+    end_ns = loki.parse_time_ns(item.get("endedAt") or item["timestamp"], "endedAt")
+    if item.get("startedAt"):
+        start_ns = loki.parse_time_ns(item["startedAt"], "startedAt")
+    else:
+        start_ns = end_ns - int(float(item.get("duration") or 0) * 1_000_000)
+    return start_ns - padding_ns, end_ns + padding_ns
+
+
+@router.get(
+    "/workspaces/{workspace_id}/functions/{function_id}/logs/{log_id}/lines",
+    response_model=LokiLogsResponse,
+)
+async def get_invocation_log_lines(
+    workspace_id: str,
+    function_id: str,
+    log_id: str,
+    limit: int = Query(default=1000, le=5000, ge=1),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    match: Literal["id", "time"] = Query(
+        "id", description="id: 호출 ID가 포함된 라인만, time: 호출 구간의 모든 라인"
+    ),
+):
+    """
+    호출 하나의 Loki 로그 라인 조회 (실행 순서)
+
+    invoke는 함수에 `X-Invocation-Id` 헤더(= 실행 로그 id)를 넘기고 호출 시작/종료 시각을 기록한다.
+    그 구간으로 좁힌 `{function_id=...} |= "<log_id>"` 쿼리만 실행하므로 함수 전체 로그를 조회하지 않는다.
+    """
+    function = db_client.get_function(workspace_id, function_id)
+    if not function:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": {
+                    "code": "NOT_FOUND",
+                    "message": f"Function {function_id} not found",
+                }
+            },
+        )
+    item = db_client.get_log(function_id, log_id)
+    if not item and settings.log_archive_enabled:
+        item = log_archive.get_log(function_id, log_id)
+    if not item:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": {
+                    "code": "NOT_FOUND",
+                    "message": f"Log {log_id} not found",
+                }
+            },
+        )
+
+    try:
+        start_ns, end_ns = invocation_window(item)
+        entries, next_cursor, query = await loki.loki_client.query_logs(
+            function_id,
+            limit,
+            start_ns=start_ns,
+            end_ns=end_ns,
+            direction="forward",
+            cursor=loki.LogCursor.decode(cursor) if cursor else None,
+            query=loki.build_logql(function_id, contains=log_id if match == "id" else None),
+        )
+    except loki.LokiQueryError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": {
+                    "code": "VALIDATION_ERROR",
+                    "message": e.message,
+                    "details": {"field": e.field},
+                }
+            },
+        )
+    except httpx.HTTPError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "error": {
+                    "code": "LOKI_CONNECTION_ERROR",
+                    "message": f"로그 시스템 연결 불가: {str(e)}",
+                }
+            },
+        )
+
+    return loki_logs_response(function_id, entries, next_cursor, query, "forward")
+
+
 @router.get("/functions/{function_id}/loki-logs", response_model=LokiLogsResponse)
 async def get_loki_logs(
-    function_id: str, limit: int = Query(default=100, le=1000, ge=1)
+    function_id: str,
+    limit: int = Query(default=100, le=1000, ge=1),
+    start: Optional[str] = Query(None, description="시작 시각 (RFC3339, 유닉스 초 또는 나노초, 기본: end - 1h)"),
+    end: Optional[str] = Query(None, description="끝 시각, 미포함 (기본: 현재)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    direction: Literal["backward", "forward"] = Query("backward", description="backward: 최신순, forward: 오래된순"),
+    level: Optional[str] = Query(None, description="로그 레벨 (쉼표 구분, 예: error,warn)"),
+    contains: Optional[str] = Query(None, description="포함해야 하는 문자열"),
+    regex: Optional[str] = Query(None, description="일치해야 하는 정규식 (RE2)"),
 ):
-    """Loki에서 function_id로 실시간 로그 조회"""
-    try:
-        # Loki API 호출
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            loki_url = f"{settings.loki_service_url}/loki/api/v1/query_range"
-            params = {
-                "query": f'{{function_id="{function_id}"}}',
-                "limit": limit,
-                "direction": "backward",
-            }
-
-            response = await client.get(loki_url, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-        # Loki 응답 파싱
-        logs = []
-        if data.get("status") == "success":
-            result = data.get("data", {}).get("result", [])
-            for stream in result:
-                values = stream.get("values", [])
-                for value in values:
-                    # value = [timestamp_nanoseconds, log_line]
-                    if len(value) >= 2:
-                        logs.append(
-                            LokiLogEntry(timestamp=value[0], line=value[1])
-                        )
+    """
+    Loki에서 function_id로 로그 조회
 
-        return LokiLogsResponse(
-            logs=logs, total=len(logs), function_id=function_id
+    필터는 LogQL line filter(`|=`, `|~`)로 변환되어 Loki에서 적용되고,
+    스트림별 결과는 나노초 타임스탬프 순서로 병합된다.
+    next_cursor를 cursor로 넘기면 같은 조건으로 다음 페이지를 조회한다.
+    """
+    try:
+        entries, next_cursor, query = await query_loki_logs(
+            function_id, limit, start, end, cursor, direction, level, contains, regex
         )
+        return loki_logs_response(function_id, entries, next_cursor, query, direction)
 
+    except loki.LokiQueryError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": {
+                    "code": "VALIDATION_ERROR",
+                    "message": e.message,
+                    "details": {"field": e.field},
+                }
+            },
+        )
+    except httpx.HTTPStatusError as e:
+        # Loki가 쿼리를 거부한 경우 (RE2에서 지원하지 않는 정규식, 조회 기간 초과 등)
+        if e.response.status_code != status.HTTP_400_BAD_REQUEST:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail={"error": {"code": "LOKI_ERROR", "message": f"로그 조회 실패: {str(e)}"}},
+            )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": {"code": "LOKI_QUERY_ERROR", "message": e.response.text.strip()}},
+        )
     except httpx.HTTPError as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -167,3 +574,85 @@ async def get_loki_logs(
                 }
             },
         )
+
+
+def _check_tail_capacity():
+    try:
+        loki_tail_hub.check_capacity()
+    except TailLimitExceeded as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={"error": {"code": "TOO_MANY_SUBSCRIBERS", "message": str(e)}},
+            headers={"Retry-After": "30"},
+        )
+
+
+@router.get("/functions/{function_id}/loki-logs/tail")
+async def tail_loki_logs(request: Request, function_id: str):
+    """
+    Loki 실시간 로그 스트림 (Server-Sent Events)
+
+    - 새 로그가 들어오면 `event: logs` 로 `{"entries": [{timestamp, line}, ...]}` 전송
+    - 속도 제한/느린 구독자/Loki 측에서 버린 라인은 `event: dropped` 로 사유별 개수 전송
+    - 레플리카당 함수 하나에 Loki tail 연결 하나를 공유
+    """
+    # 자리만 먼저 확인해 429로 돌려주고, 구독은 스트림이 실제로 시작될 때 등록
+    _check_tail_capacity()
+
+    async def event_stream():
+        try:
+            subscription = loki_tail_hub.open(function_id)
+        except TailLimitExceeded as e:
+            # 확인과 등록 사이에 자리가 찬 경우
+            yield f"event: error\ndata: {json.dumps({'message': str(e)})}\n\n"
+            return
+        events = loki_tail_hub.stream(
+            function_id, subscription, settings.task_events_keepalive_seconds
+        )
+        try:
+            async for event in events:
+                if await request.is_disconnected():
+                    return
+                if event["type"] == "keepalive":
+                    # 프록시/ALB idle timeout 방지
+                    yield ": keep-alive\n\n"
+                elif event["type"] == "dropped":
+                    yield f"event: dropped\ndata: {json.dumps(event['counts'])}\n\n"
+                else:
+                    payload = json.dumps({"entries": event["entries"]}, ensure_ascii=False)
+                    yield f"event: logs\ndata: {payload}\n\n"
+        finally:
+            await events.aclose()
+            # 시작되지 않은 stream은 aclose로 정리되지 않으므로 직접 해제 (중복 해제는 무시됨)
+            loki_tail_hub.close(function_id, subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/functions/{function_id}/loki-logs/tail/ws")
+async def tail_loki_logs_ws(websocket: WebSocket, function_id: str):
+    """Loki 실시간 로그 스트림 (WebSocket). SSE와 같은 이벤트를 {"type": ...} JSON으로 전송"""
+    # accept 이후에 구독해 연결 수립 실패로 구독이 남지 않게 함
+    await websocket.accept()
+    try:
+        subscription = loki_tail_hub.open(function_id)
+    except TailLimitExceeded as e:
+        await websocket.close(code=1013, reason=str(e))  # Try Again Later
+        return
+
+    events = loki_tail_hub.stream(
+        function_id, subscription, settings.task_events_keepalive_seconds
+    )
+    try:
+        async for event in events:
+            # keepalive도 보내 끊긴 연결을 송신 실패로 감지
+            await websocket.send_text(json.dumps(event, ensure_ascii=False))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await events.aclose()
+        loki_tail_hub.close(function_id, subscription)
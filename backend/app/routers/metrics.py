@@ -1,102 +1,144 @@
 """Metrics API 라우터"""
-from datetime import datetime, timedelta
-from fastapi import APIRouter, HTTPException, status
+import asyncio
+import math
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import APIRouter, HTTPException, Query, status
 from app.models import (
+    FunctionCpuMetrics,
+    PrometheusBatchMetricsResponse,
     PrometheusMetricsResponse,
     PrometheusMetricsData,
     PrometheusTimeseriesPoint,
 )
 from app.config import settings
+from app.database import db_client
+from app.services.prometheus import prometheus_client
+from app.utils.timeseries import lttb, parse_duration, parse_values
 import httpx
 
 router = APIRouter()
 
+FUNCTION_ID_LABEL = "label_function_id"
+# 정규식 매처에 그대로 넣을 수 있는 function_id만 허용 (fn-xxxxxxxx 형식)
+FUNCTION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+MAX_BATCH_FUNCTIONS = 200
 
-@router.get("/functions/{function_id}/metrics", response_model=PrometheusMetricsResponse)
-async def get_function_metrics(function_id: str):
-    """Prometheus에서 function_id로 Pod 메트릭 조회"""
+# Prometheus query_range가 한 시리즈에 허용하는 최대 포인트 수
+PROMETHEUS_MAX_POINTS = 11000
+# 기본 step은 응답 포인트 수의 이 배수만큼 조회한 뒤 LTTB로 줄임
+OVERSAMPLING = 4
+
+
+def cpu_query(label_matcher: str, by_function: bool = False, step_seconds: int = 60) -> str:
+    """
+    함수 Pod CPU 사용량(rate 합) PromQL. by_function이면 function_id별로 분리.
+    step이 1분보다 크면 샘플을 건너뛰지 않도록 rate 구간을 step으로 넓힌다.
+    """
+    aggregation = f"sum by ({FUNCTION_ID_LABEL})" if by_function else "sum"
+    rate_window = "1m" if step_seconds <= 60 else f"{step_seconds}s"
+    return (
+        f'{aggregation}(rate(container_cpu_usage_seconds_total{{container!=""}}[{rate_window}]) '
+        "* on(namespace, pod) "
+        f"group_left({FUNCTION_ID_LABEL}) kube_pod_labels{{{FUNCTION_ID_LABEL}{label_matcher}}})"
+    )
+
+
+def _instant_value(result: Dict[str, Any]) -> Optional[float]:
+    value = result.get("value")
+    if isinstance(value, list) and len(value) >= 2:
+        try:
+            return float(value[1])
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def _series_points(
+    results: List[Dict[str, Any]], max_points: int
+) -> Tuple[List[PrometheusTimeseriesPoint], int]:
+    """
+    range 결과를 시각별로 합산해(쿼리가 sum이므로 같은 의미) 시간순으로 정렬한 뒤
+    max_points 이하로 다운샘플링. (포인트, 합산된 포인트 수)
+    """
+    if len(results) == 1:
+        xs, ys = parse_values(results[0].get("values", []))
+    else:
+        totals: Dict[float, float] = {}
+        for result in results:
+            for x, y in zip(*parse_values(result.get("values", []))):
+                totals[x] = totals.get(x, 0.0) + y
+        xs = sorted(totals)
+        ys = [totals[x] for x in xs]
+    source_points = len(xs)
+    xs, ys = lttb(xs, ys, max_points)
+    return [
+        PrometheusTimeseriesPoint(timestamp=x, value=y) for x, y in zip(xs, ys)
+    ], source_points
+
+
+def _validation_error(field: str, message: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail={
+            "error": {
+                "code": "VALIDATION_ERROR",
+                "message": message,
+                "details": {"field": field},
+            }
+        },
+    )
+
+
+def resolve_window(
+    window: Optional[str], step: Optional[str], max_points: Optional[int]
+) -> Tuple[int, int, int]:
+    """
+    조회 파라미터 → (window_seconds, step_seconds, max_points).
+    step을 생략하면 max_points의 OVERSAMPLING배 정도만 조회하도록 1분 단위로 정한다
+    (1h → 60s, 24h → 120s, 7d → 540s).
+    """
+    max_points = max_points or settings.metrics_default_max_points
     try:
-        # Prometheus API 호출
-        base_query = (
-            'sum(rate(container_cpu_usage_seconds_total{container!=""}[1m]) '
-            '* on(namespace, pod) '
-            'group_left(label_function_id) kube_pod_labels{label_function_id="'
-            f"{function_id}" + '"})'
+        window_seconds = (
+            parse_duration(window) if window else settings.metrics_default_window_seconds
         )
-
-        # CPU 사용량 조회 기간: 최근 60분
-        window_seconds = 60 * 60
-        now = datetime.utcnow()
-        start = now - timedelta(seconds=window_seconds)
-
-        instant_url = f"{settings.prometheus_service_url}/api/v1/query"
-        range_url = f"{settings.prometheus_service_url}/api/v1/query_range"
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            instant_resp = await client.get(instant_url, params={"query": base_query})
-            instant_resp.raise_for_status()
-            instant_json = instant_resp.json()
-
-            range_resp = await client.get(
-                range_url,
-                params={
-                    "query": base_query,
-                    "start": start.timestamp(),
-                    "end": now.timestamp(),
-                    "step": "60s",
-                },
-            )
-            range_resp.raise_for_status()
-            range_json = range_resp.json()
-
-        cpu_total = None
-        instant_results = instant_json.get("data", {}).get("result", [])
-        if instant_results:
-            value = instant_results[0].get("value")
-            if isinstance(value, list) and len(value) >= 2:
-                try:
-                    cpu_total = float(value[1])
-                except (TypeError, ValueError):
-                    cpu_total = None
-
-        cpu_series = []
-        for result in range_json.get("data", {}).get("result", []):
-            for ts, val in result.get("values", []):
-                try:
-                    cpu_series.append(
-                        PrometheusTimeseriesPoint(
-                            timestamp=float(ts), value=float(val)
-                        )
-                    )
-                except (TypeError, ValueError):
-                    continue
-
-        # status는 두 쿼리 모두 성공했을 때만 success
-        status_value = (
-            "success"
-            if instant_json.get("status") == "success"
-            and range_json.get("status") == "success"
-            else "partial"
+    except ValueError:
+        raise _validation_error("window", f"Invalid window: {window} (예: 30m, 24h, 7d)")
+    if not 60 <= window_seconds <= settings.metrics_max_window_seconds:
+        raise _validation_error(
+            "window",
+            f"window must be between 60s and {settings.metrics_max_window_seconds}s",
         )
 
-        metrics_data = PrometheusMetricsData(
-            cpu_total=cpu_total,
-            cpu_series=cpu_series,
-            window_seconds=window_seconds,
-            instant_query=base_query,
-            range_query=base_query,
-            raw_instant=instant_json,
-            raw_range=range_json,
+    if step:
+        try:
+            step_seconds = parse_duration(step)
+        except ValueError:
+            raise _validation_error("step", f"Invalid step: {step} (예: 60s, 5m)")
+    else:
+        step_seconds = 60 * max(1, math.ceil(window_seconds / (max_points * OVERSAMPLING) / 60))
+    if step_seconds < settings.metrics_min_step_seconds:
+        raise _validation_error(
+            "step", f"step must be at least {settings.metrics_min_step_seconds}s"
         )
-
-        return PrometheusMetricsResponse(
-            status=status_value,
-            data=metrics_data,
-            function_id=function_id,
+    if window_seconds / step_seconds > PROMETHEUS_MAX_POINTS:
+        raise _validation_error(
+            "step", f"window/step exceeds {PROMETHEUS_MAX_POINTS} points; use a larger step"
         )
+    return window_seconds, step_seconds, max_points
+
 
-    except httpx.HTTPError as e:
-        raise HTTPException(
+def _status_value(*payloads: Dict[str, Any]) -> str:
+    # status는 모든 쿼리가 성공했을 때만 success
+    return (
+        "success" if all(payload.get("status") == "success" for payload in payloads) else "partial"
+    )
+
+
+def _prometheus_error(e: Exception) -> HTTPException:
+    if isinstance(e, httpx.HTTPError):
+        return HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail={
                 "error": {
@@ -105,13 +147,210 @@ async def get_function_metrics(function_id: str):
                 }
             },
         )
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail={
+            "error": {
+                "code": "PROMETHEUS_ERROR",
+                "message": f"메트릭 조회 실패: {str(e)}",
+            }
+        },
+    )
+
+
+@router.get("/functions/{function_id}/metrics", response_model=PrometheusMetricsResponse)
+async def get_function_metrics(
+    function_id: str,
+    window: Optional[str] = Query(None, description="조회 기간 (예: 1h, 24h, 7d). 기본 1시간"),
+    step: Optional[str] = Query(None, description="range step (예: 60s, 5m). 생략 시 자동"),
+    max_points: Optional[int] = Query(
+        None, ge=3, le=PROMETHEUS_MAX_POINTS, description="응답 시계열 최대 포인트 수"
+    ),
+    include_raw: bool = Query(False, description="Prometheus 원본 응답 포함 여부"),
+):
+    """Prometheus에서 function_id로 Pod 메트릭 조회"""
+    window_seconds, step_seconds, max_points = resolve_window(window, step, max_points)
+    try:
+        return await fetch_function_metrics(
+            function_id, window_seconds, step_seconds, max_points, include_raw
+        )
     except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={
-                "error": {
-                    "code": "PROMETHEUS_ERROR",
-                    "message": f"메트릭 조회 실패: {str(e)}",
-                }
-            },
+        raise _prometheus_error(e)
+
+
+async def fetch_function_metrics(
+    function_id: str,
+    window_seconds: int,
+    step_seconds: int,
+    max_points: int,
+    include_raw: bool = False,
+) -> PrometheusMetricsResponse:
+    """함수 하나의 CPU 메트릭 조회 (Prometheus 오류는 그대로 전달)"""
+    base_query = cpu_query(f'="{function_id}"', step_seconds=step_seconds)
+
+    # instant/range 쿼리를 동시에 실행 (range는 캐시된 구간 이후만 조회)
+    instant_json, range_json = await asyncio.gather(
+        prometheus_client.query(base_query),
+        prometheus_client.query_range(base_query, window_seconds, step_seconds),
+    )
+
+    instant_results = instant_json.get("data", {}).get("result", [])
+    cpu_total = _instant_value(instant_results[0]) if instant_results else None
+
+    cpu_series, source_points = _series_points(
+        range_json.get("data", {}).get("result", []), max_points
+    )
+
+    metrics_data = PrometheusMetricsData(
+        cpu_total=cpu_total,
+        cpu_series=cpu_series,
+        window_seconds=window_seconds,
+        step_seconds=step_seconds,
+        source_points=source_points,
+        instant_query=base_query,
+        range_query=base_query,
+        raw_instant=instant_json if include_raw else None,
+        raw_range=range_json if include_raw else None,
+    )
+
+    return PrometheusMetricsResponse(
+        status=_status_value(instant_json, range_json),
+        data=metrics_data,
+        function_id=function_id,
+    )
+
+
+async def _batch_metrics(
+    function_ids: List[str], window_seconds: int, step_seconds: int, max_points: int
+) -> PrometheusBatchMetricsResponse:
+    """
+    여러 함수의 메트릭을 function_id별로 묶은 쿼리 하나(instant + range)로 조회해
+    서버에서 함수별로 분리. MAX_BATCH_FUNCTIONS개까지는 함수 수와 무관하게 Prometheus 호출 2회.
+    """
+    function_ids = list(dict.fromkeys(function_ids))
+    functions = {function_id: FunctionCpuMetrics() for function_id in function_ids}
+    if not function_ids:
+        return PrometheusBatchMetricsResponse(
+            status="success",
+            window_seconds=window_seconds,
+            step_seconds=step_seconds,
+            functions=functions,
         )
+
+    # 순서를 고정해 같은 함수 집합은 같은 쿼리(캐시/요청 합치기 키)가 되도록 하고,
+    # 쿼리 길이를 제한하기 위해 MAX_BATCH_FUNCTIONS개씩 나눠 병렬로 조회
+    ordered = sorted(function_ids)
+    chunks = [
+        ordered[start:start + MAX_BATCH_FUNCTIONS]
+        for start in range(0, len(ordered), MAX_BATCH_FUNCTIONS)
+    ]
+    queries = [
+        cpu_query(f'=~"{"|".join(chunk)}"', by_function=True, step_seconds=step_seconds)
+        for chunk in chunks
+    ]
+    responses = await asyncio.gather(
+        *(prometheus_client.query(query) for query in queries),
+        *(prometheus_client.query_range(query, window_seconds, step_seconds) for query in queries),
+    )
+    instant_payloads, range_payloads = responses[:len(queries)], responses[len(queries):]
+
+    for instant_json in instant_payloads:
+        for result in instant_json.get("data", {}).get("result", []):
+            metrics = functions.get(result.get("metric", {}).get(FUNCTION_ID_LABEL))
+            if metrics is not None:
+                metrics.cpu_total = _instant_value(result)
+    range_results: Dict[str, List[Dict[str, Any]]] = {}
+    for range_json in range_payloads:
+        for result in range_json.get("data", {}).get("result", []):
+            function_id = result.get("metric", {}).get(FUNCTION_ID_LABEL)
+            if function_id in functions:
+                range_results.setdefault(function_id, []).append(result)
+    for function_id, results in range_results.items():
+        metrics = functions[function_id]
+        metrics.cpu_series, metrics.source_points = _series_points(results, max_points)
+
+    return PrometheusBatchMetricsResponse(
+        status=_status_value(*responses),
+        window_seconds=window_seconds,
+        step_seconds=step_seconds,
+        instant_query=queries[0] if len(queries) == 1 else None,
+        range_query=queries[0] if len(queries) == 1 else None,
+        functions=functions,
+    )
+
+
+def _parse_function_ids(raw: str) -> List[str]:
+    function_ids = [value.strip() for value in raw.split(",") if value.strip()]
+    invalid = [value for value in function_ids if not FUNCTION_ID_PATTERN.match(value)]
+    if invalid:
+        raise _validation_error("function_ids", f"Invalid function_ids: {', '.join(invalid)}")
+    if len(function_ids) > MAX_BATCH_FUNCTIONS:
+        raise _validation_error(
+            "function_ids", f"At most {MAX_BATCH_FUNCTIONS} function_ids per request"
+        )
+    return function_ids
+
+
+@router.get("/functions/metrics", response_model=PrometheusBatchMetricsResponse)
+async def get_functions_metrics(
+    function_ids: str = Query(..., description="쉼표로 구분한 function_id 목록"),
+    window: Optional[str] = Query(None, description="조회 기간 (예: 1h, 24h, 7d). 기본 1시간"),
+    step: Optional[str] = Query(None, description="range step (예: 60s, 5m). 생략 시 자동"),
+    max_points: Optional[int] = Query(
+        None, ge=3, le=PROMETHEUS_MAX_POINTS, description="함수별 시계열 최대 포인트 수"
+    ),
+):
+    """여러 함수 메트릭 일괄 조회 (목록 페이지용)"""
+    ids = _parse_function_ids(function_ids)
+    window_seconds, step_seconds, max_points = resolve_window(window, step, max_points)
+    try:
+        return await _batch_metrics(ids, window_seconds, step_seconds, max_points)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _prometheus_error(e)
+
+
+@router.get(
+    "/workspaces/{workspace_id}/metrics",
+    response_model=PrometheusBatchMetricsResponse,
+)
+async def get_workspace_metrics(
+    workspace_id: str,
+    function_ids: Optional[str] = Query(
+        None, description="쉼표로 구분한 function_id 목록 (생략 시 워크스페이스의 모든 함수)"
+    ),
+    window: Optional[str] = Query(None, description="조회 기간 (예: 1h, 24h, 7d). 기본 1시간"),
+    step: Optional[str] = Query(None, description="range step (예: 60s, 5m). 생략 시 자동"),
+    max_points: Optional[int] = Query(
+        None, ge=3, le=PROMETHEUS_MAX_POINTS, description="함수별 시계열 최대 포인트 수"
+    ),
+):
+    """워크스페이스 함수 메트릭 일괄 조회"""
+    window_seconds, step_seconds, max_points = resolve_window(window, step, max_points)
+    if function_ids is not None:
+        ids = _parse_function_ids(function_ids)
+    else:
+        workspace = await asyncio.to_thread(db_client.get_workspace, workspace_id)
+        if not workspace:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={
+                    "error": {
+                        "code": "NOT_FOUND",
+                        "message": f"Workspace {workspace_id} not found",
+                    }
+                },
+            )
+        functions = await asyncio.to_thread(db_client.list_functions, workspace_id)
+        ids = [
+            function["id"]
+            for function in functions
+            if FUNCTION_ID_PATTERN.match(function.get("id", ""))
+        ]
+    try:
+        return await _batch_metrics(ids, window_seconds, step_seconds, max_points)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise _prometheus_error(e)
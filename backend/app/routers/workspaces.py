@@ -4,7 +4,13 @@ from app.models import WorkspaceCreate, WorkspaceUpdate, Workspace
 from app.database import db_client
 from typing import List
 from datetime import datetime
+from app.services.log_archive import log_archive
+from app.utils.k8s import k8s_client, spinapp_name
 from app.utils.timezone import to_kst
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -133,6 +139,22 @@ async def delete_workspace(workspace_id: str):
             },
         )
 
+    # 워크스페이스의 SpinApp 리소스를 한 번에 삭제 (실패해도 DB 삭제는 진행)
+    functions = db_client.list_functions(workspace_id)
+    names = [spinapp_name(func["name"]) for func in functions if func.get("name")]
+    if names:
+        results = await k8s_client.delete_spinapps(names)
+        failed = [result.as_dict() for result in results if not result.ok]
+        if failed:
+            logger.warning(f"Failed to delete spinapps for workspace {workspace_id}: {failed}")
+
+    # 함수별 S3 로그 아카이브 삭제
+    for func in functions:
+        try:
+            await asyncio.to_thread(log_archive.delete_function_archive, func["id"])
+        except Exception as e:
+            logger.warning(f"Failed to delete log archive for {func['id']}: {e}")
+
     # 삭제
     db_client.delete_workspace(workspace_id)
     return None
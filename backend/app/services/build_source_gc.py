@@ -0,0 +1,200 @@
+"""빌드 소스(build-sources/) 아티팩트 가비지 컬렉터"""
+import asyncio
+import logging
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.database import db_client, s3_client, S3_DELETE_BATCH_SIZE
+from app.utils.timezone import now_kst, to_kst
+
+logger = logging.getLogger(__name__)
+
+BUILD_SOURCE_ROOT = "build-sources/"
+LOCK_NAME = "build-source-gc"
+
+
+@dataclass
+class GCReport:
+    """GC 1회 실행 결과"""
+
+    prefixes_scanned: int = 0
+    prefixes_removed: int = 0
+    objects_deleted: int = 0
+    bytes_reclaimed: int = 0
+    delete_errors: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "prefixes_scanned": self.prefixes_scanned,
+            "prefixes_removed": self.prefixes_removed,
+            "objects_deleted": self.objects_deleted,
+            "bytes_reclaimed": self.bytes_reclaimed,
+            "delete_errors": self.delete_errors,
+        }
+
+
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return to_kst(datetime.fromisoformat(value.replace("Z", "+00:00")))
+    except ValueError:
+        return None
+
+
+def _is_stale(task: Optional[Dict[str, Any]], newest_object: datetime, now: datetime) -> bool:
+    """
+    빌드 소스 prefix 삭제 여부 판단.
+
+    - BUILD# 항목이 없으면(워크스페이스 삭제 등) 업로드 후 유예 시간이 지난 경우 삭제
+    - 항목이 있으면 마지막 갱신(updated_at)이 보존 기간을 넘긴 경우 삭제.
+      push가 s3_source_path로 소스를 재사용하므로 완료된 작업도 보존 기간 동안 유지한다.
+    """
+    if task is None:
+        grace = timedelta(minutes=settings.build_source_orphan_grace_minutes)
+        return now - to_kst(newest_object) > grace
+
+    retention = timedelta(hours=settings.build_source_retention_hours)
+    updated_at = _parse_iso(task.get("updated_at")) or _parse_iso(task.get("created_at"))
+    if updated_at is None:
+        return now - to_kst(newest_object) > retention
+    # 빌드 폴링은 10분이면 끝나므로 보존 기간 동안 갱신되지 않은 pending/running도 중단된 작업
+    return now - updated_at > retention
+
+
+class BuildSourceGC:
+    """build-sources/{ws}/{task}/ prefix를 순회하며 오래된 아티팩트를 정리"""
+
+    def __init__(self, batch_interval_seconds: Optional[float] = None):
+        self.batch_interval_seconds = (
+            settings.build_source_gc_batch_interval_seconds
+            if batch_interval_seconds is None
+            else batch_interval_seconds
+        )
+        self._pending: List[Tuple[str, int]] = []
+        self._last_delete_at = 0.0
+        self.owner = f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+
+    def run_once(self, dry_run: bool = False) -> GCReport:
+        """
+        전체 build-sources/ 를 한 번 순회 (블로킹, 스레드에서 실행).
+        여러 레플리카가 같은 listing/삭제를 반복하지 않도록 임대 락을 가진 경우에만 실행한다.
+        """
+        report = GCReport()
+        if not db_client.acquire_lock(LOCK_NAME, self.owner, settings.build_source_gc_lock_seconds):
+            logger.info("Build source GC skipped: another replica holds the lock")
+            return report
+        try:
+            self._collect(report, dry_run)
+        finally:
+            db_client.release_lock(LOCK_NAME, self.owner)
+
+        logger.info("Build source GC finished: %s", report.as_dict())
+        return report
+
+    def _collect(self, report: GCReport, dry_run: bool):
+        now = now_kst()
+
+        current: Optional[Tuple[str, str]] = None
+        objects: List[Tuple[str, int]] = []
+        newest: Optional[datetime] = None
+
+        # 키가 사전순으로 나열되므로 같은 {ws}/{task}/ prefix는 연속으로 등장한다
+        for obj in s3_client.iter_objects(BUILD_SOURCE_ROOT):
+            parts = obj["Key"][len(BUILD_SOURCE_ROOT):].split("/", 2)
+            if len(parts) < 3:
+                continue
+            group = (parts[0], parts[1])
+            if group != current:
+                if current is not None:
+                    self._evaluate(current, objects, newest, now, report, dry_run)
+                current, objects, newest = group, [], None
+            objects.append((obj["Key"], obj.get("Size", 0)))
+            modified = obj.get("LastModified")
+            if modified and (newest is None or modified > newest):
+                newest = modified
+
+        if current is not None:
+            self._evaluate(current, objects, newest, now, report, dry_run)
+        if not dry_run:
+            self._flush(report)
+
+    def _evaluate(
+        self,
+        group: Tuple[str, str],
+        objects: List[Tuple[str, int]],
+        newest: Optional[datetime],
+        now: datetime,
+        report: GCReport,
+        dry_run: bool,
+    ):
+        workspace_id, task_id = group
+        report.prefixes_scanned += 1
+        if newest is None:
+            return
+
+        task = db_client.get_build_task(workspace_id, task_id)
+        if not _is_stale(task, newest, now):
+            return
+
+        report.prefixes_removed += 1
+        logger.debug(
+            "Build source %s/%s marked stale (status=%s, %d objects)",
+            workspace_id,
+            task_id,
+            task.get("status") if task else None,
+            len(objects),
+        )
+        if dry_run:
+            report.objects_deleted += len(objects)
+            report.bytes_reclaimed += sum(size for _, size in objects)
+            return
+
+        for entry in objects:
+            self._pending.append(entry)
+            if len(self._pending) >= S3_DELETE_BATCH_SIZE:
+                self._flush(report)
+
+    def _flush(self, report: GCReport):
+        """대기 중인 키를 delete_objects 한 번으로 삭제 (배치 간 간격으로 속도 제한)"""
+        if not self._pending:
+            return
+        wait = self.batch_interval_seconds - (time.monotonic() - self._last_delete_at)
+        if wait > 0:
+            time.sleep(wait)
+
+        batch, self._pending = self._pending, []
+        # 긴 순회 중 임대가 만료되지 않도록 배치마다 연장, 이미 넘어갔으면 중단
+        if not db_client.acquire_lock(LOCK_NAME, self.owner, settings.build_source_gc_lock_seconds):
+            raise RuntimeError("Build source GC lost its lock")
+        try:
+            failed = set(s3_client.delete_keys([key for key, _ in batch]))
+        except Exception as e:
+            logger.error("Build source GC batch delete failed: %s", e)
+            failed = {key for key, _ in batch}
+        self._last_delete_at = time.monotonic()
+
+        for key, size in batch:
+            if key in failed:
+                report.delete_errors += 1
+            else:
+                report.objects_deleted += 1
+                report.bytes_reclaimed += size
+
+
+async def run_build_source_gc_loop():
+    """주기적으로 GC 실행 (앱 lifespan에서 백그라운드 태스크로 구동)"""
+    interval = settings.build_source_gc_interval_seconds
+    while True:
+        try:
+            await asyncio.to_thread(BuildSourceGC().run_once)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Build source GC error: %s", e)
+        await asyncio.sleep(interval)
@@ -0,0 +1,256 @@
+"""Builder Service 작업 상태 공용 폴러
+
+레플리카당 하나의 폴링 루프가 진행 중인 모든 builder task를 추적한다.
+공유 커넥션 풀로 GET /api/v1/tasks/{id} 를 호출하고, 작업 나이에 따라
+폴링 간격을 늘리며, 상태가 바뀔 때마다 등록된 핸들러를 호출한다.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from app.config import settings
+from app.database import BUILD_STATUS_RANK
+from app.utils.http import get_http_client
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "done", "failed")
+
+# 상태 전이 핸들러: (이전 상태, builder 응답) -> None
+TransitionHandler = Callable[[Optional[str], Dict[str, Any]], Awaitable[None]]
+
+
+def get_builder_client() -> httpx.AsyncClient:
+    """Builder Service 호출용 공유 클라이언트"""
+    return get_http_client("builder", timeout=30.0)
+
+
+def poll_interval_for_age(age_seconds: float) -> float:
+    """
+    작업 나이에 따른 폴링 간격 (초기에는 촘촘히, 오래된 작업은 느슨히).
+    Builder webhook이 설정된 경우 폴링은 느린 fallback으로만 사용한다.
+    """
+    if age_seconds < 30:
+        interval = 2.0
+    elif age_seconds < 120:
+        interval = 5.0
+    elif age_seconds < 300:
+        interval = 10.0
+    else:
+        interval = 15.0
+    if settings.builder_webhook_secret:
+        interval = max(interval, settings.builder_fallback_poll_seconds)
+    return interval
+
+
+@dataclass
+class TrackedTask:
+    """추적 중인 builder task"""
+
+    builder_task_id: str
+    workspace_id: str
+    label: str
+    started_at: float
+    deadline: float
+    next_poll_at: float
+    future: "asyncio.Future[Optional[Dict[str, Any]]]"
+    handlers: List[TransitionHandler] = field(default_factory=list)
+    last_status: Optional[str] = None
+    consecutive_errors: int = 0
+
+
+class BuilderTaskPoller:
+    """진행 중인 builder task 전체를 하나의 루프에서 폴링"""
+
+    def __init__(
+        self,
+        timeout_seconds: float = 600.0,
+        tick_seconds: float = 1.0,
+        max_concurrent_polls: int = 20,
+        max_consecutive_errors: int = 5,
+    ):
+        self.timeout_seconds = timeout_seconds
+        self.tick_seconds = tick_seconds
+        self.max_consecutive_errors = max_consecutive_errors
+        self._semaphore = asyncio.Semaphore(max_concurrent_polls)
+        self._tasks: Dict[str, TrackedTask] = {}
+        self._loop_task: Optional[asyncio.Task] = None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    async def wait(
+        self,
+        builder_task_id: str,
+        workspace_id: str,
+        label: str = "Builder",
+        on_transition: Optional[TransitionHandler] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        builder task가 종료 상태(completed/done/failed)가 될 때까지 대기.
+
+        종료 시 builder 응답(dict)을 반환하고, 제한 시간을 넘기면 None을 반환한다.
+        연속된 조회 실패가 임계치를 넘으면 마지막 오류(httpx.HTTPError, 잘못된 응답의 ValueError 등)를 그대로 올린다.
+        """
+        tracked = self._tasks.get(builder_task_id)
+        if tracked is None:
+            now = time.monotonic()
+            tracked = TrackedTask(
+                builder_task_id=builder_task_id,
+                workspace_id=workspace_id,
+                label=label,
+                started_at=now,
+                deadline=now + self.timeout_seconds,
+                next_poll_at=now + poll_interval_for_age(0),
+                future=asyncio.get_running_loop().create_future(),
+            )
+            self._tasks[builder_task_id] = tracked
+        if on_transition:
+            tracked.handlers.append(on_transition)
+
+        self._ensure_running()
+        # 호출 측이 취소되어도 공유 future는 유지
+        return await asyncio.shield(tracked.future)
+
+    async def notify(self, builder_task_id: str, status_data: Dict[str, Any]) -> bool:
+        """
+        webhook 등 외부에서 받은 상태를 추적 중인 task에 즉시 반영.
+        이 레플리카가 추적 중인 task가 아니면 False.
+        """
+        tracked = self._tasks.get(builder_task_id)
+        if tracked is None:
+            return False
+        await self._apply(tracked, status_data)
+        return True
+
+    def _ensure_running(self):
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """폴링 루프 종료 (앱 종료 시)"""
+        if self._loop_task:
+            self._loop_task.cancel()
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+            self._loop_task = None
+
+    async def _run(self):
+        while self._tasks:
+            try:
+                await self._tick()
+            except Exception as e:
+                # 한 번의 실패로 이 레플리카의 다른 task 폴링이 멈추지 않도록 루프는 유지
+                logger.error("Builder poll loop tick failed: %s", e)
+            await asyncio.sleep(self.tick_seconds)
+
+    async def _tick(self):
+        now = time.monotonic()
+        due = [t for t in self._tasks.values() if t.next_poll_at <= now]
+        for tracked in [t for t in due if t.deadline <= now]:
+            logger.error(
+                "%s task %s timed out after %.0fs",
+                tracked.label,
+                tracked.builder_task_id,
+                self.timeout_seconds,
+            )
+            self._resolve(tracked, None)
+        due = [t for t in due if not t.future.done()]
+        if due:
+            await asyncio.gather(*(self._poll(t) for t in due))
+
+    async def _poll(self, tracked: TrackedTask):
+        async with self._semaphore:
+            try:
+                response = await get_builder_client().get(
+                    f"{settings.builder_service_url}/api/v1/tasks/{tracked.builder_task_id}",
+                    params={"workspace_id": tracked.workspace_id},
+                    timeout=10.0,
+                )
+                response.raise_for_status()
+                status_data = response.json()
+                if not isinstance(status_data, dict):
+                    raise ValueError(f"Unexpected builder response: {type(status_data).__name__}")
+            except Exception as e:
+                # 네트워크 오류, JSON이 아닌 200 응답 등은 모두 조회 실패로 집계
+                self._poll_failed(tracked, e)
+                return
+
+        tracked.consecutive_errors = 0
+        try:
+            await self._apply(tracked, status_data)
+        except Exception as e:
+            self._poll_failed(tracked, e)
+
+    def _poll_failed(self, tracked: TrackedTask, error: Exception):
+        tracked.consecutive_errors += 1
+        logger.warning(
+            "%s task %s poll failed (%d/%d): %s",
+            tracked.label,
+            tracked.builder_task_id,
+            tracked.consecutive_errors,
+            self.max_consecutive_errors,
+            error,
+        )
+        if tracked.consecutive_errors >= self.max_consecutive_errors:
+            self._tasks.pop(tracked.builder_task_id, None)
+            if not tracked.future.done():
+                tracked.future.set_exception(error)
+        else:
+            self._schedule_next(tracked)
+
+    async def _apply(self, tracked: TrackedTask, status_data: Dict[str, Any]):
+        if tracked.future.done():
+            return
+        status = status_data.get("status")
+        previous = tracked.last_status
+        if BUILD_STATUS_RANK.get(status, 0) < BUILD_STATUS_RANK.get(previous, 0):
+            # webhook으로 이미 더 앞선 상태를 받은 경우 늦게 도착한 폴링 결과는 무시
+            self._schedule_next(tracked)
+            return
+        if status != previous:
+            tracked.last_status = status
+            logger.info(
+                "%s task %s status: %s -> %s",
+                tracked.label,
+                tracked.builder_task_id,
+                previous,
+                status,
+            )
+            await self._dispatch(tracked, previous, status_data)
+
+        if status in TERMINAL_STATUSES:
+            self._resolve(tracked, status_data)
+        else:
+            self._schedule_next(tracked)
+
+    async def _dispatch(
+        self, tracked: TrackedTask, previous: Optional[str], status_data: Dict[str, Any]
+    ):
+        for handler in tracked.handlers:
+            try:
+                await handler(previous, status_data)
+            except Exception as e:
+                logger.error(
+                    "%s task %s transition handler failed: %s",
+                    tracked.label,
+                    tracked.builder_task_id,
+                    e,
+                )
+
+    def _schedule_next(self, tracked: TrackedTask):
+        now = time.monotonic()
+        tracked.next_poll_at = now + poll_interval_for_age(now - tracked.started_at)
+
+    def _resolve(self, tracked: TrackedTask, result: Optional[Dict[str, Any]]):
+        self._tasks.pop(tracked.builder_task_id, None)
+        if not tracked.future.done():
+            tracked.future.set_result(result)
+
+
+# 전역 폴러 인스턴스
+builder_poller = BuilderTaskPoller()
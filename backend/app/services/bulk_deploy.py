@@ -0,0 +1,163 @@
+"""여러 함수 일괄 배포 진행 상황
+
+일괄 배포는 함수마다 job 큐의 deploy job으로 등록되므로 재시도, 파드 종료 시 재개,
+admission(deploy lane 한도)은 단건 배포와 같다. 이 모듈은 DEPLOY# 항목을 BatchGetItem으로
+주기적으로 읽어 상태 변화를 진행 이벤트로 만든다. 응답 스트림이 끊겨도 배포 job은 계속 진행된다.
+
+배포 job이 끝날 때의 함수 갱신(invocationUrl/lastDeployed)은 FunctionUpdateBatcher가 레플리카 안에서
+모아 TransactWriteItems(25개 단위)로 반영한다. job은 자기 갱신이 반영될 때까지 기다린 뒤 완료되므로
+파드가 중간에 죽어도 갱신이 유실되지 않는다 (job이 재개되어 다시 갱신).
+"""
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.database import db_client
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("ready", "failed")
+# TransactWriteItems 한 번에 넣을 수 있는 항목 수
+FUNCTION_UPDATE_BATCH_SIZE = 25
+
+
+@dataclass
+class BulkDeployItem:
+    """일괄 배포 항목 (DEPLOY# 항목과 deploy job은 미리 생성)"""
+
+    index: int
+    deploy_id: str
+    workspace_id: str
+    function_id: Optional[str]
+
+
+class BulkDeployProgress:
+    """일괄 배포 항목들의 DEPLOY# 상태를 따라가며 진행 이벤트(dict)를 만든다"""
+
+    def __init__(self, items: List[BulkDeployItem], poll_seconds: Optional[float] = None):
+        self.items = items
+        self.poll_seconds = poll_seconds or settings.bulk_deploy_poll_seconds
+        self.results: Counter = Counter()
+
+    async def poll(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        poll_seconds마다 그 사이 생긴 이벤트 목록을 내보낸다 (없으면 빈 목록).
+        모든 항목이 ready/failed가 되면 summary 이벤트와 함께 끝난다.
+        """
+        pending = {item.deploy_id: item for item in self.items}
+        last_status: Dict[str, str] = {}
+        while True:
+            events: List[Dict[str, Any]] = []
+            try:
+                tasks = await asyncio.to_thread(
+                    db_client.batch_get_deploy_tasks,
+                    [(item.workspace_id, item.deploy_id) for item in pending.values()],
+                )
+            except Exception as e:
+                logger.warning("Bulk deploy progress lookup failed: %s", e)
+                tasks = {}
+
+            for deploy_id, task in tasks.items():
+                item = pending.get(deploy_id)
+                status = task.get("status")
+                if item is None or status == last_status.get(deploy_id):
+                    continue
+                last_status[deploy_id] = status
+                events.append(self._status_event(item, task))
+                if status in TERMINAL_STATUSES:
+                    self.results[status] += 1
+                    del pending[deploy_id]
+
+            if not pending:
+                events.append(
+                    {
+                        "event": "summary",
+                        "total": len(self.items),
+                        "ready": self.results["ready"],
+                        "failed": self.results["failed"],
+                    }
+                )
+                yield events
+                return
+            yield events
+            await asyncio.sleep(self.poll_seconds)
+
+    @staticmethod
+    def _status_event(item: BulkDeployItem, task: Dict[str, Any]) -> Dict[str, Any]:
+        event: Dict[str, Any] = {
+            "event": "status",
+            "index": item.index,
+            "deploy_id": item.deploy_id,
+            "function_id": item.function_id,
+            "status": task.get("status"),
+        }
+        if task.get("status") == "deploying":
+            event["app_name"] = task.get("app_name")
+        elif task.get("status") == "ready":
+            event["endpoint"] = task.get("endpoint")
+        elif task.get("status") == "failed":
+            event["error"] = task.get("error_message")
+        return event
+
+
+class FunctionUpdateBatcher:
+    """
+    함수 항목 갱신을 모아 update_functions_batch로 반영.
+    묶음이 25개가 되거나 첫 요청 후 BULK_DEPLOY_FLUSH_SECONDS가 지나면 flush한다.
+    """
+
+    def __init__(self, flush_seconds: Optional[float] = None):
+        self.flush_seconds = flush_seconds or settings.bulk_deploy_flush_seconds
+        self._pending: List[Tuple[str, str, Dict[str, Any], asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+
+    async def update(
+        self, workspace_id: str, function_id: str, updates: Dict[str, Any]
+    ) -> bool:
+        """갱신이 반영될 때까지 대기. 함수가 없어(삭제됨) 반영하지 못했으면 False"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((workspace_id, function_id, updates, future))
+        if len(self._pending) >= FUNCTION_UPDATE_BATCH_SIZE:
+            # 이 job이 취소돼도 같은 묶음의 다른 job 갱신은 끝까지 반영
+            await asyncio.shield(self._flush(self._take()))
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+        return await future
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_seconds)
+        self._timer = None
+        await self._flush(self._take())
+
+    def _take(self) -> List[Tuple[str, str, Dict[str, Any], asyncio.Future]]:
+        batch, self._pending = self._pending, []
+        return batch
+
+    async def _flush(self, batch: List[Tuple[str, str, Dict[str, Any], asyncio.Future]]):
+        if not batch:
+            return
+        try:
+            missing = await asyncio.to_thread(
+                db_client.update_functions_batch,
+                [
+                    (workspace_id, function_id, updates)
+                    for workspace_id, function_id, updates, _ in batch
+                ],
+            )
+        except Exception as e:
+            logger.error("Function update batch failed: %s", e)
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        missing_keys = set(missing)
+        for workspace_id, function_id, _, future in batch:
+            if not future.done():
+                future.set_result((workspace_id, function_id) not in missing_keys)
+
+
+# 전역 함수 갱신 배처 (배포 job 공용)
+function_update_batcher = FunctionUpdateBatcher()
@@ -0,0 +1,160 @@
+"""배포 제출 및 readiness 감시
+
+Builder에 배포를 한 번만 요청한 뒤, 고정 대기나 재배포 요청 없이
+SpinApp 엔드포인트가 응답할 때까지 지수 backoff로 확인한다.
+진행 상태는 DEPLOY# 항목에 기록한다.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+from app.database import db_client
+from app.services.builder_poller import get_builder_client
+from app.utils.http import get_http_client, normalize_invocation_url
+from app.utils.timezone import now_kst_iso
+
+logger = logging.getLogger(__name__)
+
+# 확인 결과 핸들러: (시도 횟수, 결과 설명) -> None
+ProbeHandler = Callable[[int, str], Awaitable[None]]
+
+
+class DeployRejected(Exception):
+    """Builder가 배포 요청을 거절함 (응답 본문의 error, 재시도하지 않음)"""
+
+
+async def submit_deploy(
+    workspace_id: str, deploy_id: str, deploy_data: Dict[str, Any], namespace: str
+) -> Dict[str, Any]:
+    """
+    Builder /api/v1/deploy 호출 후 DEPLOY# 항목을 deploying으로 갱신해 반환.
+    네트워크/HTTP 오류는 httpx.HTTPError로, 본문의 error는 DeployRejected로 올린다.
+    """
+    logger.info("Final deploy data being sent: %s", deploy_data)
+    response = await get_builder_client().post(
+        f"{settings.builder_service_url}/api/v1/deploy",
+        json=deploy_data,
+        timeout=60.0,
+    )
+    logger.info(
+        "Builder service response received. Status: %s, Body: %s",
+        response.status_code,
+        response.text,
+    )
+    response.raise_for_status()
+    deploy_response = response.json()
+    if deploy_response.get("error"):
+        raise DeployRejected(f"Deploy failed: {deploy_response['error']}")
+
+    return await asyncio.to_thread(
+        db_client.update_deploy_task,
+        workspace_id,
+        deploy_id,
+        {
+            "status": "deploying",
+            "app_name": deploy_response.get("app_name"),
+            "namespace": deploy_response.get("namespace") or namespace,
+            "service_name": deploy_response.get("service_name"),
+            "endpoint": deploy_response.get("endpoint"),
+            "submitted_at": now_kst_iso(),
+        },
+    )
+
+
+async def watch_deploy(deploy_task: Dict[str, Any]) -> Optional[str]:
+    """
+    제출된 배포의 엔드포인트가 응답할 때까지 확인하며 확인 횟수를 DEPLOY# 항목에 기록.
+    준비되면 DEPLOY# 를 ready로 갱신하고 엔드포인트를, 제한 시간을 넘기면 None을 반환한다.
+    """
+    workspace_id, deploy_id = deploy_task["workspace_id"], deploy_task["deploy_id"]
+    endpoint = service_endpoint(deploy_task, deploy_task.get("namespace") or "default")
+    if not endpoint:
+        raise DeployRejected("Builder did not return an app name or endpoint")
+
+    async def record_probe(attempt: int, detail: str):
+        await asyncio.to_thread(
+            db_client.update_deploy_task,
+            workspace_id,
+            deploy_id,
+            {"probe_attempts": attempt, "last_probe": detail},
+        )
+
+    if not await wait_until_ready(endpoint, on_probe=record_probe):
+        return None
+
+    await asyncio.to_thread(
+        db_client.update_deploy_task,
+        workspace_id,
+        deploy_id,
+        {"status": "ready", "endpoint": endpoint, "ready_at": now_kst_iso()},
+    )
+    return endpoint
+
+
+def service_endpoint(deploy_response: Dict[str, Any], namespace: str) -> Optional[str]:
+    """
+    배포 응답에서 호출 URL 결정.
+    Builder가 endpoint를 아직 못 받은 경우 Service 이름(없으면 app_name)으로 클러스터 DNS를 구성한다.
+    """
+    endpoint = deploy_response.get("endpoint")
+    if endpoint:
+        return normalize_invocation_url(endpoint)
+    service = deploy_response.get("service_name") or deploy_response.get("app_name")
+    if not service:
+        return None
+    return f"http://{service}.{deploy_response.get('namespace') or namespace}.svc.cluster.local"
+
+
+def probe_delay_seconds(attempt: int) -> float:
+    """확인 간격 (1s, 2s, 4s ... 최대 DEPLOY_PROBE_MAX_DELAY_SECONDS)"""
+    return min(
+        settings.deploy_probe_max_delay_seconds,
+        settings.deploy_probe_initial_delay_seconds * 2 ** attempt,
+    )
+
+
+async def probe_endpoint(url: str) -> Tuple[bool, str]:
+    """
+    엔드포인트 응답 확인 (DEPLOY_PROBE_PATH가 있으면 해당 경로).
+    2xx 응답만 준비 완료로 본다. 4xx는 라우팅/Ingress가 아직 준비되지 않았을 수 있어 계속 확인한다.
+    """
+    client = get_http_client("deploy-probe", timeout=settings.deploy_probe_timeout_seconds)
+    if settings.deploy_probe_path:
+        url = f"{url.rstrip('/')}/{settings.deploy_probe_path.lstrip('/')}"
+    try:
+        response = await client.get(url)
+    except httpx.HTTPError as e:
+        return False, f"{type(e).__name__}: {e}"
+    return response.is_success, f"HTTP {response.status_code}"
+
+
+async def wait_until_ready(
+    url: str,
+    timeout_seconds: Optional[float] = None,
+    on_probe: Optional[ProbeHandler] = None,
+) -> bool:
+    """엔드포인트가 응답할 때까지 backoff하며 확인. 제한 시간 안에 응답하지 않으면 False"""
+    timeout_seconds = timeout_seconds or settings.deploy_readiness_timeout_seconds
+    deadline = time.monotonic() + timeout_seconds
+    attempt = 0
+    while True:
+        ready, detail = await probe_endpoint(url)
+        attempt += 1
+        logger.debug("Deploy probe %s #%d: %s", url, attempt, detail)
+        if on_probe:
+            try:
+                await on_probe(attempt, detail)
+            except Exception as e:
+                logger.warning("Deploy probe handler failed for %s: %s", url, e)
+        if ready:
+            return True
+
+        delay = probe_delay_seconds(attempt - 1)
+        if time.monotonic() + delay > deadline:
+            logger.warning("Deploy endpoint %s not ready after %d probes", url, attempt)
+            return False
+        await asyncio.sleep(delay)
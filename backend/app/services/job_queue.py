@@ -0,0 +1,475 @@
+"""DynamoDB 기반 내구성 빌드 job 큐
+
+build/push 처리를 FastAPI BackgroundTasks 대신 DynamoDB(PK=JOBQ)에 job으로 기록하고,
+각 레플리카의 워커가 임대(lease) 방식으로 가져가 실행한다.
+
+- 임대는 heartbeat로 연장되며, 파드가 죽으면 임대 만료 후 다른 레플리카가 가져간다
+- builder_task_id를 job에 기록하므로 재개 시 빌드를 다시 제출하지 않고 폴링만 이어간다
+- 실패한 job은 지수 backoff로 재시도하고, 최대 시도 횟수를 넘기면 실패 핸들러를 호출한다
+- admission control: 전체/워크스페이스별 동시 실행 수를 제한하고, 대기 job은
+  우선순위 → 워크스페이스별 실행 수(적은 쪽 먼저) → 등록 순으로 공정하게 배정한다.
+  한도는 모든 레플리카의 임대 현황을 기준으로 하며, 동시에 claim하는 경우 약간 넘을 수 있다
+- admission/대기 순번은 JOBQ 조회 결과를 BUILD_QUEUE_SNAPSHOT_SECONDS 동안 공유해
+  요청/상태 폴링마다 파티션 전체를 읽지 않는다 (워커 폴링과 로컬 등록이 스냅샷을 갱신)
+- 배포 job은 readiness 대기로 오래 임대되므로 빌드와 별도 lane(대기열/동시 실행 한도)을 쓴다
+"""
+import asyncio
+import logging
+import math
+import os
+import socket
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import shortuuid
+
+from app.config import settings
+from app.database import db_client
+
+logger = logging.getLogger(__name__)
+
+
+# job 종류별 기본 우선순위 (push/deploy는 짧고 배포를 막고 있으므로 빌드보다 먼저)
+JOB_PRIORITY = {"push": 1, "deploy": 1}
+# job 종류별 lane (없으면 build). lane마다 대기열/동시 실행 한도를 따로 적용
+JOB_LANE = {"deploy": "deploy"}
+
+
+@dataclass(frozen=True)
+class LaneLimits:
+    """lane별 admission 한도 (동시 실행 수, 대기 job 수)"""
+
+    global_concurrency: int
+    workspace_concurrency: int
+    max_pending: int
+    workspace_max_pending: int
+
+
+def job_lane(job: Dict[str, Any]) -> str:
+    return JOB_LANE.get(job.get("kind"), "build")
+
+
+def lane_limits(lane: str) -> LaneLimits:
+    if lane == "deploy":
+        return LaneLimits(
+            settings.deploy_global_concurrency,
+            settings.deploy_workspace_concurrency,
+            settings.deploy_queue_max_pending,
+            settings.deploy_workspace_max_pending,
+        )
+    return LaneLimits(
+        settings.build_global_concurrency,
+        settings.build_workspace_concurrency,
+        settings.build_queue_max_pending,
+        settings.build_workspace_max_pending,
+    )
+
+
+class JobFailed(Exception):
+    """재시도하지 않고 즉시 실패 처리할 오류"""
+
+
+class QueueFull(Exception):
+    """대기열 한도 초과 (retry_after: 재시도 권장 대기 시간, 초)"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class LeasedJob:
+    """워커가 임대 중인 job"""
+
+    item: Dict[str, Any]
+    owner: str
+
+    @property
+    def job_id(self) -> str:
+        return self.item["job_id"]
+
+    @property
+    def kind(self) -> str:
+        return self.item["kind"]
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        return self.item.get("payload") or {}
+
+    @property
+    def workspace_id(self) -> str:
+        return self.item["workspace_id"]
+
+    @property
+    def task_id(self) -> str:
+        return self.item["task_id"]
+
+    @property
+    def attempts(self) -> int:
+        return int(self.item.get("attempts", 0))
+
+    @property
+    def max_attempts(self) -> int:
+        return int(self.item.get("max_attempts", 1))
+
+    @property
+    def builder_task_id(self) -> Optional[str]:
+        return self.item.get("builder_task_id")
+
+    async def record_builder_task(self, builder_task_id: str):
+        """재개 시 재제출하지 않도록 builder_task_id를 job에 기록"""
+        self.item["builder_task_id"] = builder_task_id
+        await asyncio.to_thread(
+            db_client.update_leased_job,
+            self.job_id,
+            self.owner,
+            {"builder_task_id": builder_task_id},
+        )
+
+
+JobHandler = Callable[[LeasedJob], Awaitable[None]]
+# 최종 실패 핸들러: (job, 에러 메시지) -> None
+FailureHandler = Callable[[LeasedJob, str], Awaitable[None]]
+
+
+def retry_delay_seconds(attempts: int) -> int:
+    """재시도 backoff (10s, 20s, 40s ... 최대 5분)"""
+    return min(300, 10 * 2 ** max(0, attempts - 1))
+
+
+def _is_active(job: Dict[str, Any], now: int) -> bool:
+    return job.get("status") == "leased" and int(job.get("lease_expires_at", 0)) >= now
+
+
+def active_counts(jobs: List[Dict[str, Any]], now: int, lane: Optional[str] = None) -> Counter:
+    """워크스페이스별 실행 중(임대 유효) job 수 (lane을 주면 해당 lane만)"""
+    return Counter(
+        job.get("workspace_id")
+        for job in jobs
+        if _is_active(job, now) and (lane is None or job_lane(job) == lane)
+    )
+
+
+def dispatch_order(candidates: List[Dict[str, Any]], active: Counter) -> List[Dict[str, Any]]:
+    """
+    대기 job 배정 순서.
+    우선순위가 높은 job 먼저, 같은 우선순위에서는 실행 중(+앞서 배정된) job이 적은
+    워크스페이스 먼저, 그 다음 등록 순. 한 워크스페이스의 대량 제출이 다른
+    워크스페이스의 job을 뒤로 밀어내지 않는다.
+    """
+    pending = sorted(
+        candidates,
+        key=lambda job: (int(job.get("available_at", 0)), job.get("created_at", "")),
+    )
+    load = Counter(active)
+    ordered = []
+    while pending:
+        index = min(
+            range(len(pending)),
+            key=lambda i: (
+                -int(pending[i].get("priority", 0)),
+                load[pending[i].get("workspace_id")],
+                i,
+            ),
+        )
+        job = pending.pop(index)
+        load[job.get("workspace_id")] += 1
+        ordered.append(job)
+    return ordered
+
+
+class BuildJobQueue:
+    """job 등록 및 레플리카 로컬 워커 루프"""
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+        poll_seconds: Optional[float] = None,
+    ):
+        self.concurrency = concurrency or settings.build_worker_concurrency
+        self.lease_seconds = lease_seconds or settings.build_job_lease_seconds
+        self.poll_seconds = poll_seconds or settings.build_queue_poll_seconds
+        self.owner = f"{socket.gethostname()}-{os.getpid()}-{shortuuid.uuid()[:6]}"
+        self._handlers: Dict[str, JobHandler] = {}
+        self._failure_handlers: Dict[str, FailureHandler] = {}
+        self._running: Dict[str, Tuple[LeasedJob, asyncio.Task]] = {}
+        self._wake: Optional[asyncio.Event] = None
+        # admission/순번 계산용 JOBQ 스냅샷 (요청 스레드와 워커가 공유)
+        self._snapshot: Optional[List[Dict[str, Any]]] = None
+        self._snapshot_at = 0.0
+        self._snapshot_lock = threading.Lock()
+
+    def register(
+        self, kind: str, handler: JobHandler, on_failure: Optional[FailureHandler] = None
+    ):
+        """job 종류별 실행 핸들러 등록"""
+        self._handlers[kind] = handler
+        if on_failure:
+            self._failure_handlers[kind] = on_failure
+
+    def _jobs_snapshot(self) -> List[Dict[str, Any]]:
+        """JOBQ 목록. 스냅샷이 오래됐을 때만 조회 (동시에 만료되면 한 스레드만 조회하고 나머지는 대기)"""
+        with self._snapshot_lock:
+            if (
+                self._snapshot is None
+                or time.monotonic() - self._snapshot_at >= settings.build_queue_snapshot_seconds
+            ):
+                self._snapshot = db_client.list_jobs()
+                self._snapshot_at = time.monotonic()
+            return list(self._snapshot)
+
+    def _store_snapshot(self, jobs: List[Dict[str, Any]]):
+        with self._snapshot_lock:
+            self._snapshot = list(jobs)
+            self._snapshot_at = time.monotonic()
+
+    def admit(self, workspace_id: str, kind: str = "build", count: int = 1):
+        """
+        새 job count개 등록 가능 여부 확인 (task 생성/소스 업로드 전에 호출).
+        kind가 속한 lane의 전체 또는 워크스페이스 대기열에 자리가 없으면 QueueFull.
+        """
+        lane = JOB_LANE.get(kind, "build")
+        limits = lane_limits(lane)
+        queued = [
+            job
+            for job in self._jobs_snapshot()
+            if job.get("status") == "queued" and job_lane(job) == lane
+        ]
+        workspace_queued = sum(1 for job in queued if job.get("workspace_id") == workspace_id)
+
+        if workspace_queued + count > limits.workspace_max_pending:
+            raise QueueFull(
+                f"Workspace {lane} queue is full ({workspace_queued} pending)",
+                self._retry_after(workspace_queued, limits.workspace_concurrency),
+            )
+        if len(queued) + count > limits.max_pending:
+            raise QueueFull(
+                f"{lane.capitalize()} queue is full ({len(queued)} pending)",
+                self._retry_after(len(queued), limits.global_concurrency),
+            )
+
+    @staticmethod
+    def _retry_after(pending: int, concurrency: int) -> int:
+        """대기 job이 한 차례 빠질 때까지의 예상 시간 (최대 10분)"""
+        waves = math.ceil(pending / max(1, concurrency))
+        return min(600, max(1, waves) * settings.build_retry_after_seconds)
+
+    def queue_position(self, task_id: str) -> Optional[int]:
+        """task의 대기열 순번 (1부터, 같은 lane 안에서). 대기 중인 job이 없으면 None"""
+        jobs = self._jobs_snapshot()
+        target = next(
+            (
+                job
+                for job in jobs
+                if job.get("task_id") == task_id and job.get("status") == "queued"
+            ),
+            None,
+        )
+        if target is None:
+            return None
+        lane = job_lane(target)
+        queued = [
+            job for job in jobs if job.get("status") == "queued" and job_lane(job) == lane
+        ]
+        ordered = dispatch_order(queued, active_counts(jobs, int(time.time()), lane))
+        for position, job in enumerate(ordered, start=1):
+            if job.get("task_id") == task_id:
+                return position
+        return None
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        workspace_id: str,
+        task_id: str,
+        priority: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """job 등록 후 로컬 워커를 즉시 깨움"""
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        item = db_client.enqueue_job(
+            kind,
+            payload,
+            workspace_id=workspace_id,
+            task_id=task_id,
+            max_attempts=settings.build_job_max_attempts,
+            priority=JOB_PRIORITY.get(kind, 0) if priority is None else priority,
+        )
+        # 연속 등록이 스냅샷 만료 전에도 한도에 반영되도록 로컬 스냅샷에 추가
+        with self._snapshot_lock:
+            if self._snapshot is not None:
+                self._snapshot.append(item)
+        if self._wake:
+            self._wake.set()
+        return item
+
+    async def run(self):
+        """워커 루프 (앱 lifespan에서 백그라운드 태스크로 구동)"""
+        self._wake = asyncio.Event()
+        logger.info("Build job worker %s started", self.owner)
+        try:
+            while True:
+                try:
+                    await self._claim_available()
+                except Exception as e:
+                    logger.error("Build job worker poll failed: %s", e)
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+        finally:
+            await self._release_running()
+
+    async def _claim_available(self):
+        free = self.concurrency - len(self._running)
+        if free <= 0:
+            return
+
+        now = int(time.time())
+        jobs = await asyncio.to_thread(db_client.list_jobs)
+        self._store_snapshot(jobs)
+        candidates = [
+            job
+            for job in jobs
+            if job["job_id"] not in self._running
+            and job.get("kind") in self._handlers
+            and (
+                (job.get("status") == "queued" and int(job.get("available_at", 0)) <= now)
+                or (job.get("status") == "leased" and int(job.get("lease_expires_at", 0)) < now)
+            )
+        ]
+
+        active = {lane: active_counts(jobs, now, lane) for lane in ("build", "deploy")}
+        running_total = {lane: sum(counts.values()) for lane, counts in active.items()}
+        for job in dispatch_order(candidates, active_counts(jobs, now)):
+            if free <= 0:
+                break
+            lane = job_lane(job)
+            limits = lane_limits(lane)
+            workspace_id = job.get("workspace_id")
+            if running_total[lane] >= limits.global_concurrency:
+                continue  # lane 전체 동시 실행 한도 도달, 다른 lane job은 계속 배정
+            if active[lane][workspace_id] >= limits.workspace_concurrency:
+                continue  # 워크스페이스 동시 실행 한도 도달, 다음 워크스페이스로
+
+            claimed = await asyncio.to_thread(
+                db_client.claim_job, job["job_id"], self.owner, self.lease_seconds
+            )
+            if not claimed:
+                continue  # 다른 레플리카가 먼저 가져감
+            if job.get("status") == "leased":
+                logger.warning(
+                    "Resuming orphaned job %s (task %s) from %s",
+                    job["job_id"],
+                    job.get("task_id"),
+                    job.get("lease_owner"),
+                )
+            active[lane][workspace_id] += 1
+            running_total[lane] += 1
+            free -= 1
+            leased = LeasedJob(item=claimed, owner=self.owner)
+            self._running[leased.job_id] = (leased, asyncio.create_task(self._execute(leased)))
+
+    async def _execute(self, job: LeasedJob):
+        heartbeat = asyncio.create_task(self._heartbeat(job, asyncio.current_task()))
+        try:
+            await self._handlers[job.kind](job)
+        except asyncio.CancelledError:
+            raise
+        except JobFailed as e:
+            await self._fail(job, str(e))
+        except Exception as e:
+            if job.attempts >= job.max_attempts:
+                await self._fail(job, str(e))
+            else:
+                delay = retry_delay_seconds(job.attempts)
+                logger.warning(
+                    "Job %s (%s) attempt %d/%d failed, retrying in %ds: %s",
+                    job.job_id,
+                    job.kind,
+                    job.attempts,
+                    job.max_attempts,
+                    delay,
+                    e,
+                )
+                await asyncio.to_thread(
+                    db_client.release_job,
+                    job.job_id,
+                    self.owner,
+                    int(time.time()) + delay,
+                    str(e),
+                )
+        else:
+            await asyncio.to_thread(db_client.delete_job, job.job_id, self.owner)
+        finally:
+            heartbeat.cancel()
+            self._running.pop(job.job_id, None)
+            # 슬롯이 비었으므로 한도에 막혀 있던 대기 job을 바로 배정
+            if self._wake:
+                self._wake.set()
+
+    async def _fail(self, job: LeasedJob, error: str):
+        logger.error("Job %s (%s) failed permanently: %s", job.job_id, job.kind, error)
+        handler = self._failure_handlers.get(job.kind)
+        if handler:
+            try:
+                await handler(job, error)
+            except Exception as e:
+                logger.error("Job %s failure handler error: %s", job.job_id, e)
+        await asyncio.to_thread(db_client.delete_job, job.job_id, self.owner)
+
+    async def _heartbeat(self, job: LeasedJob, runner: Optional[asyncio.Task]):
+        """임대 만료 전에 주기적으로 연장. 임대를 잃으면 실행 중인 job을 중단"""
+        interval = max(1.0, self.lease_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                kept = await asyncio.to_thread(
+                    db_client.update_leased_job,
+                    job.job_id,
+                    self.owner,
+                    {"lease_expires_at": int(time.time()) + self.lease_seconds},
+                )
+            except Exception as e:
+                logger.warning("Job %s heartbeat failed: %s", job.job_id, e)
+                continue
+            if not kept:
+                logger.warning("Job %s lease lost, stopping local execution", job.job_id)
+                if runner:
+                    runner.cancel()
+                return
+
+    async def _release_running(self):
+        """종료 시 실행 중인 job의 임대를 반납해 다른 레플리카가 바로 이어받도록 함"""
+        running = list(self._running.values())
+        for _, task in running:
+            task.cancel()
+        await asyncio.gather(*(task for _, task in running), return_exceptions=True)
+        now = int(time.time())
+        for job, _ in running:
+            try:
+                # 종료로 중단된 시도는 재시도 횟수에 포함하지 않음
+                await asyncio.to_thread(
+                    db_client.update_leased_job,
+                    job.job_id,
+                    self.owner,
+                    {
+                        "status": "queued",
+                        "lease_owner": None,
+                        "lease_expires_at": 0,
+                        "available_at": now,
+                        "attempts": max(0, job.attempts - 1),
+                    },
+                )
+            except Exception as e:
+                logger.warning("Failed to release job %s: %s", job.job_id, e)
+
+
+# 전역 job 큐 인스턴스
+build_job_queue = BuildJobQueue()
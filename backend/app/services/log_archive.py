@@ -0,0 +1,348 @@
+"""실행 로그(LOG#) cold tier 아카이브
+
+보관 기간(log_archive_after_days)이 지난 날의 실행 로그를 함수/날짜(KST)별 Parquet(zstd) 세그먼트로
+S3에 옮기고 DynamoDB에서 삭제한다. 함수마다 세그먼트 목록(시간 범위, 건수)을 담은 작은 manifest를 둔다.
+
+    log-archive/{function_id}/manifest.json
+    log-archive/{function_id}/{YYYY-MM-DD}/{첫 로그 id}.parquet
+
+- 세그먼트 저장 → manifest 갱신 → DynamoDB 삭제 순서라 중간에 실패해도 로그가 사라지지 않는다
+  (두 tier에 중복될 수 있으므로 읽을 때 id로 중복 제거)
+- 여러 레플리카 중 하나만 실행하도록 DynamoDB 임대 락 사용
+- 조회 시 hot tier(DynamoDB)로 부족한 구간만 manifest로 겹치는 세그먼트를 골라 읽음
+- 로그 id(UUIDv7)에 타임스탬프가 있어 아카이브 후에도 DynamoDB에 로그별 항목이 남지 않음.
+  이전 형식 로그의 LOGID# 항목은 아카이브 때 manifest 세그먼트의 legacy_ids로 옮기고 삭제
+- 함수를 삭제하면 log-archive/{function_id}/ 하위(세그먼트, manifest)도 삭제
+"""
+import asyncio
+import io
+import json
+import logging
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.config import settings
+from app.database import db_client, s3_client
+from app.services.log_export import iter_function_items, parquet_available, parquet_chunks
+from app.utils.cache import ByteBudgetCache
+from app.utils.log_id import log_id_timestamp
+from app.utils.timezone import KST, now_kst, to_kst
+
+logger = logging.getLogger(__name__)
+
+LOG_ARCHIVE_ROOT = "log-archive/"
+LOCK_NAME = "log-archive"
+
+
+@dataclass
+class ArchiveReport:
+    """아카이브 1회 실행 결과"""
+
+    functions_scanned: int = 0
+    segments_written: int = 0
+    items_archived: int = 0
+    bytes_written: int = 0
+    errors: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "functions_scanned": self.functions_scanned,
+            "segments_written": self.segments_written,
+            "items_archived": self.items_archived,
+            "bytes_written": self.bytes_written,
+            "errors": self.errors,
+        }
+
+
+def manifest_key(function_id: str) -> str:
+    return f"{LOG_ARCHIVE_ROOT}{function_id}/manifest.json"
+
+
+def archive_cutoff(now: Optional[datetime] = None) -> str:
+    """이 시각(KST 자정) 이전 로그를 아카이브. 날짜 단위로 끊어 하루가 세그먼트 여러 곳에 흩어지지 않게 함"""
+    day = (to_kst(now or now_kst()) - timedelta(days=settings.log_archive_after_days)).date()
+    return datetime(day.year, day.month, day.day, tzinfo=KST).isoformat()
+
+
+def _in_range(timestamp: str, start: Optional[str], end: Optional[str]) -> bool:
+    return (not start or timestamp >= start) and (not end or timestamp < end)
+
+
+def segment_items(data: bytes) -> List[Dict[str, Any]]:
+    """Parquet 세그먼트 → LOG# 항목 형태의 dict 목록 (시간순)"""
+    import pyarrow.parquet as pq
+
+    items = []
+    for row in pq.read_table(io.BytesIO(data)).to_pylist():
+        for name in ("timestamp", "startedAt", "endedAt"):
+            if row[name] is not None:
+                row[name] = to_kst(row[name]).isoformat()
+            else:
+                row.pop(name)
+        for name in ("requestBody", "responseBody"):
+            row[name] = json.loads(row[name]) if row[name] is not None else None
+        row["PK"] = f"FN#{row['functionId']}"
+        row["SK"] = f"LOG#{row['timestamp']}#{row['id']}"
+        items.append(row)
+    return items
+
+
+class LogArchive:
+    """LOG# 항목의 S3 세그먼트 아카이브와 tier 통합 조회"""
+
+    def __init__(self):
+        # 세그먼트는 쓰고 나면 바뀌지 않으므로 바이트 예산 안에서 계속 재사용
+        self.segment_cache = ByteBudgetCache(settings.log_archive_cache_max_bytes, sizeof=len)
+        # manifest는 짧은 TTL로 캐시 (없는 경우도 b""로 캐시해 S3 404 반복 방지)
+        self.manifest_cache = ByteBudgetCache(1024 * 1024, sizeof=len)
+        self.owner = f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+
+    # ===== manifest / 세그먼트 =====
+    def load_manifest(self, function_id: str, use_cache: bool = True) -> Dict[str, Any]:
+        key = manifest_key(function_id)
+        cached = self.manifest_cache.get(key) if use_cache else None
+        if cached and time.monotonic() - cached[1] < settings.log_archive_manifest_ttl_seconds:
+            raw = cached[0]
+        else:
+            raw = s3_client.get_bytes(key) or b""
+            self.manifest_cache.put(key, raw)
+        if not raw:
+            return {"function_id": function_id, "segments": []}
+        return json.loads(raw)
+
+    def _save_manifest(self, function_id: str, manifest: Dict[str, Any]):
+        manifest["segments"].sort(key=lambda segment: (segment["start"], segment["key"]))
+        manifest["updated_at"] = now_kst().isoformat()
+        raw = json.dumps(manifest, ensure_ascii=False).encode("utf-8")
+        s3_client.put_bytes(manifest_key(function_id), raw, content_type="application/json")
+        self.manifest_cache.put(manifest_key(function_id), raw)
+
+    def read_segment(self, key: str) -> List[Dict[str, Any]]:
+        cached = self.segment_cache.get(key)
+        data = cached[0] if cached else s3_client.get_bytes(key)
+        if data is None:
+            logger.warning("Log archive segment %s listed in manifest but missing", key)
+            return []
+        if not cached:
+            self.segment_cache.put(key, data)
+        return segment_items(data)
+
+    def _segments(
+        self, function_id: str, start: Optional[str], end: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """[start, end)와 겹치는 세그먼트 (시작 시각순)"""
+        return [
+            segment
+            for segment in self.load_manifest(function_id)["segments"]
+            if (not start or segment["end"] >= start) and (not end or segment["start"] < end)
+        ]
+
+    # ===== 조회 =====
+    def list_logs(
+        self,
+        function_id: str,
+        limit: int,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """아카이브된 로그를 최신순으로 최대 limit개. 필요한 세그먼트만 최신 것부터 읽음"""
+        segments = sorted(
+            self._segments(function_id, start, end), key=lambda segment: segment["end"], reverse=True
+        )
+        items: Dict[str, Dict[str, Any]] = {}
+        for index, segment in enumerate(segments):
+            for item in self.read_segment(segment["key"]):
+                if _in_range(item["timestamp"], start, end):
+                    items[item["id"]] = item
+            ordered = sorted(items.values(), key=lambda item: item["SK"], reverse=True)
+            # 남은 세그먼트가 모두 현재 limit번째보다 오래됐으면 중단
+            if len(ordered) >= limit and (
+                index + 1 == len(segments)
+                or segments[index + 1]["end"] < ordered[limit - 1]["timestamp"]
+            ):
+                return ordered[:limit]
+        return sorted(items.values(), key=lambda item: item["SK"], reverse=True)[:limit]
+
+    def get_log(self, function_id: str, log_id: str) -> Optional[Dict[str, Any]]:
+        """
+        아카이브된 로그 단건 (id의 타임스탬프로 해당 세그먼트만 읽음).
+        이전 형식 id는 manifest의 세그먼트별 legacy_ids, 아직 정리되지 않았으면 LOGID# 항목으로 찾는다.
+        """
+        timestamp = log_id_timestamp(log_id)
+        if timestamp is None:
+            for segment in self.load_manifest(function_id)["segments"]:
+                if log_id in segment.get("legacy_ids", ()):
+                    return self._find(segment, log_id)
+            ref = db_client.get_log_ref(function_id, log_id)
+            if not ref:
+                return None
+            timestamp = ref["timestamp"]
+        for segment in self._segments(function_id, timestamp, None):
+            if segment["start"] > timestamp:
+                break
+            item = self._find(segment, log_id)
+            if item:
+                return item
+        return None
+
+    def _find(self, segment: Dict[str, Any], log_id: str) -> Optional[Dict[str, Any]]:
+        for item in self.read_segment(segment["key"]):
+            if item["id"] == log_id:
+                return item
+        return None
+
+    def iter_logs(
+        self, function_id: str, start: Optional[str] = None, end: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """아카이브된 로그를 시간순으로 (세그먼트 하나씩 읽음)"""
+        for segment in self._segments(function_id, start, end):
+            for item in self.read_segment(segment["key"]):
+                if _in_range(item["timestamp"], start, end):
+                    yield item
+
+    def iter_function_logs(
+        self, function_id: str, start: Optional[str] = None, end: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """cold → hot 순서로 두 tier를 이어 시간순 순회 (아카이브 대상은 항상 hot보다 오래됨)"""
+        seen = set()
+        if settings.log_archive_enabled:
+            for item in self.iter_logs(function_id, start, end):
+                seen.add(item["id"])
+                yield item
+        for item in iter_function_items(function_id, start, end):
+            if item["id"] not in seen:
+                yield item
+
+    # ===== 아카이브 작업 =====
+    def run_once(self) -> ArchiveReport:
+        """전체 함수를 한 번 순회 (블로킹, 스레드에서 실행)"""
+        report = ArchiveReport()
+        if not parquet_available():
+            logger.warning("Log archive skipped: pyarrow is not installed")
+            return report
+        lease = settings.log_archive_lock_seconds
+        if not db_client.acquire_lock(LOCK_NAME, self.owner, lease):
+            logger.info("Log archive skipped: another replica holds the lock")
+            return report
+
+        cutoff = archive_cutoff()
+        try:
+            for function in db_client.list_all_functions():
+                # 함수마다 임대 연장, 잃었으면 중단
+                if not db_client.acquire_lock(LOCK_NAME, self.owner, lease):
+                    logger.warning("Log archive lost its lock, stopping")
+                    break
+                report.functions_scanned += 1
+                try:
+                    self.archive_function(function["id"], cutoff, report)
+                except Exception as e:
+                    report.errors += 1
+                    logger.error("Log archive failed for %s: %s", function["id"], e)
+        finally:
+            db_client.release_lock(LOCK_NAME, self.owner)
+
+        logger.info("Log archive finished (cutoff=%s): %s", cutoff, report.as_dict())
+        return report
+
+    def archive_function(self, function_id: str, cutoff: str, report: ArchiveReport):
+        """cutoff 이전 LOG# 항목을 날짜별 세그먼트로 옮김"""
+        manifest = self.load_manifest(function_id, use_cache=False)
+        batch: List[Dict[str, Any]] = []
+        day = None
+        for page in db_client.iter_logs(
+            function_id, None, cutoff, page_size=settings.log_export_page_size
+        ):
+            for item in page:
+                item_day = item["timestamp"][:10]
+                if batch and (
+                    item_day != day or len(batch) >= settings.log_archive_segment_max_rows
+                ):
+                    self._write_segment(function_id, day, batch, manifest, report)
+                    batch = []
+                day = item_day
+                batch.append(item)
+        if batch:
+            self._write_segment(function_id, day, batch, manifest, report)
+        self._compact_log_refs(function_id, cutoff, manifest)
+
+    def _compact_log_refs(self, function_id: str, cutoff: str, manifest: Dict[str, Any]):
+        """
+        아카이브된 이전 형식 로그의 LOGID# 항목을 manifest 세그먼트의 legacy_ids로 옮기고 삭제
+        (UUIDv7 이전 로그에만 있으므로 legacy_ids는 더 늘어나지 않음)
+        """
+        refs = [
+            ref
+            for page in db_client.iter_log_refs(function_id)
+            for ref in page
+            if ref["timestamp"] < cutoff
+        ]
+        if not refs:
+            return
+        for ref in refs:
+            log_id = ref["SK"][len("LOGID#"):]
+            for segment in manifest["segments"]:
+                if segment["start"] <= ref["timestamp"] <= segment["end"]:
+                    legacy_ids = segment.setdefault("legacy_ids", [])
+                    if log_id not in legacy_ids:
+                        legacy_ids.append(log_id)
+                    break
+        # manifest 저장 후 삭제 (중간에 실패하면 다음 실행에서 다시 옮김)
+        self._save_manifest(function_id, manifest)
+        db_client.delete_logs(refs)
+
+    def _write_segment(
+        self,
+        function_id: str,
+        day: str,
+        items: List[Dict[str, Any]],
+        manifest: Dict[str, Any],
+        report: ArchiveReport,
+    ):
+        data = b"".join(parquet_chunks(items, "zstd"))
+        key = f"{LOG_ARCHIVE_ROOT}{function_id}/{day}/{items[0]['id']}.parquet"
+        s3_client.put_bytes(key, data)
+        manifest["segments"] = [
+            segment for segment in manifest["segments"] if segment["key"] != key
+        ] + [
+            {
+                "key": key,
+                "day": day,
+                "start": items[0]["timestamp"],
+                "end": items[-1]["timestamp"],
+                "count": len(items),
+                "bytes": len(data),
+            }
+        ]
+        self._save_manifest(function_id, manifest)
+        db_client.delete_logs(items)
+
+        report.segments_written += 1
+        report.items_archived += len(items)
+        report.bytes_written += len(data)
+
+    # ===== 삭제 =====
+    def delete_function_archive(self, function_id: str) -> int:
+        """함수의 세그먼트와 manifest 삭제 (함수 삭제 시, 삭제한 바이트 수 반환)"""
+        reclaimed = s3_client.delete_prefix(f"{LOG_ARCHIVE_ROOT}{function_id}/")
+        self.manifest_cache.pop(manifest_key(function_id))
+        return reclaimed
+
+
+async def run_log_archive_loop():
+    """주기적으로 아카이브 실행 (앱 lifespan에서 백그라운드 태스크로 구동)"""
+    while True:
+        try:
+            await asyncio.to_thread(log_archive.run_once)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Log archive error: %s", e)
+        await asyncio.sleep(settings.log_archive_interval_seconds)
+
+
+# 전역 아카이브 인스턴스
+log_archive = LogArchive()
@@ -0,0 +1,231 @@
+"""실행 로그(LOG#) 내보내기
+
+DynamoDB 페이지를 읽는 대로 NDJSON 또는 Parquet으로 변환해 청크 단위로 내보낸다.
+메모리 사용량은 전체 데이터 크기와 무관하게 DynamoDB 페이지 / Parquet row group 하나 수준이다.
+
+- NDJSON: 한 줄에 실행 로그 하나, 선택적으로 gzip 스트림 압축
+- Parquet: row group 단위로 기록하고 기록된 바이트를 바로 내보냄 (컬럼 압축 snappy/gzip/zstd)
+- 워크스페이스 내보내기는 함수별 페이지 스트림을 SK(타임스탬프)로 k-way merge 해 시간순 유지
+"""
+import heapq
+import json
+import zlib
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from app.config import settings
+from app.database import db_client
+from app.utils.timezone import to_kst
+
+# 형식별 허용 압축 (첫 번째가 기본값)
+EXPORT_COMPRESSIONS = {
+    "ndjson": ("none", "gzip"),
+    "parquet": ("snappy", "zstd", "gzip", "none"),
+}
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "parquet": "application/vnd.apache.parquet"}
+
+EXPORT_FIELDS = (
+    "id",
+    "functionId",
+    "timestamp",
+    "status",
+    "duration",
+    "statusCode",
+    "level",
+    "requestBody",
+    "responseBody",
+    "logs",
+    "startedAt",
+    "endedAt",
+)
+
+
+def export_time(value: Optional[str], field: str) -> Optional[str]:
+    """RFC3339 문자열 → SK 비교용 KST ISO 타임스탬프. 형식이 틀리면 ValueError(field 포함)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid {field}: {value} (RFC3339)")
+    return to_kst(parsed).isoformat()
+
+
+def _plain(value: Any) -> Any:
+    """DynamoDB Decimal → int/float (중첩 구조 포함)"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    return value
+
+
+def export_record(item: Dict[str, Any]) -> Dict[str, Any]:
+    """LOG# 항목 → 내보내기 레코드 (ExecutionLog 필드)"""
+    record = {field: _plain(item.get(field)) for field in EXPORT_FIELDS}
+    record["logs"] = record["logs"] or []
+    record["level"] = record["level"] or "info"
+    return record
+
+
+# (function_id, start, end) → 시간순 LOG# 항목
+ItemSource = Callable[[str, Optional[str], Optional[str]], Iterator[Dict[str, Any]]]
+
+
+def iter_function_items(
+    function_id: str, start: Optional[str], end: Optional[str]
+) -> Iterator[Dict[str, Any]]:
+    for page in db_client.iter_logs(
+        function_id, start, end, page_size=settings.log_export_page_size
+    ):
+        yield from page
+
+
+def iter_workspace_items(
+    function_ids: List[str],
+    start: Optional[str],
+    end: Optional[str],
+    iter_items: ItemSource = iter_function_items,
+) -> Iterator[Dict[str, Any]]:
+    """여러 함수의 로그를 SK(LOG#{timestamp}#{id}) 순서로 병합. 함수당 페이지 하나만 메모리에 둠"""
+    return heapq.merge(
+        *(iter_items(function_id, start, end) for function_id in function_ids),
+        key=lambda item: item["SK"],
+    )
+
+
+def ndjson_chunks(items: Iterable[Dict[str, Any]], compression: str) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31) if compression == "gzip" else None  # 31: gzip 헤더
+    batch: List[str] = []
+
+    def flush() -> bytes:
+        data = "".join(batch).encode("utf-8")
+        batch.clear()
+        return compressor.compress(data) if compressor else data
+
+    for item in items:
+        batch.append(json.dumps(export_record(item), ensure_ascii=False) + "\n")
+        if len(batch) >= settings.log_export_page_size:
+            chunk = flush()
+            if chunk:
+                yield chunk
+    chunk = flush()
+    if compressor:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
+
+
+class _DrainableSink:
+    """ParquetWriter 출력. 기록된 바이트를 drain()으로 꺼내 보내되 tell()은 누적 위치를 유지"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _json_text(value: Any) -> Optional[str]:
+    return None if value is None else json.dumps(value, ensure_ascii=False)
+
+
+def parquet_chunks(items: Iterable[Dict[str, Any]], compression: str) -> Iterator[bytes]:
+    # pyarrow는 Parquet 내보내기에서만 사용 (응답 시작 전에 parquet_available()로 확인)
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    timestamp_type = pa.timestamp("us", tz="Asia/Seoul")
+    schema = pa.schema(
+        [
+            ("id", pa.string()),
+            ("functionId", pa.string()),
+            ("timestamp", timestamp_type),
+            ("status", pa.string()),
+            ("duration", pa.float64()),
+            ("statusCode", pa.int32()),
+            ("level", pa.string()),
+            ("requestBody", pa.string()),  # JSON 문자열
+            ("responseBody", pa.string()),  # JSON 문자열
+            ("logs", pa.list_(pa.string())),
+            ("startedAt", timestamp_type),
+            ("endedAt", timestamp_type),
+        ]
+    )
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression=compression)
+    columns: Dict[str, List[Any]] = {name: [] for name in schema.names}
+
+    def write_row_group():
+        writer.write_table(pa.table(columns, schema=schema))
+        for values in columns.values():
+            values.clear()
+
+    try:
+        for item in items:
+            record = export_record(item)
+            for name in ("timestamp", "startedAt", "endedAt"):
+                record[name] = _timestamp(record[name])
+            for name in ("requestBody", "responseBody"):
+                record[name] = _json_text(record[name])
+            for name, values in columns.items():
+                values.append(record[name])
+            if len(columns["id"]) >= settings.log_export_row_group_size:
+                write_row_group()
+                yield sink.drain()
+        if columns["id"]:
+            write_row_group()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_chunks(
+    items: Iterable[Dict[str, Any]], export_format: str, compression: str
+) -> Iterator[bytes]:
+    if export_format == "parquet":
+        return parquet_chunks(items, compression)
+    return ndjson_chunks(items, compression)
+
+
+def export_filename(name: str, export_format: str, compression: str) -> str:
+    if export_format == "parquet":
+        return f"{name}-logs.parquet"
+    return f"{name}-logs.ndjson" + (".gz" if compression == "gzip" else "")
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
@@ -0,0 +1,400 @@
+"""실행 로그 검색 (워크스페이스 단위 in-memory 역색인)
+
+requestBody/responseBody의 키와 값, 상태 코드, 레벨을 토큰으로 나눠 역색인(토큰 → {문서: 빈도})을 만든다.
+색인 대상은 최근 log_search_window_days 일의 로그이며 워크스페이스당 log_search_max_documents 건을
+넘으면 오래된 문서부터 뺀다. 워크스페이스의 첫 검색은 이 구간의 LOG# 항목을 모두 읽는 cold read이고,
+이후에는 함수별 마지막 타임스탬프 - (함수 timeout + log_search_refresh_overlap_seconds) 이후의 로그만
+SK 범위 조회로 읽어 추가한다 (로그 타임스탬프는 호출 시작 시각이라 최대 timeout만큼 늦게 쓰임.
+다른 레플리카가 쓴 로그, 늦게 커밋된 이전 타임스탬프의 로그 포함. 겹치는 구간은 id로 중복 제거).
+
+- 검색어의 모든 토큰을 포함하는 문서만 매칭(AND), BM25 점수 → 최신순으로 정렬
+- `code:500`, `level:error`, `status:success` 처럼 필드를 지정할 수 있음
+- 색인에는 키와 메타데이터만 두고, 결과 페이지의 본문은 BatchGetItem으로 읽음
+- DynamoDB 조회는 색인 lock 밖에서 하고, 갱신 중에도 다른 검색은 현재 색인으로 응답
+- 다음 페이지 cursor는 (점수, 타임스탬프, id) 위치와 첫 페이지 시점의 색인 상태(문서 범위, BM25 통계)를 담아
+  페이지 사이에 로그가 추가돼도 중복/누락이 없음. 다른 레플리카(또는 다시 만든 색인)가 받은 cursor도
+  같은 BM25 통계와 타임스탬프 상한으로 점수를 매기지만, 그 색인에 없는 문서(한도로 빠졌거나 아직
+  반영되지 않은 로그)는 결과에서 빠질 수 있다
+"""
+import base64
+import heapq
+import json
+import math
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from app.config import settings
+from app.database import db_client
+from app.services.log_archive import archive_cutoff
+from app.utils.timezone import now_kst
+
+# 정렬 위치 (점수, 타임스탬프, 로그 id) — 모두 내림차순
+RankKey = Tuple[float, str, str]
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+MAX_TOKEN_LENGTH = 64
+
+_TOKEN = re.compile(r"\w+")
+# 필드 지정 검색어 (code:500, level:error, status:success)
+_FIELD_TERM = re.compile(r"^(code|level|status):(\S+)$", re.IGNORECASE)
+
+
+class LogSearchError(ValueError):
+    """검색어/cursor 오류 (field: 잘못된 파라미터)"""
+
+    def __init__(self, field: str, message: str):
+        super().__init__(message)
+        self.field = field
+
+
+def _text_tokens(text: str) -> Iterator[str]:
+    for token in _TOKEN.findall(text.lower()):
+        if len(token) <= MAX_TOKEN_LENGTH:
+            yield token
+
+
+def _value_tokens(value: Any) -> Iterator[str]:
+    """JSON 본문의 키와 값 토큰 (중첩 구조 포함)"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _text_tokens(str(key))
+            yield from _value_tokens(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _value_tokens(item)
+    elif isinstance(value, bool):
+        yield "true" if value else "false"
+    elif isinstance(value, Decimal):
+        yield from _text_tokens(str(int(value) if value == value.to_integral_value() else value))
+    elif value is not None:
+        yield from _text_tokens(str(value))
+
+
+def document_tokens(item: Dict[str, Any]) -> List[str]:
+    """LOG# 항목 → 색인 토큰 (필드 토큰 + 본문 토큰, 중복 포함)"""
+    status_code = str(item.get("statusCode", ""))
+    level = str(item.get("level") or "info").lower()
+    tokens = [
+        f"code:{status_code}",
+        f"level:{level}",
+        f"status:{str(item.get('status', '')).lower()}",
+        status_code,
+        level,
+    ]
+    tokens.extend(_value_tokens(item.get("requestBody")))
+    tokens.extend(_value_tokens(item.get("responseBody")))
+    return tokens
+
+
+def query_terms(q: str) -> List[str]:
+    """검색어 → 색인 토큰 목록 (중복 제거, 순서 유지)"""
+    terms: List[str] = []
+    for word in q.split():
+        field = _FIELD_TERM.match(word)
+        if field:
+            tokens = [f"{field.group(1).lower()}:{field.group(2).lower()}"]
+        else:
+            tokens = list(_text_tokens(word))
+        for token in tokens:
+            if token not in terms:
+                terms.append(token)
+    if not terms:
+        raise LogSearchError("q", "Search query has no searchable terms")
+    return terms
+
+
+@dataclass
+class Snapshot:
+    """
+    첫 페이지 시점의 색인 상태. 이후 페이지는 이 시점까지의 문서만, 같은 BM25 통계로 점수를 매겨
+    그 사이 로그가 추가/제거돼도 순서가 유지된다.
+    """
+
+    generation: str  # 색인 인스턴스 (다른 레플리카/다시 만든 색인이면 문서 번호가 달라짐)
+    max_doc: int  # 같은 색인일 때만 사용
+    max_timestamp: str  # 어느 색인에서나 사용하는 문서 범위
+    total_docs: int
+    average_length: float
+    df: List[int]
+
+
+def encode_cursor(key: RankKey, snapshot: Snapshot) -> str:
+    raw = json.dumps({"after": list(key), "snapshot": asdict(snapshot)})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[Optional[RankKey], Optional[Snapshot]]:
+    if not cursor:
+        return None, None
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        score, timestamp, log_id = data["after"]
+        snapshot = Snapshot(**data["snapshot"])
+        return (float(score), str(timestamp), str(log_id)), snapshot
+    except (ValueError, KeyError, TypeError):
+        raise LogSearchError("cursor", "Invalid cursor")
+
+
+def window_start() -> str:
+    """색인 대상 시작 시각 (검색 구간과 아카이브 기준 중 늦은 쪽)"""
+    start = (now_kst() - timedelta(days=settings.log_search_window_days)).isoformat()
+    if settings.log_archive_enabled:
+        start = max(start, archive_cutoff())
+    return start
+
+
+@dataclass
+class _Document:
+    log_id: str
+    function_id: str
+    sk: str
+    timestamp: str
+    length: int
+    terms: Tuple[str, ...]  # 문서 삭제 시 posting 정리용 (중복 없는 토큰)
+
+
+class WorkspaceIndex:
+    """워크스페이스 하나의 역색인. 메모리 구조는 lock 안에서만 갱신/조회, DynamoDB 조회는 refresh_lock"""
+
+    def __init__(self, workspace_id: str):
+        self.workspace_id = workspace_id
+        self.lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+        self.generation = uuid.uuid4().hex[:8]
+        self.docs: Dict[int, _Document] = {}
+        self.ids: Dict[str, int] = {}  # 로그 id → 문서 번호
+        self.postings: Dict[str, Dict[int, int]] = {}  # 토큰 → {문서 번호: 빈도}
+        self.function_docs: Dict[str, Set[int]] = {}
+        # 함수별 색인한 마지막 타임스탬프 (다음 갱신은 여기서부터, 같은 타임스탬프는 id로 중복 제거)
+        self.watermarks: Dict[str, str] = {}
+        self.expiry: List[Tuple[str, int]] = []  # (타임스탬프, 문서 번호) min-heap
+        self.total_length = 0
+        self.next_doc = 0
+        self.max_timestamp = ""
+        self.refreshed_at: Optional[float] = None
+
+    # ===== 갱신 =====
+    def add(self, item: Dict[str, Any]):
+        if item["id"] in self.ids:
+            return
+        tokens = document_tokens(item)
+        frequencies: Dict[str, int] = {}
+        for token in tokens:
+            frequencies[token] = frequencies.get(token, 0) + 1
+
+        doc_no = self.next_doc
+        self.next_doc += 1
+        self.docs[doc_no] = _Document(
+            log_id=item["id"],
+            function_id=item["functionId"],
+            sk=item["SK"],
+            timestamp=item["timestamp"],
+            length=len(tokens),
+            terms=tuple(frequencies),
+        )
+        self.ids[item["id"]] = doc_no
+        self.function_docs.setdefault(item["functionId"], set()).add(doc_no)
+        for token, count in frequencies.items():
+            self.postings.setdefault(token, {})[doc_no] = count
+        heapq.heappush(self.expiry, (item["timestamp"], doc_no))
+        self.total_length += len(tokens)
+        self.max_timestamp = max(self.max_timestamp, item["timestamp"])
+
+    def remove(self, doc_no: int):
+        doc = self.docs.pop(doc_no, None)
+        if doc is None:
+            return
+        self.ids.pop(doc.log_id, None)
+        self.function_docs.get(doc.function_id, set()).discard(doc_no)
+        for token in doc.terms:
+            posting = self.postings.get(token)
+            if posting is not None:
+                posting.pop(doc_no, None)
+                if not posting:
+                    del self.postings[token]
+        self.total_length -= doc.length
+
+    def _prune(self, start: str):
+        """구간 밖 문서와 문서 수 한도를 넘는 오래된 문서 제거 (lock 안에서 호출)"""
+        while self.expiry and (
+            self.expiry[0][0] < start or len(self.docs) > settings.log_search_max_documents
+        ):
+            self.remove(heapq.heappop(self.expiry)[1])
+
+    def refresh_if_stale(self):
+        """
+        refresh 주기가 지났으면 새 로그 반영.
+        아직 색인이 없으면 만들어질 때까지 기다리고, 있으면 다른 스레드가 갱신 중일 때 현재 색인을 그대로 사용한다.
+        """
+        def stale() -> bool:
+            return (
+                self.refreshed_at is None
+                or time.monotonic() - self.refreshed_at >= settings.log_search_refresh_seconds
+            )
+
+        if not stale() or not self.refresh_lock.acquire(blocking=self.refreshed_at is None):
+            return
+        try:
+            if stale():
+                self._refresh()
+        finally:
+            self.refresh_lock.release()
+
+    def _refresh(self):
+        """새로 쓰인 로그 추가, 삭제된 함수/구간 밖 로그 정리 (DynamoDB 조회는 lock 밖에서)"""
+        # 함수 id → 호출 timeout (초)
+        timeouts = {
+            function["id"]: float(function.get("timeout", 60) or 60)
+            for function in db_client.list_functions(self.workspace_id)
+        }
+        function_ids = set(timeouts)
+        start = window_start()
+        with self.lock:
+            for function_id in set(self.function_docs) - function_ids:
+                for doc_no in list(self.function_docs.pop(function_id)):
+                    self.remove(doc_no)
+                self.watermarks.pop(function_id, None)
+            watermarks = dict(self.watermarks)
+
+        for function_id in function_ids:
+            since = start
+            if function_id in watermarks:
+                # 호출 중이던 로그(타임스탬프 = 시작 시각)와 다른 레플리카에서 늦게 커밋된 로그를 잡도록 겹쳐 읽음
+                overlap = timedelta(
+                    seconds=timeouts[function_id] + settings.log_search_refresh_overlap_seconds
+                )
+                since = max(
+                    (datetime.fromisoformat(watermarks[function_id]) - overlap).isoformat(), start
+                )
+            for page in db_client.iter_logs(
+                function_id, since, None, page_size=settings.log_export_page_size
+            ):
+                # 페이지마다 lock을 잡았다 놓아 그 사이 검색이 기다리지 않게 함
+                with self.lock:
+                    for item in page:
+                        self.add(item)
+                    self.watermarks[function_id] = max(
+                        self.watermarks.get(function_id, ""), page[-1]["timestamp"]
+                    )
+                    self._prune(start)
+
+        with self.lock:
+            self._prune(start)
+        self.refreshed_at = time.monotonic()
+
+    # ===== 조회 =====
+    def search(
+        self, terms: List[str], function_id: Optional[str], snapshot: Optional[Snapshot] = None
+    ) -> Tuple[List[Tuple[RankKey, int]], Snapshot]:
+        """
+        모든 토큰을 포함하는 문서를 (정렬 위치, 문서 번호)로 점수 → 최신순 정렬 (lock 안에서 호출).
+        snapshot이 있으면 그 시점의 문서 범위와 BM25 통계로 계산한다 (문서 번호 범위는 같은 색인일 때만).
+        """
+        postings = [self.postings.get(term, {}) for term in terms]
+        if snapshot is None:
+            total_docs = len(self.docs)
+            snapshot = Snapshot(
+                generation=self.generation,
+                max_doc=self.next_doc,
+                max_timestamp=self.max_timestamp,
+                total_docs=total_docs,
+                average_length=self.total_length / total_docs if total_docs else 1.0,
+                df=[len(posting) for posting in postings],
+            )
+        if not all(postings):
+            return [], snapshot
+        # 가장 짧은 posting부터 교집합
+        ordered = sorted(postings, key=len)
+        max_doc = snapshot.max_doc if snapshot.generation == self.generation else self.next_doc
+        candidates = {
+            doc_no
+            for doc_no in ordered[0]
+            if doc_no < max_doc and self.docs[doc_no].timestamp <= snapshot.max_timestamp
+        }
+        for posting in ordered[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return [], snapshot
+        if function_id:
+            candidates &= self.function_docs.get(function_id, set())
+
+        idf = [
+            math.log(1 + (snapshot.total_docs - df + 0.5) / (df + 0.5)) for df in snapshot.df
+        ]
+        scored = []
+        for doc_no in candidates:
+            doc = self.docs[doc_no]
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * doc.length / snapshot.average_length)
+            score = sum(
+                weight * posting[doc_no] * (BM25_K1 + 1) / (posting[doc_no] + norm)
+                for weight, posting in zip(idf, postings)
+            )
+            scored.append(((score, doc.timestamp, doc.log_id), doc_no))
+        scored.sort(reverse=True)
+        return scored, snapshot
+
+
+class LogSearch:
+    """워크스페이스별 색인 관리 (최근 사용한 워크스페이스만 메모리에 유지)"""
+
+    def __init__(self):
+        self._indexes: "OrderedDict[str, WorkspaceIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _index(self, workspace_id: str) -> WorkspaceIndex:
+        with self._lock:
+            index = self._indexes.get(workspace_id)
+            if index is None:
+                index = self._indexes[workspace_id] = WorkspaceIndex(workspace_id)
+            self._indexes.move_to_end(workspace_id)
+            while len(self._indexes) > settings.log_search_max_workspaces:
+                self._indexes.popitem(last=False)
+            return index
+
+    def search(
+        self,
+        workspace_id: str,
+        q: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        function_id: Optional[str] = None,
+    ) -> Tuple[List[Tuple[float, Dict[str, Any]]], int, Optional[str]]:
+        """
+        (점수, LOG# 항목) 목록, 전체 매칭 수, 다음 cursor 반환 (블로킹, 스레드에서 실행).
+        색인이 refresh 주기보다 오래됐으면 새 로그를 먼저 반영한다 (워크스페이스 첫 검색은 구간 전체 cold read).
+        """
+        terms = query_terms(q)
+        after, snapshot = decode_cursor(cursor)
+        if snapshot is not None and len(snapshot.df) != len(terms):
+            raise LogSearchError("cursor", "Cursor does not match the query")
+        index = self._index(workspace_id)
+        index.refresh_if_stale()
+        with index.lock:
+            ranked, snapshot = index.search(terms, function_id, snapshot)
+            remaining = [entry for entry in ranked if after is None or entry[0] < after]
+            page = [(key, index.docs[doc_no]) for key, doc_no in remaining[:limit]]
+
+        found = db_client.batch_get_logs([(doc.function_id, doc.sk) for _, doc in page])
+        # 색인 이후 삭제/아카이브된 로그는 결과와 색인에서 뺌
+        missing = [doc for _, doc in page if doc.sk not in found]
+        if missing:
+            with index.lock:
+                for doc in missing:
+                    if doc.log_id in index.ids:
+                        index.remove(index.ids[doc.log_id])
+        hits = [(key[0], found[doc.sk]) for key, doc in page if doc.sk in found]
+        next_cursor = encode_cursor(page[-1][0], snapshot) if len(remaining) > limit else None
+        return hits, len(ranked), next_cursor
+
+
+# 전역 검색 인스턴스
+log_search = LogSearch()
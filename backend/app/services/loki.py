@@ -0,0 +1,361 @@
+"""Loki 로그 조회
+
+- start/end 시간 범위와 이어보기 cursor
+- level/부분 문자열/정규식 필터를 LogQL line filter로 변환해 Loki에서 거름
+- 스트림별로 정렬된 결과를 heap 기반 k-way merge로 나노초 타임스탬프 순서로 합침
+- 조회 범위를 정렬된 구간으로 나눠 닫힌 구간 결과는 캐시하고 열린 구간만 Loki에서 조회
+"""
+import asyncio
+import base64
+import heapq
+import json
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+from app.utils.cache import ByteBudgetCache, RequestCoalescer
+from app.utils.http import get_http_client
+from app.utils.jsonstream import descend_result_values, iter_json
+
+NS_PER_SECOND = 1_000_000_000
+DEFAULT_LOOKBACK_NS = 3600 * NS_PER_SECOND
+DIRECTIONS = ("backward", "forward")
+# 로그 라인 하나의 대략적인 부가 메모리 크기 (캐시 예산 계산용)
+ENTRY_OVERHEAD_BYTES = 120
+
+# 로그 레벨 → 라인에서 찾을 단어
+LEVEL_PATTERNS = {
+    "debug": "debug",
+    "info": "info",
+    "warn": "warn(?:ing)?",
+    "warning": "warn(?:ing)?",
+    "error": "error|err",
+    "fatal": "fatal|critical|panic",
+}
+
+
+class LokiQueryError(ValueError):
+    """잘못된 조회 파라미터 (field: 문제가 된 파라미터)"""
+
+    def __init__(self, field: str, message: str):
+        super().__init__(message)
+        self.field = field
+        self.message = message
+
+
+@dataclass
+class LogCursor:
+    """
+    이어보기 위치. 마지막으로 반환한 타임스탬프와 그 타임스탬프에서 이미 반환한 라인 수.
+    같은 나노초에 여러 라인이 있어도 페이지 경계에서 빠지거나 중복되지 않는다.
+    """
+
+    timestamp_ns: int
+    skip: int
+    direction: str
+
+    def encode(self) -> str:
+        raw = json.dumps({"ts": str(self.timestamp_ns), "skip": self.skip, "dir": self.direction})
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "LogCursor":
+        try:
+            padded = value + "=" * (-len(value) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            cursor = cls(int(data["ts"]), int(data["skip"]), data["dir"])
+        except (ValueError, KeyError, TypeError):
+            raise LokiQueryError("cursor", "Invalid cursor")
+        if cursor.direction not in DIRECTIONS or cursor.skip < 0:
+            raise LokiQueryError("cursor", "Invalid cursor")
+        return cursor
+
+
+def parse_time_ns(value: Optional[str], field: str) -> Optional[int]:
+    """RFC3339, 유닉스 초(소수 허용) 또는 나노초 → 나노초"""
+    if value is None or value == "":
+        return None
+    value = value.strip()
+    try:
+        if re.fullmatch(r"\d{19}", value):
+            return int(value)
+        if re.fullmatch(r"\d+(\.\d+)?", value):
+            return int(float(value) * NS_PER_SECOND)
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise LokiQueryError(field, f"Invalid {field}: {value} (RFC3339, unix seconds or ns)")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp()) * NS_PER_SECOND + parsed.microsecond * 1000
+
+
+def _logql_string(value: str) -> str:
+    """LogQL 큰따옴표 문자열 리터럴"""
+    return json.dumps(value)
+
+
+def build_logql(
+    function_id: str,
+    levels: Optional[List[str]] = None,
+    contains: Optional[str] = None,
+    regex: Optional[str] = None,
+) -> str:
+    """
+    function_id 스트림 셀렉터 + line filter.
+    필터는 모두 Loki에서 적용되므로 limit 만큼의 결과가 모두 조건을 만족한다.
+    """
+    query = f"{{function_id={_logql_string(function_id)}}}"
+    if levels:
+        unknown = [level for level in levels if level not in LEVEL_PATTERNS]
+        if unknown:
+            raise LokiQueryError(
+                "level",
+                f"Unknown level: {', '.join(unknown)} (one of {', '.join(LEVEL_PATTERNS)})",
+            )
+        words = "|".join(dict.fromkeys(LEVEL_PATTERNS[level] for level in levels))
+        level_pattern = r"(?i)\b(" + words + r")\b"
+        query += f" |~ {_logql_string(level_pattern)}"
+    if contains:
+        query += f" |= {_logql_string(contains)}"
+    if regex:
+        try:
+            re.compile(regex)
+        except re.error as e:
+            raise LokiQueryError("regex", f"Invalid regex: {e}")
+        query += f" |~ {_logql_string(regex)}"
+    return query
+
+
+def merge_streams(streams: List[Dict[str, Any]], direction: str) -> Iterator[Dict[str, Any]]:
+    """
+    스트림별 values를 타임스탬프 순서로 k-way merge.
+    같은 타임스탬프는 (스트림 라벨, 라인) 순서로 고정해 cursor의 skip이 항상 같은 라인을 가리키게 한다.
+    """
+    reverse = direction == "backward"
+    iterables = []
+    for stream in streams:
+        labels = stream.get("stream") or {}
+        label_key = json.dumps(labels, sort_keys=True)
+        entries = [
+            (int(value[0]), label_key, value[1], labels)
+            for value in stream.get("values") or []
+            if len(value) >= 2
+        ]
+        # Loki는 스트림 안에서 이미 정렬해 주므로 거의 정렬된 입력 (timsort O(n))
+        entries.sort(key=lambda entry: entry[:3], reverse=reverse)
+        iterables.append(entries)
+
+    for timestamp_ns, _, line, labels in heapq.merge(
+        *iterables, key=lambda entry: entry[:3], reverse=reverse
+    ):
+        yield {"timestamp": str(timestamp_ns), "line": line, "labels": labels}
+
+
+def _entries_size(entries: List[Dict[str, Any]]) -> int:
+    # 라벨 dict는 스트림 단위로 공유되므로 라인/타임스탬프 + 고정 오버헤드만 계산
+    return sum(len(entry["line"]) + len(entry["timestamp"]) + ENTRY_OVERHEAD_BYTES for entry in entries)
+
+
+def _cache_size(value: Tuple[List[Dict[str, Any]], bool, int]) -> int:
+    return _entries_size(value[0])
+
+
+class LokiClient:
+    """
+    Loki query_range 호출 (구간 분할 + 닫힌 구간 캐시 + 요청 합치기)
+
+    조회 범위를 loki_split_interval_seconds 단위로 정렬된 구간으로 나누고, 방향 순서대로
+    필요한 라인 수를 채울 때까지 구간을 조회한다. 끝난 지 loki_cache_freshness_seconds 가
+    지난 구간은 더 이상 바뀌지 않으므로 결과를 바이트 예산 캐시에 저장하고,
+    아직 열려 있는(최근) 구간만 매번 Loki에서 조회한다.
+    """
+
+    def __init__(self, cache_max_bytes: Optional[int] = None):
+        self.interval_cache = ByteBudgetCache(
+            settings.loki_cache_max_bytes if cache_max_bytes is None else cache_max_bytes,
+            sizeof=_cache_size,
+        )
+        self._coalescer = RequestCoalescer()
+
+    def _client(self) -> httpx.AsyncClient:
+        return get_http_client("loki", timeout=settings.loki_timeout_seconds)
+
+    async def _fetch(
+        self, query: str, start_ns: int, end_ns: int, direction: str, limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        query_range 응답을 받는 대로 파싱 (본문 전체/중간 dict를 만들지 않음).
+        스트림 병합은 모든 스트림이 필요하므로 결과 라인(최대 limit개)만 메모리에 남는다.
+        """
+        async with self._client().stream(
+            "GET",
+            f"{settings.loki_service_url}/loki/api/v1/query_range",
+            params={
+                "query": query,
+                "start": str(start_ns),
+                "end": str(end_ns),
+                "limit": limit,
+                "direction": direction,
+            },
+        ) as response:
+            if response.is_error:
+                await response.aread()
+            response.raise_for_status()
+
+            status, error = None, None
+            streams: Dict[int, Dict[str, Any]] = {}
+            async for path, value in iter_json(response, descend_result_values):
+                if path == ("status",):
+                    status = value
+                elif path == ("error",):
+                    error = value
+                elif len(path) == 5:
+                    streams.setdefault(path[2], {"stream": {}, "values": []})["values"].append(value)
+                elif len(path) == 4 and path[3] == "stream":
+                    streams.setdefault(path[2], {"stream": {}, "values": []})["stream"] = value
+
+        if status != "success":
+            raise httpx.HTTPError(f"Loki query failed: {error or status}")
+        return list(merge_streams(list(streams.values()), direction))
+
+    def _cached(
+        self, query: str, interval_start: int, direction: str, need: int, complete_only: bool
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        캐시된 구간 결과. 구간의 모든 라인을 담은(complete) 항목은 반대 방향 요청에도 사용하고,
+        limit에 잘린 항목은 같은 방향으로 그 이하를 요청할 때만 사용한다.
+        """
+        for cached_direction in (direction, "forward" if direction == "backward" else "backward"):
+            cached = self.interval_cache.get((query, interval_start, cached_direction))
+            if cached is None:
+                continue
+            entries, complete, cached_limit = cached[0]
+            if complete:
+                return entries if cached_direction == direction else entries[::-1]
+            if cached_direction == direction and not complete_only and cached_limit >= need:
+                return entries
+        return None
+
+    async def _interval_entries(
+        self, query: str, start_ns: int, end_ns: int, direction: str, need: int, now_ns: int
+    ) -> List[Dict[str, Any]]:
+        interval_ns = settings.loki_split_interval_seconds * NS_PER_SECOND
+        interval_start = start_ns - start_ns % interval_ns
+        full = start_ns == interval_start and end_ns == interval_start + interval_ns
+        closed = interval_start + interval_ns <= now_ns - settings.loki_cache_freshness_seconds * NS_PER_SECOND
+
+        if closed:
+            cached = self._cached(query, interval_start, direction, need, complete_only=not full)
+            if cached is not None:
+                if full:
+                    return cached[:need]
+                # 경계 구간은 전체 라인이 캐시된 경우에만 범위로 잘라 사용
+                return [
+                    entry for entry in cached if start_ns <= int(entry["timestamp"]) < end_ns
+                ][:need]
+
+        entries = await self._coalescer.run(
+            ("range", query, start_ns, end_ns, direction, need),
+            lambda: self._fetch(query, start_ns, end_ns, direction, need),
+        )
+        if closed and full:
+            self.interval_cache.put(
+                (query, interval_start, direction), (entries, len(entries) < need, need)
+            )
+        return entries
+
+    def split(self, start_ns: int, end_ns: int, direction: str) -> List[Tuple[int, int]]:
+        """[start, end)를 정렬된 구간으로 분할 (direction 순서)"""
+        interval_ns = settings.loki_split_interval_seconds * NS_PER_SECOND
+        intervals = []
+        cursor = start_ns
+        while cursor < end_ns:
+            boundary = min(end_ns, cursor - cursor % interval_ns + interval_ns)
+            intervals.append((cursor, boundary))
+            cursor = boundary
+        return intervals[::-1] if direction == "backward" else intervals
+
+    async def query_range(
+        self, query: str, start_ns: int, end_ns: int, direction: str, limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Loki query_range와 같은 결과(방향 순서, 최대 limit개)를 구간 단위로 조회.
+        캐시에 없는 구간은 loki_split_parallelism 개씩 동시에 조회하고, limit을 채우면 멈춘다.
+        """
+        now_ns = time.time_ns()
+        intervals = self.split(start_ns, end_ns, direction)
+        collected: List[Dict[str, Any]] = []
+        parallelism = max(1, settings.loki_split_parallelism)
+        index = 0
+        while index < len(intervals) and len(collected) < limit:
+            batch = intervals[index:index + parallelism]
+            need = limit - len(collected)
+            results = await asyncio.gather(
+                *(
+                    self._interval_entries(query, s, e, direction, need, now_ns)
+                    for s, e in batch
+                )
+            )
+            for entries in results:
+                collected.extend(entries)
+            index += len(batch)
+        return collected[:limit]
+
+    async def query_logs(
+        self,
+        function_id: str,
+        limit: int,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None,
+        direction: str = "backward",
+        cursor: Optional[LogCursor] = None,
+        query: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[LogCursor], str]:
+        """
+        로그 조회. (타임스탬프순 로그, 다음 페이지 cursor, 사용한 LogQL) 반환.
+        Loki의 범위는 [start, end) 이며, cursor가 있으면 그 위치부터 이어서 조회한다.
+        """
+        if direction not in DIRECTIONS:
+            raise LokiQueryError("direction", "direction must be backward or forward")
+        end_ns = end_ns or time.time_ns()
+        start_ns = start_ns or end_ns - DEFAULT_LOOKBACK_NS
+        skip = 0
+        if cursor is not None:
+            if cursor.direction != direction:
+                raise LokiQueryError("cursor", "cursor direction does not match")
+            skip = cursor.skip
+            # 같은 타임스탬프의 남은 라인을 포함하도록 경계를 타임스탬프 자체로 둠
+            if direction == "backward":
+                end_ns = min(end_ns, cursor.timestamp_ns + 1)
+            else:
+                start_ns = max(start_ns, cursor.timestamp_ns)
+        if start_ns >= end_ns:
+            raise LokiQueryError("start", "start must be before end")
+        if end_ns - start_ns > settings.loki_max_query_range_seconds * NS_PER_SECOND:
+            raise LokiQueryError(
+                "start",
+                f"Query range must not exceed {settings.loki_max_query_range_seconds}s",
+            )
+
+        query = query or build_logql(function_id)
+        merged = await self.query_range(query, start_ns, end_ns, direction, limit + skip)
+        entries = merged[skip:skip + limit]
+
+        next_cursor = None
+        # limit을 꽉 채웠다면 범위 안에 더 남았을 수 있음
+        if entries and len(merged) >= limit + skip:
+            last_ns = int(entries[-1]["timestamp"])
+            same_timestamp = sum(1 for entry in entries if int(entry["timestamp"]) == last_ns)
+            if cursor is not None and last_ns == cursor.timestamp_ns:
+                same_timestamp += skip
+            next_cursor = LogCursor(last_ns, same_timestamp, direction)
+        return entries, next_cursor, query
+
+
+# 전역 Loki 클라이언트 인스턴스
+loki_client = LokiClient()
@@ -0,0 +1,231 @@
+"""Loki 실시간 로그 tail 허브
+
+브라우저 수와 무관하게 레플리카당 함수 하나에 Loki `/loki/api/v1/tail` WebSocket 하나만 열고,
+받은 로그를 로컬 구독자(SSE/WebSocket)에게 fan-out 한다.
+
+- 속도 제한: 함수(업스트림)별 token bucket으로 초당 전달 라인 수를 제한하고 초과분은 버림
+- backpressure: 구독자별 버퍼가 가득 차면 오래된 묶음부터 버리고 버린 라인 수를 알림
+- 마지막 구독자가 나가면 업스트림 연결을 닫고, 끊기면 마지막 타임스탬프 이후부터 다시 연결
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import Counter
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+import websockets
+
+from app.config import settings
+from app.services.loki import build_logql
+
+logger = logging.getLogger(__name__)
+
+
+class TailLimitExceeded(Exception):
+    """동시 tail 구독자 수 제한 초과"""
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+
+    def take(self, count: int) -> int:
+        """최대 count개까지 꺼내고 꺼낸 수를 반환"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        taken = min(count, int(self.tokens))
+        self.tokens -= taken
+        return taken
+
+
+class TailSubscription:
+    """구독자 하나의 버퍼. 가득 차면 가장 오래된 묶음을 버리고 dropped에 누적"""
+
+    def __init__(self, buffer_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.dropped: Counter = Counter()
+
+    def offer(self, entries: List[Dict[str, str]]):
+        if self.queue.full():
+            try:
+                self.dropped["slow_consumer"] += len(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait(entries)
+
+    def take_dropped(self) -> Dict[str, int]:
+        dropped, self.dropped = dict(self.dropped), Counter()
+        return dropped
+
+
+class _TailChannel:
+    """function_id 하나의 구독자 집합과 업스트림 tail 연결"""
+
+    def __init__(self, function_id: str):
+        self.function_id = function_id
+        self.subscribers: Set[TailSubscription] = set()
+        self.upstream: Optional[asyncio.Task] = None
+        self.last_timestamp_ns: Optional[int] = None
+        self.bucket = _TokenBucket(
+            settings.loki_tail_max_lines_per_second, settings.loki_tail_max_lines_per_second
+        )
+
+    def broadcast(self, entries: List[Dict[str, str]], dropped: Dict[str, int]):
+        for subscription in self.subscribers:
+            subscription.dropped.update(dropped)
+            if entries:
+                subscription.offer(entries)
+
+
+def tail_url(function_id: str, start_ns: Optional[int] = None) -> str:
+    """Loki tail WebSocket URL (http(s) → ws(s))"""
+    base = settings.loki_service_url.rstrip("/")
+    if base.startswith("https://"):
+        base = "wss://" + base[len("https://"):]
+    elif base.startswith("http://"):
+        base = "ws://" + base[len("http://"):]
+    params = {"query": build_logql(function_id), "delay_for": "0"}
+    if start_ns is not None:
+        params["start"] = str(start_ns)
+    return f"{base}/loki/api/v1/tail?{urlencode(params)}"
+
+
+def parse_tail_message(message: Any) -> Tuple[List[Dict[str, str]], int]:
+    """
+    tail 메시지({"streams": [...], "dropped_entries": [...]}) →
+    (타임스탬프순 로그 목록, Loki가 버린 라인 수)
+    """
+    data = json.loads(message)
+    entries = []
+    for stream in data.get("streams") or []:
+        for value in stream.get("values") or []:
+            if len(value) >= 2:
+                entries.append({"timestamp": value[0], "line": value[1]})
+    entries.sort(key=lambda entry: int(entry["timestamp"]))
+    return entries, len(data.get("dropped_entries") or [])
+
+
+class LokiTailHub:
+    """function_id별 Loki tail fan-out"""
+
+    def __init__(self):
+        self._channels: Dict[str, _TailChannel] = {}
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(channel.subscribers) for channel in self._channels.values())
+
+    def check_capacity(self):
+        """구독 자리 확인 (응답을 시작하기 전에 호출해 제한 초과를 429로 돌려줄 수 있게 함)"""
+        if self.subscriber_count >= settings.loki_tail_max_subscribers:
+            raise TailLimitExceeded(
+                f"Too many live log subscribers (max {settings.loki_tail_max_subscribers})"
+            )
+
+    def open(self, function_id: str) -> TailSubscription:
+        """
+        구독 등록. 등록한 쪽이 반드시 close(또는 stream 종료)로 해제해야 하므로
+        응답 스트림/WebSocket 핸들러 안의 try/finally에서 호출한다.
+        """
+        self.check_capacity()
+        channel = self._channels.get(function_id)
+        if channel is None:
+            channel = self._channels[function_id] = _TailChannel(function_id)
+        subscription = TailSubscription(settings.loki_tail_subscriber_buffer)
+        channel.subscribers.add(subscription)
+        if channel.upstream is None or channel.upstream.done():
+            channel.upstream = asyncio.create_task(self._run_upstream(channel))
+        return subscription
+
+    def close(self, function_id: str, subscription: TailSubscription):
+        channel = self._channels.get(function_id)
+        if channel is None:
+            return
+        channel.subscribers.discard(subscription)
+        if not channel.subscribers:
+            self._channels.pop(function_id, None)
+            if channel.upstream:
+                channel.upstream.cancel()
+
+    async def stream(
+        self, function_id: str, subscription: TailSubscription, keepalive_seconds: float
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        구독 이벤트: {"type": "logs", "entries": [...]}, {"type": "dropped", "counts": {...}},
+        keepalive_seconds 동안 로그가 없으면 {"type": "keepalive"}. 끝날 때 구독 해제.
+        """
+        try:
+            while True:
+                try:
+                    entries = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=keepalive_seconds
+                    )
+                except asyncio.TimeoutError:
+                    entries = None
+                dropped = subscription.take_dropped()
+                if dropped:
+                    yield {"type": "dropped", "counts": dropped}
+                if entries is None:
+                    yield {"type": "keepalive"}
+                else:
+                    yield {"type": "logs", "entries": entries}
+        finally:
+            self.close(function_id, subscription)
+
+    async def _run_upstream(self, channel: _TailChannel):
+        backoff = 1.0
+        while channel.subscribers:
+            # 재연결 시 마지막으로 받은 로그 다음부터 이어받음
+            start_ns = (
+                channel.last_timestamp_ns + 1 if channel.last_timestamp_ns is not None else None
+            )
+            try:
+                async with websockets.connect(
+                    tail_url(channel.function_id, start_ns),
+                    open_timeout=10,
+                    max_size=settings.loki_tail_max_message_bytes,
+                ) as connection:
+                    backoff = 1.0
+                    async for message in connection:
+                        self._dispatch(channel, message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    "Loki tail for %s disconnected: %s (retry in %.0fs)",
+                    channel.function_id,
+                    e,
+                    backoff,
+                )
+            if not channel.subscribers:
+                return
+            await asyncio.sleep(backoff)
+            backoff = min(30.0, backoff * 2)
+
+    def _dispatch(self, channel: _TailChannel, message: Any):
+        try:
+            entries, upstream_dropped = parse_tail_message(message)
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning("Invalid Loki tail message for %s: %s", channel.function_id, e)
+            return
+        if entries:
+            channel.last_timestamp_ns = int(entries[-1]["timestamp"])
+
+        dropped: Dict[str, int] = {}
+        if upstream_dropped:
+            dropped["upstream"] = upstream_dropped
+        allowed = channel.bucket.take(len(entries))
+        if allowed < len(entries):
+            dropped["rate_limit"] = len(entries) - allowed
+            entries = entries[:allowed]
+        channel.broadcast(entries, dropped)
+
+
+# 전역 허브 인스턴스
+loki_tail_hub = LokiTailHub()
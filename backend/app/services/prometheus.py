@@ -0,0 +1,187 @@
+"""Prometheus 쿼리 클라이언트
+
+- 공유 커넥션 풀(get_http_client) 사용
+- 같은 쿼리의 동시 요청은 한 번의 업스트림 호출로 합침
+- range 쿼리는 (query, step)별로 step에 정렬된 시계열을 캐시하고,
+  마지막으로 캐시된 시점 이후(늦게 들어온 샘플을 위한 겹침 구간 포함)만 다시 조회한다.
+- range 응답은 받는 대로 파싱해 캐시 구조로 바로 옮긴다 (본문 전체를 올리지 않음).
+
+응답은 Prometheus API와 같은 형태({"status", "data": {"resultType", "result"}})로 반환한다.
+"""
+import json
+import logging
+import math
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+from app.utils.cache import ByteBudgetCache, RequestCoalescer
+from app.utils.http import get_http_client
+from app.utils.jsonstream import descend_result_values, iter_json
+
+logger = logging.getLogger(__name__)
+
+# 시계열 포인트 하나의 대략적인 메모리 크기 (캐시 예산 계산용)
+POINT_SIZE_BYTES = 64
+
+# 캐시 값: (시작, 끝, {시리즈 키: (metric 레이블, {timestamp: value 문자열})})
+SeriesPoints = Dict[str, Tuple[Dict[str, str], Dict[float, str]]]
+RangeEntry = Tuple[float, float, SeriesPoints]
+
+
+def _series_key(metric: Dict[str, str]) -> str:
+    return json.dumps(metric, sort_keys=True)
+
+
+def _entry_size(entry: RangeEntry) -> int:
+    return sum(
+        len(key) + POINT_SIZE_BYTES * len(points) for key, (_, points) in entry[2].items()
+    )
+
+
+def align(timestamp: float, step: int) -> float:
+    """step 배수로 내림 (같은 step의 쿼리가 같은 평가 시점을 공유하도록)"""
+    return math.floor(timestamp / step) * step
+
+
+class PrometheusClient:
+    """Prometheus HTTP API 호출 (요청 합치기 + range 캐시)"""
+
+    def __init__(self, cache_max_bytes: Optional[int] = None):
+        self.range_cache = ByteBudgetCache(
+            settings.prometheus_range_cache_max_bytes
+            if cache_max_bytes is None
+            else cache_max_bytes,
+            sizeof=_entry_size,
+        )
+        self._coalescer = RequestCoalescer()
+
+    def _client(self) -> httpx.AsyncClient:
+        return get_http_client("prometheus", timeout=settings.prometheus_timeout_seconds)
+
+    async def _get(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        response = await self._client().get(
+            f"{settings.prometheus_service_url}{path}", params=params
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def _fetch_range(
+        self, params: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], List[Tuple[Dict[str, str], Dict[float, str]]]]:
+        """
+        query_range 응답을 받는 대로 파싱해 시리즈별 {timestamp: value}로 바로 변환.
+        (status/error 필드, [(metric 레이블, 포인트)]) 반환. 본문 전체나 중간 dict를 만들지 않는다.
+        """
+        envelope: Dict[str, Any] = {}
+        results: Dict[int, Tuple[Dict[str, str], Dict[float, str]]] = {}
+        async with self._client().stream(
+            "GET", f"{settings.prometheus_service_url}/api/v1/query_range", params=params
+        ) as response:
+            if response.is_error:
+                await response.aread()
+            response.raise_for_status()
+            async for path, value in iter_json(response, descend_result_values):
+                if len(path) == 5:
+                    results.setdefault(path[2], ({}, {}))[1][float(value[0])] = value[1]
+                elif len(path) == 4 and path[3] == "metric":
+                    results[path[2]] = (value, results.get(path[2], ({}, {}))[1])
+                elif len(path) == 1:
+                    envelope[path[0]] = value
+        return envelope, list(results.values())
+
+    async def query(self, query: str) -> Dict[str, Any]:
+        """instant 쿼리 (동시 요청은 하나로 합침)"""
+        return await self._coalescer.run(
+            ("query", query), lambda: self._get("/api/v1/query", {"query": query})
+        )
+
+    async def query_range(
+        self, query: str, window_seconds: int, step: int, end: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        최근 window_seconds 구간 range 쿼리.
+        시작/끝을 step에 맞춰 정렬하므로 같은 분(step) 안의 요청은 같은 키로 합쳐진다.
+        """
+        end = align(end if end is not None else time.time(), step)
+        start = end - align(window_seconds, step)
+        return await self._coalescer.run(
+            ("range", query, step, start, end),
+            lambda: self._query_range_cached(query, step, start, end),
+        )
+
+    async def _query_range_cached(
+        self, query: str, step: int, start: float, end: float
+    ) -> Dict[str, Any]:
+        key = (query, step)
+        cached = self.range_cache.get(key)
+        series: SeriesPoints = {}
+        fetch_start = start
+        if cached is not None:
+            cached_start, cached_end, cached_series = cached[0]
+            if cached_start <= start <= cached_end <= end:
+                # 캐시된 구간 뒤쪽만 조회 (최근 overlap 구간은 늦은 샘플 반영을 위해 다시 조회)
+                overlap = align(settings.prometheus_range_cache_overlap_seconds, step)
+                fetch_start = max(start, cached_end - overlap)
+                series = {
+                    series_key: (metric, dict(points))
+                    for series_key, (metric, points) in cached_series.items()
+                }
+
+        if fetch_start > end:
+            envelope, fetched = {"status": "success"}, []
+        else:
+            envelope, fetched = await self._fetch_range(
+                {"query": query, "start": fetch_start, "end": end, "step": f"{step}s"}
+            )
+        if envelope.get("status") != "success":
+            # 오류 응답은 캐시하지 않고 그대로 전달
+            return envelope
+
+        fetched_keys = set()
+        for metric, fetched_points in fetched:
+            series_key = _series_key(metric)
+            fetched_keys.add(series_key)
+            points = series.setdefault(series_key, (metric, {}))[1]
+            for point in [ts for ts in points if ts >= fetch_start]:
+                del points[point]
+            points.update(fetched_points)
+
+        # 윈도우 밖으로 밀려난 포인트와 다시 조회한 구간에서 사라진 포인트 정리
+        for series_key in list(series):
+            metric, points = series[series_key]
+            if series_key not in fetched_keys:
+                for ts in [ts for ts in points if ts >= fetch_start]:
+                    del points[ts]
+            for ts in [ts for ts in points if ts < start]:
+                del points[ts]
+            if not points:
+                del series[series_key]
+
+        self.range_cache.put(key, (start, end, series))
+        logger.debug(
+            "Prometheus range %s step=%ss fetched %.0fs of %.0fs",
+            query,
+            step,
+            end - fetch_start,
+            end - start,
+        )
+        return {
+            "status": "success",
+            "data": {
+                "resultType": "matrix",
+                "result": [
+                    {
+                        "metric": metric,
+                        "values": [[ts, points[ts]] for ts in sorted(points)],
+                    }
+                    for metric, points in series.values()
+                ],
+            },
+        }
+
+
+# 전역 Prometheus 클라이언트 인스턴스
+prometheus_client = PrometheusClient()
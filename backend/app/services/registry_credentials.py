@@ -0,0 +1,60 @@
+"""직접 지정한 레지스트리 비밀번호의 job 항목 저장 (KMS 암호화)
+
+build job은 어느 레플리카든 임대해 실행할 수 있으므로 비밀번호를 받은 프로세스 메모리에 둘 수 없다.
+BUILD_REGISTRY_KMS_KEY_ID 키로 암호화한 값(base64)을 job payload에 넣고, 실행하는 레플리카가 복호화한다.
+암호문은 task_id를 암호화 컨텍스트로 묶어 다른 job 항목으로 옮겨도 복호화되지 않으며,
+job 항목이 완료/최종 실패로 삭제될 때 함께 사라진다.
+"""
+import base64
+from typing import Optional
+
+import boto3
+
+from app.config import settings
+
+
+class RegistryCredentialsUnavailable(Exception):
+    """KMS 키가 설정되지 않아 직접 지정한 비밀번호를 받을 수 없음"""
+
+
+class RegistryCredentials:
+    """KMS Encrypt/Decrypt 래퍼 (블로킹 호출, 스레드에서 실행)"""
+
+    def __init__(self):
+        self._kms = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.build_registry_kms_key_id)
+
+    def _client(self):
+        if self._kms is None:
+            self._kms = boto3.client("kms", region_name=settings.aws_region)
+        return self._kms
+
+    def seal(self, task_id: str, password: str) -> str:
+        """비밀번호 → job payload에 넣을 암호문 (base64)"""
+        if not self.enabled:
+            raise RegistryCredentialsUnavailable(
+                "Inline registry passwords require BUILD_REGISTRY_KMS_KEY_ID"
+            )
+        response = self._client().encrypt(
+            KeyId=settings.build_registry_kms_key_id,
+            Plaintext=password.encode("utf-8"),
+            EncryptionContext={"task_id": task_id},
+        )
+        return base64.b64encode(response["CiphertextBlob"]).decode("ascii")
+
+    def unseal(self, task_id: str, ciphertext: Optional[str]) -> Optional[str]:
+        """암호문 → 비밀번호 (암호문이 없으면 None)"""
+        if not ciphertext:
+            return None
+        response = self._client().decrypt(
+            CiphertextBlob=base64.b64decode(ciphertext),
+            EncryptionContext={"task_id": task_id},
+        )
+        return response["Plaintext"].decode("utf-8")
+
+
+# 전역 인스턴스
+registry_credentials = RegistryCredentials()
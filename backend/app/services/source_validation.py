@@ -0,0 +1,258 @@
+"""빌드 전 소스 검증
+
+업로드된 .py/.zip을 S3·Builder로 보내기 전에 검사해 깨진 소스를 즉시 거절한다.
+
+- 업로드 크기, zip 무결성(CRC), 엔트리 수/압축 해제 크기(zip bomb), 경로 탈출 검사
+- 엔트리 모듈 탐지 (IncomingHandler 클래스를 정의한 모듈, 없으면 app.py)
+- 모든 .py 파일 compile() (py_compile과 동일한 구문 검사)
+
+CPU를 쓰는 검사는 크기가 제한된 프로세스 풀에서 실행해 이벤트 루프를 막지 않는다.
+워커는 forkserver로 띄워(스레드가 있는 서버 프로세스를 fork하지 않음) 락 상속으로 인한 교착을 피하고,
+제한 시간을 넘긴 검사는 워커를 종료하고 풀을 새로 만들어 자리를 계속 차지하지 않게 한다.
+"""
+import ast
+import asyncio
+import io
+import logging
+import multiprocessing
+import posixpath
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+ENTRY_HANDLER_CLASS = "IncomingHandler"
+DEFAULT_ENTRY_MODULE = "app.py"
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+class SourceValidationError(Exception):
+    """소스 검증 실패 (code: 오류 종류, file/line/offset: 위치)"""
+
+    def __init__(
+        self,
+        code: str,
+        message: str,
+        file: Optional[str] = None,
+        line: Optional[int] = None,
+        offset: Optional[int] = None,
+    ):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.file = file
+        self.line = line
+        self.offset = offset
+
+    def as_detail(self) -> Dict[str, Any]:
+        detail: Dict[str, Any] = {"code": self.code, "message": self.message}
+        for key in ("file", "line", "offset"):
+            value = getattr(self, key)
+            if value is not None:
+                detail[key] = value
+        return detail
+
+
+def _error(code: str, message: str, **location) -> Dict[str, Any]:
+    # 프로세스 경계를 넘으므로 예외 대신 dict로 반환
+    return {"ok": False, "error": {"code": code, "message": message, **location}}
+
+
+def _compile(source: bytes, name: str) -> Optional[Dict[str, Any]]:
+    """구문 검사. 정상이면 None, 실패 시 오류 dict"""
+    try:
+        text = source.decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        return _error("encoding_error", f"UTF-8 소스가 아닙니다: {e.reason}", file=name)
+    try:
+        compile(text, name, "exec", dont_inherit=True)
+    except SyntaxError as e:
+        return _error(
+            "syntax_error",
+            e.msg or "invalid syntax",
+            file=name,
+            line=e.lineno,
+            offset=e.offset,
+        )
+    except ValueError as e:
+        # null 바이트 등
+        return _error("syntax_error", str(e), file=name)
+    return None
+
+
+def _defines_handler(source: bytes) -> bool:
+    try:
+        tree = ast.parse(source.decode("utf-8-sig"))
+    except (SyntaxError, ValueError, UnicodeDecodeError):
+        return False
+    return any(
+        isinstance(node, ast.ClassDef) and node.name == ENTRY_HANDLER_CLASS
+        for node in tree.body
+    )
+
+
+def _is_ignored(name: str) -> bool:
+    parts = name.split("/")
+    return parts[0] == "__MACOSX" or any(part.startswith(".") for part in parts) or (
+        "__pycache__" in parts
+    )
+
+
+def _validate_zip(content: bytes, max_entries: int, max_uncompressed: int) -> Dict[str, Any]:
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(content))
+    except (zipfile.BadZipFile, zipfile.LargeZipFile) as e:
+        return _error("invalid_zip", f"손상된 zip 파일입니다: {e}")
+
+    with archive:
+        infos = [info for info in archive.infolist() if not info.is_dir()]
+        if len(infos) > max_entries:
+            return _error("too_many_entries", f"zip 항목 수가 {max_entries}개를 초과합니다")
+
+        total = 0
+        for info in infos:
+            name = info.filename
+            normalized = posixpath.normpath(name)
+            if name.startswith("/") or normalized.startswith("..") or ":" in name.split("/")[0]:
+                return _error("unsafe_path", "zip 항목 경로가 압축 해제 위치를 벗어납니다", file=name)
+            if info.flag_bits & 0x1:
+                return _error("encrypted_entry", "암호화된 zip 항목은 지원하지 않습니다", file=name)
+            total += info.file_size
+            if total > max_uncompressed:
+                return _error(
+                    "archive_too_large",
+                    f"압축 해제 크기가 {max_uncompressed} bytes를 초과합니다",
+                )
+
+        sources: Dict[str, bytes] = {}
+        for info in infos:
+            try:
+                data = archive.read(info)  # CRC 불일치 시 BadZipFile
+            except (zipfile.BadZipFile, zlib.error, NotImplementedError, EOFError) as e:
+                return _error("invalid_zip", f"zip 항목을 읽을 수 없습니다: {e}", file=info.filename)
+            if info.filename.endswith(".py") and not _is_ignored(info.filename):
+                sources[info.filename] = data
+
+    if not sources:
+        return _error("missing_entry_module", "zip에 Python 소스(.py)가 없습니다")
+
+    for name in sorted(sources):
+        failure = _compile(sources[name], name)
+        if failure:
+            return failure
+
+    # 루트(또는 단일 최상위 디렉터리) 기준으로 가까운 파일부터 엔트리 후보로 검사
+    candidates = sorted(sources, key=lambda name: (name.count("/"), name))
+    entry = next((name for name in candidates if _defines_handler(sources[name])), None)
+    if entry is None:
+        entry = next(
+            (name for name in candidates if posixpath.basename(name) == DEFAULT_ENTRY_MODULE),
+            None,
+        )
+    if entry is None:
+        return _error(
+            "missing_entry_module",
+            f"{ENTRY_HANDLER_CLASS} 클래스를 정의한 모듈 또는 {DEFAULT_ENTRY_MODULE} 파일이 없습니다",
+        )
+    return {"ok": True, "entry_module": entry, "python_files": len(sources)}
+
+
+def validate_source_sync(
+    filename: str, content: bytes, max_entries: int, max_uncompressed: int
+) -> Dict[str, Any]:
+    """검증 본체 (워커 프로세스에서 실행). {"ok": bool, ...} 반환"""
+    if filename.endswith(".zip"):
+        return _validate_zip(content, max_entries, max_uncompressed)
+
+    failure = _compile(content, filename)
+    if failure:
+        return failure
+    return {"ok": True, "entry_module": filename, "python_files": 1}
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.build_validation_workers,
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+    return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """풀을 버리고 워커 프로세스를 종료 (실행 중인 검사는 BrokenProcessPool로 끝남)"""
+    global _pool
+    if _pool is pool:
+        _pool = None
+    # shutdown은 실행 중인 워커를 멈추지 않으므로 직접 종료
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def validate_source(filename: str, content: bytes) -> Dict[str, Any]:
+    """
+    업로드 소스 검증. 실패 시 SourceValidationError.
+    성공 시 {"entry_module": ..., "python_files": ...}
+    """
+    if not content:
+        raise SourceValidationError("empty_file", "빈 파일입니다", file=filename)
+    if len(content) > settings.build_source_max_bytes:
+        raise SourceValidationError(
+            "file_too_large",
+            f"업로드 크기가 {settings.build_source_max_bytes} bytes를 초과합니다",
+            file=filename,
+        )
+
+    loop = asyncio.get_running_loop()
+    # 다른 요청의 시간 초과로 풀이 교체되며 끊긴 경우 새 풀에서 한 번 더 시도
+    for attempt in range(2):
+        pool = _get_pool()
+        future = loop.run_in_executor(
+            pool,
+            validate_source_sync,
+            filename,
+            content,
+            settings.build_zip_max_entries,
+            settings.build_zip_max_uncompressed_bytes,
+        )
+        try:
+            result = await asyncio.wait_for(
+                future, timeout=settings.build_validation_timeout_seconds
+            )
+            break
+        except BrokenProcessPool:
+            if _pool is pool:
+                # 워커 프로세스가 죽은 경우(OOM 등) 다음 요청을 위해 풀을 새로 만듦
+                logger.error("Source validation pool broken, recreating")
+                _discard_pool(pool)
+            if attempt:
+                raise
+        except asyncio.TimeoutError:
+            # 버려진 future의 워커가 계속 돌지 않도록 풀을 교체
+            logger.warning("Source validation of %s timed out, recycling pool", filename)
+            _discard_pool(pool)
+            raise SourceValidationError(
+                "validation_timeout",
+                f"소스 검증이 {settings.build_validation_timeout_seconds}초 안에 끝나지 않았습니다",
+                file=filename,
+            )
+
+    if not result["ok"]:
+        raise SourceValidationError(**result["error"])
+    return {key: value for key, value in result.items() if key != "ok"}
+
+
+def shutdown_validation_pool():
+    """앱 종료 시 프로세스 풀 정리"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
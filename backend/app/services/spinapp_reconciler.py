@@ -0,0 +1,220 @@
+"""SpinApp ↔ 함수(FN#) 배포 상태 동기화
+
+SpinApp/Service 리소스를 informer(list + watch)로 로컬 캐시에 유지하고,
+변경 이벤트(debounce) 또는 주기마다 FN# 항목과 비교해
+invocationUrl, status, lastDeployed를 트랜잭션 묶음으로 갱신한다.
+동기화가 끝난 뒤에는 호출 시 Service 호스트를 추측할 필요가 없다.
+"""
+import asyncio
+import logging
+import socket
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.database import db_client
+from app.utils.http import normalize_invocation_url
+from app.utils.k8s import Informer, KubernetesClient, k8s_client, spinapp_name
+from app.utils.timezone import now_kst_iso
+
+logger = logging.getLogger(__name__)
+
+FUNCTION_ID_LABEL = "function_id"
+LOCK_NAME = "spinapp-reconcile"
+# 클러스터 상태로 덮어쓰지 않는 함수 상태
+PRESERVED_STATUSES = ("building", "disabled")
+CLUSTER_DNS_SUFFIX = ".svc.cluster.local"
+
+FunctionUpdate = Tuple[str, str, Dict[str, Any]]
+
+
+def _labels(spinapp: Dict[str, Any]) -> Dict[str, str]:
+    labels = dict(spinapp.get("spec", {}).get("podLabels") or {})
+    labels.update(spinapp.get("metadata", {}).get("labels") or {})
+    return labels
+
+
+def _is_ready(spinapp: Dict[str, Any]) -> bool:
+    status = spinapp.get("status") or {}
+    if (status.get("readyReplicas") or 0) >= 1:
+        return True
+    return any(
+        condition.get("type") == "Available" and condition.get("status") == "True"
+        for condition in status.get("conditions") or []
+    )
+
+
+def _function_id(function: Dict[str, Any]) -> Optional[str]:
+    return function.get("id") or function.get("SK", "")[len("FN#"):] or None
+
+
+def _workspace_id(function: Dict[str, Any]) -> Optional[str]:
+    return function.get("workspaceId") or function.get("PK", "")[len("WS#"):] or None
+
+
+def match_spinapps(
+    functions: List[Dict[str, Any]], spinapps: Dict[str, Dict[str, Any]]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    함수 id → SpinApp 매칭.
+    function_id 레이블이 있으면 그것을, 없으면 함수 이름 규칙(spinapp_name)으로 찾는다.
+    """
+    by_label: Dict[str, Dict[str, Any]] = {}
+    for spinapp in spinapps.values():
+        function_id = _labels(spinapp).get(FUNCTION_ID_LABEL)
+        if function_id:
+            by_label[function_id] = spinapp
+
+    matched = {}
+    for function in functions:
+        function_id = _function_id(function)
+        spinapp = by_label.get(function_id)
+        if spinapp is None and function.get("name"):
+            spinapp = spinapps.get(spinapp_name(function["name"]))
+        if spinapp is not None:
+            matched[function_id] = spinapp
+    return matched
+
+
+def desired_updates(
+    functions: List[Dict[str, Any]],
+    spinapps: Dict[str, Dict[str, Any]],
+    services: Dict[str, Dict[str, Any]],
+    namespace: str,
+    now: Optional[str] = None,
+) -> List[FunctionUpdate]:
+    """클러스터 상태와 다른 함수 항목의 변경분 목록 (바뀐 속성만 포함)"""
+    now = now or now_kst_iso()
+    matched = match_spinapps(functions, spinapps)
+    updates: List[FunctionUpdate] = []
+
+    for function in functions:
+        workspace_id, function_id = _workspace_id(function), _function_id(function)
+        if not workspace_id or not function_id:
+            continue
+        current_url = normalize_invocation_url(function.get("invocationUrl"))
+        spinapp = matched.get(function_id)
+        changes: Dict[str, Any] = {}
+
+        if spinapp is None:
+            # 클러스터에서 사라진 앱의 내부 주소는 지워 호출이 NOT_DEPLOYED로 바로 실패하도록 함
+            if current_url and CLUSTER_DNS_SUFFIX in current_url:
+                changes["invocationUrl"] = None
+        else:
+            metadata = spinapp.get("metadata", {})
+            name = metadata["name"]
+            ready = _is_ready(spinapp)
+            service = services.get(name)
+            if service is not None:
+                url = f"http://{name}.{metadata.get('namespace') or namespace}{CLUSTER_DNS_SUFFIX}"
+                if url != current_url:
+                    changes["invocationUrl"] = url
+
+            generation = metadata.get("generation")
+            generation_changed = generation is not None and generation != function.get(
+                "spinappGeneration"
+            )
+            if generation_changed:
+                changes["spinappGeneration"] = generation
+                changes["lastDeployed"] = (
+                    now if function.get("lastDeployed") else metadata.get("creationTimestamp") or now
+                )
+
+            status = function.get("status")
+            if status not in PRESERVED_STATUSES:
+                if ready and status != "active":
+                    changes["status"] = "active"
+                elif not ready and generation_changed and status != "deploying":
+                    changes["status"] = "deploying"
+
+        if changes:
+            updates.append((workspace_id, function_id, changes))
+    return updates
+
+
+class SpinAppReconciler:
+    """SpinApp/Service informer와 FN# 항목 동기화 루프"""
+
+    def __init__(
+        self,
+        client: KubernetesClient = k8s_client,
+        namespace: Optional[str] = None,
+    ):
+        self.client = client
+        self.namespace = namespace or settings.k8s_namespace
+        self._changed = asyncio.Event()
+        self.spinapps = Informer(
+            client, client.spinapp_path(self.namespace), on_change=self._changed.set
+        )
+        self.services = Informer(
+            client, client.service_path(self.namespace), on_change=self._changed.set
+        )
+        self.owner = f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+
+    @property
+    def synced(self) -> bool:
+        """두 캐시 모두 최초 list를 마친 상태 (이후 호출은 호스트를 추측하지 않음)"""
+        return self.spinapps.synced and self.services.synced
+
+    async def reconcile_once(self) -> int:
+        """
+        캐시와 FN# 항목을 비교해 변경분을 반영하고 갱신한 함수 수를 반환.
+        임대 락을 가진 레플리카만 수행 (락은 해제하지 않고 매번 연장해 담당 레플리카를 유지)
+        """
+        acquired = await asyncio.to_thread(
+            db_client.acquire_lock, LOCK_NAME, self.owner, settings.spinapp_reconcile_lock_seconds
+        )
+        if not acquired:
+            return 0
+        functions = await asyncio.to_thread(db_client.list_all_functions)
+        updates = desired_updates(
+            functions, self.spinapps.items, self.services.items, self.namespace
+        )
+        if not updates:
+            return 0
+        missing = await asyncio.to_thread(db_client.update_functions_batch, updates)
+        logger.info(
+            "SpinApp reconcile updated %d functions (%d missing)",
+            len(updates) - len(missing),
+            len(missing),
+        )
+        return len(updates) - len(missing)
+
+    async def run(self):
+        """informer를 띄우고 변경 이벤트 또는 주기마다 동기화 (앱 lifespan에서 구동)"""
+        informers = [
+            asyncio.create_task(self.spinapps.run()),
+            asyncio.create_task(self.services.run()),
+        ]
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(
+                        self._changed.wait(), timeout=settings.spinapp_reconcile_interval_seconds
+                    )
+                    # 배포 직후 몰리는 이벤트를 한 번의 동기화로 묶음
+                    await asyncio.sleep(settings.spinapp_reconcile_debounce_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._changed.clear()
+                if not self.synced:
+                    continue
+                try:
+                    await self.reconcile_once()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error("SpinApp reconcile error: %s", e)
+        finally:
+            for task in informers:
+                task.cancel()
+            await asyncio.gather(*informers, return_exceptions=True)
+            # 종료 시 다른 레플리카가 바로 이어받도록 락 해제
+            try:
+                await asyncio.to_thread(db_client.release_lock, LOCK_NAME, self.owner)
+            except Exception as e:
+                logger.warning("SpinApp reconcile lock release failed: %s", e)
+
+
+# 전역 reconciler 인스턴스
+spinapp_reconciler = SpinAppReconciler()
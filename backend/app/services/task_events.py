@@ -0,0 +1,109 @@
+"""빌드 작업 상태 변경 스트림 허브
+
+브라우저 탭 수와 무관하게 레플리카당 task 하나에 watcher 하나만 두고,
+DynamoDB BUILD# 항목을 키 조회(get_item)로 확인해 상태 변경을 구독자에게 전달한다.
+이 레플리카에서 직접 상태를 갱신한 경우(webhook, build job)는 publish로 즉시 전달하며,
+다른 레플리카/Builder Service가 갱신한 경우는 watcher 조회로 감지한다.
+"""
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+from app.config import settings
+from app.database import db_client
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "done", "failed")
+
+TaskKey = Tuple[str, str]
+
+
+def _version(task: Dict[str, Any]) -> Tuple[Any, Any]:
+    return task.get("status"), task.get("updated_at")
+
+
+class _TaskChannel:
+    """task 하나의 구독자 집합과 watcher"""
+
+    def __init__(self, key: TaskKey):
+        self.key = key
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.latest: Optional[Dict[str, Any]] = None
+        self.watcher: Optional[asyncio.Task] = None
+
+    def offer(self, task: Dict[str, Any]) -> bool:
+        """새 버전이면 모든 구독자에게 전달"""
+        if self.latest is not None and _version(self.latest) == _version(task):
+            return False
+        self.latest = task
+        for queue in self.subscribers:
+            if queue.full():
+                # 느린 구독자는 중간 상태를 건너뛰고 최신 상태만 받음
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait(task)
+        return True
+
+
+class TaskEventHub:
+    """task_id별 상태 변경 fan-out"""
+
+    def __init__(self, poll_seconds: Optional[float] = None):
+        self.poll_seconds = poll_seconds or settings.task_events_poll_seconds
+        self._channels: Dict[TaskKey, _TaskChannel] = {}
+
+    def publish(self, task: Optional[Dict[str, Any]]):
+        """이 레플리카에서 갱신한 BUILD# 항목을 즉시 전달"""
+        if not task:
+            return
+        channel = self._channels.get((task.get("workspace_id"), task.get("task_id")))
+        if channel:
+            channel.offer(task)
+
+    async def subscribe(self, workspace_id: str, task_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """상태가 바뀔 때마다 BUILD# 항목을 내보내고, 종료 상태에 도달하면 끝남"""
+        key = (workspace_id, task_id)
+        channel = self._channels.get(key)
+        if channel is None:
+            channel = self._channels[key] = _TaskChannel(key)
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=16)
+        channel.subscribers.add(queue)
+        if channel.latest is not None:
+            queue.put_nowait(channel.latest)
+        if channel.watcher is None or channel.watcher.done():
+            channel.watcher = asyncio.create_task(self._watch(channel))
+
+        try:
+            while True:
+                task = await queue.get()
+                yield task
+                if task.get("status") in TERMINAL_STATUSES:
+                    return
+        finally:
+            channel.subscribers.discard(queue)
+            if not channel.subscribers:
+                self._channels.pop(key, None)
+                if channel.watcher:
+                    channel.watcher.cancel()
+
+    async def _watch(self, channel: _TaskChannel):
+        workspace_id, task_id = channel.key
+        while channel.subscribers:
+            try:
+                task = await asyncio.to_thread(db_client.get_build_task, workspace_id, task_id)
+            except Exception as e:
+                logger.warning("Task event watcher %s failed: %s", task_id, e)
+                task = None
+            if task:
+                channel.offer(task)
+                if task.get("status") in TERMINAL_STATUSES:
+                    return
+            await asyncio.sleep(self.poll_seconds)
+
+
+# 전역 허브 인스턴스
+task_event_hub = TaskEventHub()
@@ -0,0 +1,119 @@
+"""프로세스 로컬 캐시 유틸리티"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class ByteBudgetCache:
+    """
+    바이트 예산 기반 LRU 캐시.
+
+    각 항목은 (값, 크기, 저장 시각, 메타데이터)로 보관되며, 전체 크기가
+    max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 제거한다.
+    단일 항목이 예산보다 크면 캐시하지 않는다.
+    """
+
+    def __init__(self, max_bytes: int, sizeof: Optional[Callable[[Any], int]] = None):
+        self.max_bytes = max(0, int(max_bytes))
+        self._sizeof = sizeof or _default_sizeof
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, float, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """현재 사용 중인 바이트 수"""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Tuple[Any, float, Dict[str, Any]]]:
+        """(값, 저장 시각, 메타데이터) 반환. 없으면 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            value, _, stored_at, meta = entry
+            return value, stored_at, meta
+
+    def put(self, key: Hashable, value: Any, **meta: Any) -> bool:
+        """항목 저장. 예산 초과로 저장하지 못하면 False"""
+        size = self._sizeof(value)
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                return False
+            self._entries[key] = (value, size, time.monotonic(), meta)
+            self._size += size
+            while self._size > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+            return True
+
+    def touch(self, key: Hashable) -> None:
+        """저장 시각을 현재로 갱신 (재검증 성공 시 사용)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            value, size, _, meta = entry
+            self._entries[key] = (value, size, time.monotonic(), meta)
+            self._entries.move_to_end(key)
+
+    def pop(self, key: Hashable) -> None:
+        """항목 제거"""
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """전체 비우기"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[1]
+
+
+class RequestCoalescer:
+    """
+    같은 키의 동시 요청을 하나의 업스트림 호출로 합침 (single-flight).
+    진행 중인 호출이 있으면 새로 호출하지 않고 그 결과(예외 포함)를 함께 기다린다.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+        # 기다리던 요청 하나가 취소돼도 공유 호출은 계속 진행
+        return await asyncio.shield(future)
+
+    def _finish(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            future.exception()  # 기다리던 요청이 모두 취소된 경우의 경고 방지
+
+
+def _default_sizeof(value: Any) -> int:
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return len(repr(value).encode("utf-8"))
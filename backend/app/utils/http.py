@@ -0,0 +1,48 @@
+"""공유 httpx.AsyncClient 관리 (업스트림별 커넥션 풀 재사용)"""
+from typing import Dict, Optional, Union
+from urllib.parse import urlparse
+import httpx
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_http_client(
+    name: str,
+    timeout: float = 30.0,
+    limits: Optional[httpx.Limits] = None,
+    verify: Union[str, bool] = True,
+) -> httpx.AsyncClient:
+    """
+    이름별로 하나의 AsyncClient를 생성해 재사용.
+    요청마다 클라이언트를 만들지 않아 TCP/TLS 연결을 풀에서 재사용한다.
+    verify에 CA 번들 경로를 넘기면 해당 CA로 서버 인증서를 검증한다 (K8s API 등).
+    """
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=limits or httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            verify=verify,
+        )
+        _clients[name] = client
+    return client
+
+
+async def close_http_clients():
+    """앱 종료 시 모든 공유 클라이언트 종료"""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+def normalize_invocation_url(url: str) -> str:
+    """Ensure invocation URLs always include a scheme for httpx."""
+    if not url:
+        return ""
+
+    normalized = url.strip()
+    parsed = urlparse(normalized)
+    if parsed.scheme:
+        return normalized
+    return f"http://{normalized}"
@@ -0,0 +1,184 @@
+"""증분 JSON 파싱 유틸리티
+
+업스트림 응답 본문 전체를 메모리에 올리지 않고, 청크가 들어오는 대로 필요한 값을 꺼낸다.
+descend(path)가 True인 객체/배열만 안으로 들어가며 나머지 값은 json의 C 디코더로 통째로
+디코딩해 (경로, 값) 이벤트로 돌려준다. 버퍼에는 처리 중인 값 하나와 받은 청크만 남는다.
+
+예) Loki query_range 응답에서 data.result[*].values 안까지 들어가면
+로그 라인이 (("data", "result", 0, "values", 3), ["1700000000000000000", "line"]) 처럼 하나씩 나온다.
+"""
+import codecs
+import json
+import re
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple, Union
+
+import httpx
+
+Path = Tuple[Union[str, int], ...]
+Event = Tuple[Path, Any]
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# 숫자/true/false/null 토큰 (구분자 전까지)
+_SCALAR = re.compile(r"[^ \t\n\r,\]}]*")
+# 처리한 앞부분을 잘라낼 기준 (매번 자르면 문자열 복사가 많아짐)
+_COMPACT_THRESHOLD = 64 * 1024
+
+
+class _Frame:
+    __slots__ = ("kind", "path", "state", "key", "index")
+
+    def __init__(self, kind: str, path: Path):
+        self.kind = kind  # "object" | "array"
+        self.path = path
+        self.state = "first"
+        self.key: Optional[str] = None
+        self.index = 0
+
+
+class IncrementalJsonParser:
+    """
+    청크 단위 JSON 파서. feed()는 이번 청크까지로 완성된 (경로, 값) 이벤트를 반환한다.
+    문법 오류나 끝나지 않은 문서는 ValueError.
+    """
+
+    def __init__(self, descend: Callable[[Path], bool]):
+        self._descend = descend
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._done = False
+
+    def feed(self, text: str, final: bool = False) -> List[Event]:
+        if self._pos >= _COMPACT_THRESHOLD or self._pos == len(self._buffer):
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        self._buffer += text
+        events: List[Event] = []
+        while self._step(events, final):
+            pass
+        if final and not self._done:
+            raise ValueError("Incomplete JSON document")
+        return events
+
+    def _skip_whitespace(self):
+        self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+
+    def _decode(self, final: bool) -> Optional[Tuple[Any, int]]:
+        """현재 위치의 값 하나를 디코딩. 아직 다 받지 못했으면 None"""
+        scalar_end = None
+        if self._buffer[self._pos] not in '"{[':
+            # 숫자/리터럴은 청크 경계에서 잘렸을 수 있으므로 구분자가 올 때까지 기다림
+            scalar_end = _SCALAR.match(self._buffer, self._pos).end()
+            if scalar_end == len(self._buffer) and not final:
+                return None
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final or scalar_end is not None:
+                raise
+            return None
+        if scalar_end is not None and end != scalar_end:
+            raise ValueError(f"Invalid value at position {self._pos}")
+        return value, end
+
+    def _completed(self):
+        if self._stack:
+            self._stack[-1].state = "next"
+        else:
+            self._done = True
+
+    def _value(self, path: Path, events: List[Event], final: bool) -> bool:
+        char = self._buffer[self._pos]
+        if char in "{[" and self._descend(path):
+            self._stack.append(_Frame("object" if char == "{" else "array", path))
+            self._pos += 1
+            return True
+        decoded = self._decode(final)
+        if decoded is None:
+            return False
+        value, self._pos = decoded
+        events.append((path, value))
+        self._completed()
+        return True
+
+    def _close(self):
+        self._pos += 1
+        self._stack.pop()
+        self._completed()
+
+    def _step(self, events: List[Event], final: bool) -> bool:
+        self._skip_whitespace()
+        if self._pos >= len(self._buffer):
+            return False
+        if self._done:
+            raise ValueError(f"Extra data at position {self._pos}")
+        if not self._stack:
+            return self._value((), events, final)
+
+        frame = self._stack[-1]
+        char = self._buffer[self._pos]
+        if frame.kind == "object":
+            if frame.state in ("first", "key"):
+                if char == "}" and frame.state == "first":
+                    self._close()
+                    return True
+                if char != '"':
+                    raise ValueError(f"Expected object key at position {self._pos}")
+                decoded = self._decode(final)
+                if decoded is None:
+                    return False
+                frame.key, self._pos = decoded
+                frame.state = "colon"
+            elif frame.state == "colon":
+                if char != ":":
+                    raise ValueError(f"Expected ':' at position {self._pos}")
+                self._pos += 1
+                frame.state = "value"
+            elif frame.state == "value":
+                return self._value(frame.path + (frame.key,), events, final)
+            elif char == ",":
+                self._pos += 1
+                frame.state = "key"
+            elif char == "}":
+                self._close()
+            else:
+                raise ValueError(f"Expected ',' or '}}' at position {self._pos}")
+            return True
+
+        if frame.state in ("first", "value"):
+            if char == "]" and frame.state == "first":
+                self._close()
+                return True
+            return self._value(frame.path + (frame.index,), events, final)
+        if char == ",":
+            self._pos += 1
+            frame.index += 1
+            frame.state = "value"
+        elif char == "]":
+            self._close()
+        else:
+            raise ValueError(f"Expected ',' or ']' at position {self._pos}")
+        return True
+
+
+async def iter_json(
+    response: httpx.Response, descend: Callable[[Path], bool]
+) -> AsyncIterator[Event]:
+    """스트리밍 httpx 응답 본문을 (경로, 값) 이벤트로 변환"""
+    parser = IncrementalJsonParser(descend)
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")()
+    async for chunk in response.aiter_bytes():
+        for event in parser.feed(decoder.decode(chunk)):
+            yield event
+    for event in parser.feed(decoder.decode(b"", final=True), final=True):
+        yield event
+
+
+def descend_result_values(path: Path) -> bool:
+    """Loki/Prometheus query_range 응답: data.result[*].values 배열 안까지만 들어감"""
+    return (
+        path in ((), ("data",), ("data", "result"))
+        or (len(path) == 3 and path[:2] == ("data", "result"))
+        or (len(path) == 4 and path[:2] == ("data", "result") and path[3] == "values")
+    )
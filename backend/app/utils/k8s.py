@@ -0,0 +1,269 @@
+"""Kubernetes API 비동기 클라이언트 (in-cluster ServiceAccount)
+
+kubectl 서브프로세스 대신 공유 커넥션 풀로 API 서버를 직접 호출한다.
+파드의 ServiceAccount 토큰/CA를 사용하며 권한은 차트의 role.yaml(spinapps, services)을 따른다.
+클러스터 밖(로컬 개발)에서는 비활성화되어 호출이 skipped 결과를 반환한다.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from app.config import settings
+from app.utils.http import get_http_client
+
+logger = logging.getLogger(__name__)
+
+SERVICE_ACCOUNT_DIR = "/var/run/secrets/kubernetes.io/serviceaccount"
+# projected ServiceAccount 토큰은 주기적으로 갱신되므로 파일을 다시 읽는 주기
+TOKEN_REFRESH_SECONDS = 60
+
+
+@dataclass
+class SpinAppDeleteResult:
+    """SpinApp 삭제 결과 (status: deleted|not_found|failed|skipped)"""
+
+    name: str
+    namespace: str
+    status: str
+    code: Optional[int] = None
+    message: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("deleted", "not_found", "skipped")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class KubernetesClient:
+    """SpinApp 커스텀 리소스 조작용 최소 K8s API 클라이언트"""
+
+    def __init__(self, service_account_dir: str = SERVICE_ACCOUNT_DIR):
+        self.service_account_dir = service_account_dir
+        self._token: Optional[str] = None
+        self._token_read_at = 0.0
+
+    @property
+    def api_url(self) -> Optional[str]:
+        if settings.k8s_api_url:
+            return settings.k8s_api_url.rstrip("/")
+        host = os.environ.get("KUBERNETES_SERVICE_HOST")
+        port = os.environ.get("KUBERNETES_SERVICE_PORT", "443")
+        if not host:
+            return None
+        if ":" in host:  # IPv6
+            host = f"[{host}]"
+        return f"https://{host}:{port}"
+
+    @property
+    def enabled(self) -> bool:
+        return self.api_url is not None and os.path.exists(self._path("token"))
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.service_account_dir, name)
+
+    def _client(self) -> httpx.AsyncClient:
+        ca_path = self._path("ca.crt")
+        return get_http_client(
+            "kubernetes",
+            timeout=settings.k8s_api_timeout_seconds,
+            verify=ca_path if os.path.exists(ca_path) else True,
+        )
+
+    def _auth_headers(self) -> Dict[str, str]:
+        now = time.monotonic()
+        if self._token is None or now - self._token_read_at > TOKEN_REFRESH_SECONDS:
+            with open(self._path("token")) as f:
+                self._token = f.read().strip()
+            self._token_read_at = now
+        return {"Authorization": f"Bearer {self._token}"}
+
+    def spinapp_path(self, namespace: str, name: Optional[str] = None) -> str:
+        path = (
+            f"/apis/{settings.k8s_spinapp_group}/{settings.k8s_spinapp_version}"
+            f"/namespaces/{namespace}/spinapps"
+        )
+        return f"{path}/{name}" if name else path
+
+    def service_path(self, namespace: str) -> str:
+        return f"/api/v1/namespaces/{namespace}/services"
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """API 서버 호출 (인증 헤더 포함)"""
+        headers = {**self._auth_headers(), **kwargs.pop("headers", {})}
+        return await self._client().request(
+            method, f"{self.api_url}{path}", headers=headers, **kwargs
+        )
+
+    async def delete_spinapp(
+        self, name: str, namespace: Optional[str] = None
+    ) -> SpinAppDeleteResult:
+        """SpinApp 삭제. 이미 없으면 not_found, 예외 대신 결과로 실패를 알림"""
+        namespace = namespace or settings.k8s_namespace
+        if not self.enabled:
+            return SpinAppDeleteResult(
+                name, namespace, "skipped", message="Kubernetes API not configured"
+            )
+
+        try:
+            response = await self.request(
+                "DELETE",
+                self.spinapp_path(namespace, name),
+                json={"propagationPolicy": "Background"},
+            )
+        except (httpx.HTTPError, OSError) as e:
+            return SpinAppDeleteResult(name, namespace, "failed", message=str(e))
+
+        if response.status_code in (200, 202):
+            return SpinAppDeleteResult(name, namespace, "deleted", code=response.status_code)
+        if response.status_code == 404:
+            return SpinAppDeleteResult(name, namespace, "not_found", code=404)
+        return SpinAppDeleteResult(
+            name,
+            namespace,
+            "failed",
+            code=response.status_code,
+            message=_status_message(response),
+        )
+
+    async def delete_spinapps(
+        self, names: List[str], namespace: Optional[str] = None
+    ) -> List[SpinAppDeleteResult]:
+        """여러 SpinApp을 동시 요청 수를 제한해 삭제 (워크스페이스 삭제 시)"""
+        semaphore = asyncio.Semaphore(settings.k8s_delete_concurrency)
+
+        async def delete(name: str) -> SpinAppDeleteResult:
+            async with semaphore:
+                return await self.delete_spinapp(name, namespace)
+
+        return list(await asyncio.gather(*(delete(name) for name in names)))
+
+
+class WatchExpired(Exception):
+    """watch의 resourceVersion이 만료됨 (410 Gone, 다시 list 필요)"""
+
+
+class Informer:
+    """
+    list + watch로 한 종류의 리소스를 로컬 캐시(name -> object)에 유지.
+    변경될 때마다 on_change를 호출하며, watch가 끊기면 마지막 resourceVersion부터 이어받고
+    만료되면 다시 list한다.
+    """
+
+    def __init__(
+        self,
+        client: KubernetesClient,
+        path: str,
+        on_change: Optional[Callable[[], None]] = None,
+        watch_timeout_seconds: int = 300,
+    ):
+        self.client = client
+        self.path = path
+        self.on_change = on_change
+        self.watch_timeout_seconds = watch_timeout_seconds
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.synced = False
+        self._resource_version: Optional[str] = None
+
+    async def run(self):
+        """캐시 동기화 루프 (백그라운드 태스크로 구동)"""
+        backoff = 1.0
+        while True:
+            try:
+                if self._resource_version is None:
+                    await self._relist()
+                await self._watch()
+                backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except WatchExpired:
+                logger.info("Watch on %s expired, relisting", self.path)
+                self._resource_version = None
+            except Exception as e:
+                logger.warning("Informer %s error: %s (retry in %.0fs)", self.path, e, backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(60.0, backoff * 2)
+
+    async def _relist(self):
+        response = await self.client.request("GET", self.path)
+        response.raise_for_status()
+        body = response.json()
+        self.items = {
+            item["metadata"]["name"]: item for item in body.get("items", [])
+        }
+        self._resource_version = body.get("metadata", {}).get("resourceVersion")
+        self.synced = True
+        self._notify()
+
+    async def _watch(self):
+        params = {
+            "watch": "1",
+            "allowWatchBookmarks": "true",
+            "timeoutSeconds": str(self.watch_timeout_seconds),
+        }
+        if self._resource_version:
+            params["resourceVersion"] = self._resource_version
+        client = self.client._client()
+        timeout = httpx.Timeout(
+            settings.k8s_api_timeout_seconds, read=self.watch_timeout_seconds + 30
+        )
+        async with client.stream(
+            "GET",
+            f"{self.client.api_url}{self.path}",
+            params=params,
+            headers=self.client._auth_headers(),
+            timeout=timeout,
+        ) as response:
+            if response.status_code == 410:
+                raise WatchExpired()
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    self._apply(json.loads(line))
+
+    def _apply(self, event: Dict[str, Any]):
+        kind = event.get("type")
+        obj = event.get("object") or {}
+        if kind == "ERROR":
+            if obj.get("code") == 410:
+                raise WatchExpired()
+            raise RuntimeError(obj.get("message") or "watch error")
+
+        metadata = obj.get("metadata", {})
+        self._resource_version = metadata.get("resourceVersion") or self._resource_version
+        if kind == "BOOKMARK":
+            return
+        name = metadata.get("name")
+        if kind == "DELETED":
+            self.items.pop(name, None)
+        else:
+            self.items[name] = obj
+        self._notify()
+
+    def _notify(self):
+        if self.on_change:
+            self.on_change()
+
+
+def _status_message(response: httpx.Response) -> str:
+    """K8s Status 객체의 message (없으면 본문 일부)"""
+    try:
+        return response.json().get("message") or response.text[:200]
+    except ValueError:
+        return response.text[:200]
+
+
+def spinapp_name(function_name: str) -> str:
+    """함수 이름 → SpinApp 이름 (배포 시 app_name을 소문자로 보내는 규칙과 동일)"""
+    return function_name.lower()
+
+
+# 전역 K8s 클라이언트 인스턴스
+k8s_client = KubernetesClient()
@@ -0,0 +1,42 @@
+"""실행 로그 id (UUIDv7) 유틸리티
+
+로그 id 앞 48비트에 생성 시각(unix ms)을 넣어 id만으로 로그의 타임스탬프와
+SK(LOG#{timestamp}#{id})를 만들 수 있게 한다. 이전 형식(uuid4/shortuuid) id는 시각을 알 수 없다.
+"""
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.utils.timezone import now_kst, to_kst
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def new_log_id(at: Optional[datetime] = None) -> str:
+    """at(기본 현재) 시각을 담은 UUIDv7 문자열 (ms 단위, 같은 ms 안에서는 임의 순서)"""
+    unix_ms = (to_kst(at or now_kst()) - _EPOCH) // timedelta(milliseconds=1)
+    value = (unix_ms & ((1 << 48) - 1)) << 80
+    value |= int.from_bytes(os.urandom(10), "big") & ((1 << 80) - 1)
+    # version 7, variant 10
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+    return str(uuid.UUID(int=value))
+
+
+def log_id_timestamp(log_id: str) -> Optional[str]:
+    """UUIDv7 로그 id → KST ISO 타임스탬프 (microseconds 자리까지). 이전 형식 id면 None"""
+    try:
+        parsed = uuid.UUID(log_id)
+    except (ValueError, TypeError, AttributeError):
+        return None
+    if parsed.version != 7:
+        return None
+    unix_ms = parsed.int >> 80
+    return to_kst(_EPOCH + timedelta(milliseconds=unix_ms)).isoformat(timespec="microseconds")
+
+
+def log_sort_key(log_id: str) -> Optional[str]:
+    """UUIDv7 로그 id → 실행 로그 SK. 이전 형식 id면 None"""
+    timestamp = log_id_timestamp(log_id)
+    return f"LOG#{timestamp}#{log_id}" if timestamp else None
@@ -0,0 +1,83 @@
+"""시계열 파싱/다운샘플링 유틸리티"""
+import math
+import re
+from typing import Any, List, Sequence, Tuple
+
+_DURATION_PATTERN = re.compile(r"^(\d+)([smhdw]?)$")
+_DURATION_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_duration(value: str) -> int:
+    """'90', '30s', '15m', '24h', '7d', '1w' 형식을 초로 변환. 형식이 틀리면 ValueError"""
+    match = _DURATION_PATTERN.match(value.strip().lower())
+    if not match:
+        raise ValueError(f"invalid duration: {value}")
+    return int(match.group(1)) * _DURATION_UNITS[match.group(2)]
+
+
+def parse_values(values: Sequence[Sequence[Any]]) -> Tuple[List[float], List[float]]:
+    """
+    Prometheus [[timestamp, "value"], ...] 배열을 (timestamps, values) 두 리스트로 변환.
+    전체를 한 번에 변환하고, 변환할 수 없는 값(NaN 문자열 외 잘못된 값)이 있을 때만 항목별로 거른다.
+    """
+    if not values:
+        return [], []
+    try:
+        timestamps, raw = zip(*values)
+        xs = list(map(float, timestamps))
+        ys = list(map(float, raw))
+    except (TypeError, ValueError):
+        xs, ys = [], []
+        for point in values:
+            try:
+                x, y = float(point[0]), float(point[1])
+            except (TypeError, ValueError, IndexError):
+                continue
+            xs.append(x)
+            ys.append(y)
+    # NaN/Inf는 JSON으로 내보낼 수 없으므로 제외
+    if not all(map(math.isfinite, ys)):
+        kept = [(x, y) for x, y in zip(xs, ys) if math.isfinite(y)]
+        xs = [x for x, _ in kept]
+        ys = [y for _, y in kept]
+    return xs, ys
+
+
+def lttb(xs: List[float], ys: List[float], threshold: int) -> Tuple[List[float], List[float]]:
+    """
+    Largest-Triangle-Three-Buckets 다운샘플링.
+    첫/마지막 포인트를 유지하고 각 버킷에서 시각적으로 가장 중요한 포인트 하나를 고른다.
+    """
+    length = len(xs)
+    if threshold >= length or threshold < 3:
+        return xs, ys
+
+    sampled_x, sampled_y = [xs[0]], [ys[0]]
+    bucket_size = (length - 2) / (threshold - 2)
+    selected = 0
+    for bucket in range(threshold - 2):
+        # 다음 버킷의 평균점
+        next_start = int((bucket + 1) * bucket_size) + 1
+        next_end = min(int((bucket + 2) * bucket_size) + 1, length)
+        count = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / count
+        avg_y = sum(ys[next_start:next_end]) / count
+
+        # 현재 버킷에서 (선택된 점, 후보, 다음 평균점) 삼각형 넓이가 최대인 후보
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        ax, ay = xs[selected], ys[selected]
+        best_area = -1.0
+        best = start
+        for index in range(start, end):
+            area = abs((ax - avg_x) * (ys[index] - ay) - (ax - xs[index]) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = index
+        sampled_x.append(xs[best])
+        sampled_y.append(ys[best])
+        selected = best
+
+    sampled_x.append(xs[-1])
+    sampled_y.append(ys[-1])
+    return sampled_x, sampled_y
@@ -354,7 +354,7 @@ export const AppProvider: React.FC<{ children: ReactNode }> = ({ children }) =>
 
   const getLokiLogs = useCallback(async (functionId: string, limit: number = 100): Promise<LokiLogsResponse> => {
     try {
-      const response = await api.getLokiLogs(functionId, limit);
+      const response = await api.getLokiLogs(functionId, { limit });
       return response;
     } catch (error) {
       console.error('Failed to load Loki logs:', error);
@@ -422,11 +422,26 @@ export const AppProvider: React.FC<{ children: ReactNode }> = ({ children }) =>
             namespace: 'default',
             image_ref: imageUrl,
             function_id: functionId,
+            workspace_id: currentWorkspaceId,
             enable_autoscaling: true,
             use_spot: false,
         });
 
-        const endpoint = deployResponse.endpoint;
+        // 배포는 비동기로 진행되므로 엔드포인트가 응답할 때까지 상태 조회 (최대 5분)
+        let endpoint = deployResponse.endpoint;
+        if (!endpoint && deployResponse.deploy_id) {
+          for (let deployAttempts = 0; deployAttempts < 100; deployAttempts++) {
+            await new Promise(resolve => setTimeout(resolve, 3000));
+            const deployStatus = await api.getDeployStatus(deployResponse.deploy_id, currentWorkspaceId);
+            if (deployStatus.status === 'ready') {
+              endpoint = deployStatus.endpoint;
+              break;
+            }
+            if (deployStatus.status === 'failed') {
+              throw new Error(`Deploy failed: ${deployStatus.error || 'unknown error'}`);
+            }
+          }
+        }
         if (!endpoint) {
           setFunctions(prev => prev.map(f =>
             f.id === functionId
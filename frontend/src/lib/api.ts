@@ -109,17 +109,34 @@ export interface LogItem {
   responseBody?: any;
   logs: string[];
   level: 'info' | 'warn' | 'error';
+  startedAt?: string | null;
+  endedAt?: string | null;
 }
 
 export interface LokiLogEntry {
   timestamp: string;
   line: string;
+  labels?: Record<string, string> | null;
 }
 
 export interface LokiLogsResponse {
   logs: LokiLogEntry[];
   total: number;
   function_id: string;
+  query?: string | null;
+  direction?: 'backward' | 'forward';
+  next_cursor?: string | null;
+}
+
+export interface LokiLogsOptions {
+  limit?: number;
+  start?: string;
+  end?: string;
+  cursor?: string;
+  direction?: 'backward' | 'forward';
+  level?: string[];
+  contains?: string;
+  regex?: string;
 }
 
 export interface PrometheusMetricPoint {
@@ -131,6 +148,8 @@ export interface PrometheusMetricsData {
   cpu_total: number | null;
   cpu_series: PrometheusMetricPoint[];
   window_seconds: number;
+  step_seconds: number;
+  source_points: number;
   instant_query: string;
   range_query: string;
   raw_instant?: any;
@@ -143,6 +162,21 @@ export interface PrometheusMetricsResponse {
   function_id: string;
 }
 
+export interface FunctionCpuMetrics {
+  cpu_total: number | null;
+  cpu_series: PrometheusMetricPoint[];
+  source_points: number;
+}
+
+export interface PrometheusBatchMetricsResponse {
+  status: string;
+  window_seconds: number;
+  step_seconds: number;
+  instant_query: string | null;
+  range_query: string | null;
+  functions: Record<string, FunctionCpuMetrics>;
+}
+
 // --- Workspace API ---
 
 export async function getWorkspaces(): Promise<Workspace[]> {
@@ -213,9 +247,21 @@ export async function getWorkspaceLogs(workspaceId: string, limit: number = 50):
   return response.logs;
 }
 
-export async function getFunctionLogs(workspaceId: string, functionId: string): Promise<LogItem[]> {
-  // Assuming the backend supports query params for limit, e.g. ?limit=100
-  const response = await fetchApi<LogsResponse>(`/api/workspaces/${workspaceId}/functions/${functionId}/logs?limit=100`);
+export interface FunctionLogsOptions {
+  limit?: number;
+  start?: string; // RFC3339
+  end?: string; // RFC3339 (미포함)
+}
+
+export async function getFunctionLogs(
+  workspaceId: string,
+  functionId: string,
+  options: FunctionLogsOptions = {}
+): Promise<LogItem[]> {
+  const params = new URLSearchParams({ limit: String(options.limit ?? 100) });
+  if (options.start) params.set('start', options.start);
+  if (options.end) params.set('end', options.end);
+  const response = await fetchApi<LogsResponse>(`/api/workspaces/${workspaceId}/functions/${functionId}/logs?${params}`);
   return response.logs;
 }
 
@@ -228,14 +274,140 @@ export async function invokeFunction(workspaceId: string, functionId: string, re
 
 // --- Loki Logs API ---
 
-export async function getLokiLogs(functionId: string, limit: number = 100): Promise<LokiLogsResponse> {
-  return fetchApi<LokiLogsResponse>(`/api/functions/${functionId}/loki-logs?limit=${limit}`);
+export interface LogExportOptions {
+  format?: 'ndjson' | 'parquet';
+  compression?: 'none' | 'gzip' | 'snappy' | 'zstd';
+  start?: string;
+  end?: string;
+}
+
+// 브라우저 다운로드용 URL (응답이 스트리밍되므로 fetch로 받지 않고 링크로 연다)
+export function logExportUrl(workspaceId: string, functionId?: string, options: LogExportOptions = {}): string {
+  const params = new URLSearchParams();
+  if (options.format) params.set('format', options.format);
+  if (options.compression) params.set('compression', options.compression);
+  if (options.start) params.set('start', options.start);
+  if (options.end) params.set('end', options.end);
+  const path = functionId
+    ? `/api/workspaces/${workspaceId}/functions/${functionId}/logs/export`
+    : `/api/workspaces/${workspaceId}/logs/export`;
+  const query = params.toString();
+  return `${API_BASE_URL}${path}${query ? `?${query}` : ''}`;
+}
+
+export interface LogSearchHit {
+  score: number;
+  log: LogItem;
+}
+
+export interface LogSearchResponse {
+  hits: LogSearchHit[];
+  total: number;
+  query: string;
+  next_cursor?: string | null;
+}
+
+export async function searchLogs(
+  workspaceId: string,
+  q: string,
+  options: { limit?: number; cursor?: string; functionId?: string } = {},
+): Promise<LogSearchResponse> {
+  const params = new URLSearchParams({ q });
+  if (options.limit) params.set('limit', String(options.limit));
+  if (options.cursor) params.set('cursor', options.cursor);
+  if (options.functionId) params.set('function_id', options.functionId);
+  return fetchApi<LogSearchResponse>(`/api/workspaces/${workspaceId}/logs/search?${params}`);
+}
+
+export async function getInvocationLogLines(
+  workspaceId: string,
+  functionId: string,
+  logId: string,
+  options: { cursor?: string; match?: 'id' | 'time' } = {},
+): Promise<LokiLogsResponse> {
+  const params = new URLSearchParams();
+  if (options.cursor) params.set('cursor', options.cursor);
+  if (options.match) params.set('match', options.match);
+  const query = params.toString();
+  return fetchApi<LokiLogsResponse>(
+    `/api/workspaces/${workspaceId}/functions/${functionId}/logs/${logId}/lines${query ? `?${query}` : ''}`,
+  );
+}
+
+export async function getLokiLogs(functionId: string, options: LokiLogsOptions = {}): Promise<LokiLogsResponse> {
+  const params = new URLSearchParams({ limit: String(options.limit ?? 100) });
+  if (options.start) params.set('start', options.start);
+  if (options.end) params.set('end', options.end);
+  if (options.cursor) params.set('cursor', options.cursor);
+  if (options.direction) params.set('direction', options.direction);
+  if (options.level?.length) params.set('level', options.level.join(','));
+  if (options.contains) params.set('contains', options.contains);
+  if (options.regex) params.set('regex', options.regex);
+  return fetchApi<LokiLogsResponse>(`/api/functions/${functionId}/loki-logs?${params}`);
+}
+
+export type LokiTailEvent =
+  | { type: 'logs'; entries: LokiLogEntry[] }
+  | { type: 'dropped'; counts: Record<string, number> };
+
+// Live log stream (SSE). Returns a function that closes the stream.
+export function tailLokiLogs(functionId: string, onEvent: (event: LokiTailEvent) => void): () => void {
+  const source = new EventSource(`${API_BASE_URL}/api/functions/${functionId}/loki-logs/tail`);
+  source.addEventListener('logs', (e) => {
+    onEvent({ type: 'logs', entries: JSON.parse((e as MessageEvent).data).entries });
+  });
+  source.addEventListener('dropped', (e) => {
+    onEvent({ type: 'dropped', counts: JSON.parse((e as MessageEvent).data) });
+  });
+  return () => source.close();
 }
 
 // --- Prometheus Metrics API ---
 
-export async function getPrometheusMetrics(functionId: string): Promise<PrometheusMetricsResponse> {
-  return fetchApi<PrometheusMetricsResponse>(`/api/functions/${functionId}/metrics`);
+export interface MetricsWindowOptions {
+  window?: string; // e.g. '1h', '24h', '7d'
+  step?: string;
+  maxPoints?: number;
+}
+
+function metricsQuery(options: MetricsWindowOptions = {}, extra: Record<string, string> = {}): string {
+  const params = new URLSearchParams(extra);
+  if (options.window) params.set('window', options.window);
+  if (options.step) params.set('step', options.step);
+  if (options.maxPoints) params.set('max_points', String(options.maxPoints));
+  const query = params.toString();
+  return query ? `?${query}` : '';
+}
+
+export async function getPrometheusMetrics(functionId: string, options?: MetricsWindowOptions): Promise<PrometheusMetricsResponse> {
+  return fetchApi<PrometheusMetricsResponse>(`/api/functions/${functionId}/metrics${metricsQuery(options)}`);
+}
+
+export async function getWorkspaceMetrics(workspaceId: string, functionIds?: string[], options?: MetricsWindowOptions): Promise<PrometheusBatchMetricsResponse> {
+  const query = metricsQuery(options, functionIds ? { function_ids: functionIds.join(',') } : {});
+  return fetchApi<PrometheusBatchMetricsResponse>(`/api/workspaces/${workspaceId}/metrics${query}`);
+}
+
+// --- Function Dashboard API ---
+
+export interface DashboardSourceStatus {
+  status: 'ok' | 'timeout' | 'error';
+  duration_ms: number;
+  error: string | null;
+}
+
+export interface FunctionDashboardResponse {
+  status: 'complete' | 'partial';
+  function: FunctionItem;
+  execution_logs: LogItem[] | null;
+  loki_logs: LokiLogsResponse | null;
+  metrics: PrometheusMetricsData | null;
+  sources: Record<string, DashboardSourceStatus>;
+}
+
+export async function getFunctionDashboard(workspaceId: string, functionId: string, options?: MetricsWindowOptions): Promise<FunctionDashboardResponse> {
+  const query = metricsQuery({ window: options?.window, maxPoints: options?.maxPoints });
+  return fetchApi<FunctionDashboardResponse>(`/api/workspaces/${workspaceId}/functions/${functionId}/dashboard${query}`);
 }
 
 // --- Build API ---
@@ -312,9 +484,11 @@ export interface DeployRequest {
   custom_tolerations?: any[];
   custom_affinity?: any;
   function_id?: string;
+  workspace_id?: string;
 }
 
 export interface DeployResponse {
+  deploy_id: string | null;
   app_name: string;
   namespace: string;
   service_name: string;
@@ -324,6 +498,23 @@ export interface DeployResponse {
   use_spot: boolean;
 }
 
+export interface DeployStatusResponse {
+  deploy_id: string;
+  status: 'pending' | 'deploying' | 'ready' | 'failed';
+  workspace_id: string;
+  function_id: string | null;
+  app_name: string | null;
+  namespace: string | null;
+  service_name: string | null;
+  endpoint: string | null;
+  probe_attempts: number;
+  last_probe: string | null;
+  error: string | null;
+  created_at: string;
+  updated_at: string;
+  ready_at: string | null;
+}
+
 /**
  * 파일 업로드 및 빌드 시작
  */
@@ -411,6 +602,14 @@ export async function deployToK8s(data: DeployRequest): Promise<DeployResponse>
   });
 }
 
+/**
+ * 배포 작업 상태 조회
+ */
+export async function getDeployStatus(deployId: string, workspaceId?: string): Promise<DeployStatusResponse> {
+  const query = workspaceId ? `?workspace_id=${encodeURIComponent(workspaceId)}` : '';
+  return fetchApi<DeployStatusResponse>(`/api/v1/deploy/${deployId}${query}`);
+}
+
 /**
  * 빌드 및 푸시 통합
  */